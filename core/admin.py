@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Organization, Membership
+
+from .jobs import cancel
+from .models import Job, Organization, Membership
 
 # Register your models here.
 
@@ -9,7 +11,31 @@ class OrganizationAdmin(admin.ModelAdmin):
   search_fields = ("name", "slugs")
   list_filter = ("is_active",)
 
+@admin.register(Membership)
 class MembershipAdmin(admin.ModelAdmin):
   list_display = ("organization", "user", "role", "created_at")
   search_fields = ("organization__name", "organization__slug", "user__email", "user__username")
-  list_filter = ("role", "organization")
\ No newline at end of file
+  list_filter = ("role", "organization")
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+  list_display = ("created_at", "name", "queue", "organization", "status", "attempts", "progress_display", "finished_at")
+  list_filter = ("status", "queue", "name", "organization")
+  search_fields = ("=id", "name")
+  date_hierarchy = "created_at"
+  readonly_fields = [f.name for f in Job._meta.fields]
+  actions = ["cancel_jobs"]
+
+  def has_add_permission(self, request):
+    return False
+
+  @admin.display(description="Progress")
+  def progress_display(self, obj):
+    if obj.progress is None:
+      return obj.progress_current or ""
+    return f"{obj.progress:.0%}"
+
+  @admin.action(description="Cancel selected queued jobs")
+  def cancel_jobs(self, request, queryset):
+    cancelled = cancel(queryset.values_list("pk", flat=True))
+    self.message_user(request, f"Cancelled {cancelled} jobs.")
@@ -0,0 +1,323 @@
+"""
+Synthetic-league benchmarks, driven by `manage.py run_benchmarks`.
+
+A profile fixes the size of the seeded league. Seeding is deterministic (fixed RNG seed,
+schedule anchored on today's date), so query counts are stable between runs and latency
+can be compared against a stored baseline JSON file.
+"""
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, time as dtime, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Membership, Organization
+
+
+@dataclass(frozen=True)
+class Profile:
+  orgs: int
+  seasons: int  # per org; all but the newest are finished and archived
+  divisions: int  # per season
+  teams: int  # per division, double round robin
+  players: int  # per team
+  venues: int  # per org
+  referees: int  # per org
+
+
+PROFILES = {
+  "small": Profile(orgs=1, seasons=1, divisions=2, teams=8, players=12, venues=4, referees=6),
+  "medium": Profile(orgs=2, seasons=2, divisions=4, teams=10, players=15, venues=8, referees=16),
+  "huge": Profile(orgs=5, seasons=3, divisions=6, teams=12, players=18, venues=16, referees=40),
+}
+
+ORG_SLUG = "bench-{}"
+ADMIN_USERNAME = "bench-admin"
+
+
+def percentile(samples, pct):
+  ordered = sorted(samples)
+  k = max(0, min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1))))
+  return ordered[k]
+
+
+# ---------- seeding ----------
+
+def _round_robin(team_ids):
+  """Double round robin by the circle method: a list of rounds of (home, away) pairs."""
+  ids = list(team_ids)
+  if len(ids) % 2:
+    ids.append(None)
+  n = len(ids)
+  rounds = []
+  for r in range(n - 1):
+    pairs = [(ids[i], ids[n - 1 - i]) for i in range(n // 2)]
+    rounds.append([(a, b) if r % 2 else (b, a) for a, b in pairs if a and b])
+    ids = [ids[0], ids[-1], *ids[1:-1]]
+  return rounds + [[(b, a) for a, b in rnd] for rnd in rounds]
+
+
+def seed(profile: Profile, name: str, *, rng_seed=1234) -> dict:
+  """Create the synthetic league for `profile` with bulk inserts. Returns row counts."""
+  from leagues.fixtures import refresh_team_match_pointers
+  from leagues.players import link_members, rebuild_stats
+  from leagues.models import (
+    Appearance, CardEvent, Division, GoalEvent, Match, MatchResult, Season, Team, TeamMember,
+    TeamSeason, Venue, VenueAvailability,
+  )
+  from payments.ledger import rebuild_balances
+  from payments.models import LedgerEntry
+  from referees.models import Referee, RefereeAvailability
+
+  rng = random.Random(rng_seed)
+  User = get_user_model()
+  now = timezone.now()
+  today = timezone.localdate()
+  counts = {}
+
+  def add(model, rows):
+    model.objects.bulk_create(rows, batch_size=1000)
+    counts[model._meta.label] = counts.get(model._meta.label, 0) + len(rows)
+    return rows
+
+  admin = User.objects.create_superuser(ADMIN_USERNAME, f"{ADMIN_USERNAME}@example.com", "bench")
+
+  for o in range(profile.orgs):
+    org = Organization.objects.create(name=f"Bench league {o} ({name})", slug=ORG_SLUG.format(o))
+    tz = org.tzinfo
+    Membership.objects.create(organization=org, user=admin, role=Membership.Role.ORG_ADMIN)
+
+    venues = add(Venue, [
+      Venue(
+        organization=org, name=f"Field {v}", field_count=2,
+        lat=Decimal("49.8951") + Decimal(rng.randint(-2000, 2000)) / 10000,
+        lng=Decimal("-97.1384") + Decimal(rng.randint(-3000, 3000)) / 10000,
+      )
+      for v in range(profile.venues)
+    ])
+    add(VenueAvailability, [
+      VenueAvailability(venue=v, weekday=d, opens_at=dtime(17), closes_at=dtime(23))
+      for v in venues for d in range(7)
+    ])
+
+    # one referee user per slot; available every evening of the current season
+    users = add(User, [User(username=f"bench-ref-{o}-{r}", email=f"bench-ref-{o}-{r}@example.com") for r in range(profile.referees)])
+    referees = add(Referee, [Referee(organization=org, user=u, max_matches_per_day=2) for u in users])
+
+    for s in range(profile.seasons):
+      current = s == profile.seasons - 1
+      weeks = 2 * (profile.teams - 1 + profile.teams % 2)
+      # the current season is half played; older seasons ran back to back before it
+      start = today - timedelta(weeks=weeks // 2 + (profile.seasons - 1 - s) * (weeks + 4))
+      season = add(Season, [Season(
+        organization=org, name=f"Season {s}", start_date=start, end_date=start + timedelta(weeks=weeks),
+        is_active=current, archived_at=None if current else now,
+      )])[0]
+      divisions = add(Division, [Division(season=season, name=f"Division {d}", sort_order=d) for d in range(profile.divisions)])
+      teams = add(Team, [
+        Team(division=div, organization=org, name=f"{div.name} Team {t}", short_name=f"D{d}T{t}", home_venue=rng.choice(venues))
+        for d, div in enumerate(divisions) for t in range(profile.teams)
+      ])
+      team_seasons = add(TeamSeason, [TeamSeason(season=season, team=t) for t in teams])
+      members = add(TeamMember, [
+        TeamMember(
+          team_season=ts, organization=org, full_name=f"Player {o}-{i}-{p}", jersey_number=p + 1,
+          role=TeamMember.Role.CAPTAIN if p == 0 else TeamMember.Role.PLAYER,
+        )
+        for i, ts in enumerate(team_seasons) for p in range(profile.players)
+      ])
+      roster = {}
+      for m, ts in zip(members, (ts for ts in team_seasons for _ in range(profile.players))):
+        roster.setdefault(ts.team_id, []).append(m)
+
+      matches = []
+      for div in divisions:
+        div_teams = [t.pk for t in teams if t.division_id == div.pk]
+        for r, rnd in enumerate(_round_robin(div_teams)):
+          for k, (home, away) in enumerate(rnd):
+            day = start + timedelta(weeks=r, days=k % 5)
+            starts_at = datetime.combine(day, dtime(18 + 2 * (k // 5 % 2)), tz)
+            matches.append(Match(
+              season=season, organization=org, division=div, venue=venues[(r + k) % len(venues)],
+              home_team_id=home, away_team_id=away, starts_at=starts_at, local_date=day,
+              status=Match.Status.FINAL if starts_at < now else Match.Status.SCHEDULED,
+              round_label=f"Round {r + 1}", is_archived=not current,
+            ))
+      add(Match, matches)
+
+      results, goals, cards, appearances = [], [], [], []
+      for m in matches:
+        if m.status != Match.Status.FINAL:
+          continue
+        score = {m.home_team_id: rng.randint(0, 4), m.away_team_id: rng.randint(0, 4)}
+        results.append(MatchResult(match=m, home_score=score[m.home_team_id], away_score=score[m.away_team_id]))
+        for team_id, goals_for in score.items():
+          players = roster[team_id][:11]
+          appearances.extend(
+            Appearance(match=m, organization=org, team_id=team_id, player=p, is_archived=m.is_archived) for p in players
+          )
+          goals.extend(
+            GoalEvent(match=m, organization=org, team_id=team_id, scorer=rng.choice(players), minute=rng.randint(1, 90), is_archived=m.is_archived)
+            for _ in range(goals_for)
+          )
+          cards.extend(
+            CardEvent(match=m, organization=org, team_id=team_id, player=rng.choice(players), card=CardEvent.Card.YELLOW,
+                      minute=rng.randint(1, 90), is_archived=m.is_archived)
+            for _ in range(rng.randint(0, 2))
+          )
+      add(MatchResult, results)
+      add(GoalEvent, goals)
+      add(CardEvent, cards)
+      add(Appearance, appearances)
+
+      add(LedgerEntry, [
+        entry
+        for i, ts in enumerate(team_seasons)
+        for entry in (
+          LedgerEntry(team_season=ts, kind=LedgerEntry.Kind.CHARGE, amount=Decimal("1200.00"), memo="Season fee"),
+          *([LedgerEntry(team_season=ts, kind=LedgerEntry.Kind.PAYMENT, amount=Decimal("600.00"))] if i % 2 else []),
+        )
+      ])
+
+      if current:
+        add(RefereeAvailability, [
+          RefereeAvailability(
+            referee=ref,
+            starts_at=datetime.combine(today + timedelta(days=d), dtime(17), tz),
+            ends_at=datetime.combine(today + timedelta(days=d), dtime(23), tz),
+          )
+          for ref in referees for d in range(weeks * 7 // 2 + 7)
+        ])
+
+  link_members(TeamMember.objects.select_related("team_season").order_by("team_season__season__start_date"))
+  rebuild_stats()
+  refresh_team_match_pointers()
+  rebuild_balances()
+  return counts
+
+
+def is_seeded(name: str) -> bool:
+  org = Organization.objects.filter(slug=ORG_SLUG.format(0)).first()
+  if org is not None and not org.name.endswith(f"({name})"):
+    raise ValueError(f"The database holds a different benchmark profile ({org.name}).")
+  return org is not None
+
+
+# ---------- scenarios ----------
+
+@dataclass
+class Result:
+  iterations: int
+  p50_ms: float
+  p99_ms: float
+  mean_ms: float
+  throughput_per_s: float
+  queries: int
+
+  def as_dict(self):
+    return asdict(self)
+
+
+def _http(client, url):
+  def run():
+    response = client.get(url)
+    if response.status_code != 200:
+      raise RuntimeError(f"GET {url} returned {response.status_code}")
+  return run
+
+
+def _command(name, *args):
+  def run():
+    call_command(name, *args, stdout=StringIO(), stderr=StringIO())
+  return run
+
+
+def scenarios() -> dict:
+  """name -> (callable, kind); kinds let the runner use fewer iterations for commands."""
+  from leagues.models import Division, Match, Player, Season
+
+  org = Organization.objects.get(slug=ORG_SLUG.format(0))
+  season = Season.objects.get(organization=org, is_active=True)
+  division = Division.objects.filter(season=season).order_by("sort_order").first()
+  venue = org.venues.order_by("name").first()
+  final = Match.objects.filter(season=season, status=Match.Status.FINAL).order_by("starts_at", "id").first()
+  # the longest career in the league
+  player_id = Player.objects.filter(organization=org).order_by("-seasons_count", "display_name").values_list("pk", flat=True).first()
+  today = timezone.localdate()
+
+  anonymous = Client()
+  staff = Client()
+  staff.force_login(get_user_model().objects.get(username=ADMIN_USERNAME))
+
+  return {
+    "public.division_teams": (_http(anonymous, reverse("public-division-teams", args=[division.pk])), "http"),
+    "public.org_calendar_month": (_http(anonymous, reverse("public-org-calendar", args=[org.slug]) + "?view=month"), "http"),
+    "public.venues_near": (_http(anonymous, reverse("public-venues-near", args=[org.slug]) + f"?lat={venue.lat}&lng={venue.lng}&radius_km=25"), "http"),
+    "public.player_career": (_http(anonymous, reverse("public-player-career", args=[player_id])), "http"),
+    "api.org_capacity": (_http(staff, reverse("org-capacity", args=[org.slug]) + f"?start={today}&end={today + timedelta(days=27)}&need=20"), "http"),
+    "api.season_travel": (_http(staff, reverse("season-travel-report", args=[season.pk])), "http"),
+    "api.match_history": (_http(staff, reverse("match-history", args=[final.pk])), "http"),
+    "api.org_balances": (_http(staff, reverse("payments-org-balances", args=[org.slug])), "http"),
+    "admin.match_changelist": (_http(staff, reverse("admin:leagues_match_changelist")), "http"),
+    "admin.team_changelist": (_http(staff, reverse("admin:leagues_team_changelist")), "http"),
+    "admin.teammember_changelist": (_http(staff, reverse("admin:leagues_teammember_changelist")), "http"),
+    "admin.goalevent_changelist": (_http(staff, reverse("admin:leagues_goalevent_changelist")), "http"),
+    "admin.ledgerentry_changelist": (_http(staff, reverse("admin:payments_ledgerentry_changelist")), "http"),
+    "cmd.recompute_team_pointers": (_command("recompute_team_pointers"), "command"),
+    "cmd.rebuild_balances": (_command("rebuild_balances"), "command"),
+    "cmd.publish_snapshots": (_command("publish_snapshots", "--org-slug", org.slug), "command"),
+    "cmd.assign_referees": (_command(
+      "assign_referees", "--org-slug", org.slug, "--start", str(today), "--end", str(today + timedelta(days=13)), "--dry-run",
+    ), "command"),
+  }
+
+
+def measure(func, iterations, warmup=2) -> Result:
+  for _ in range(warmup):
+    func()
+  samples = []
+  for _ in range(iterations):
+    started = time.perf_counter()
+    func()
+    samples.append((time.perf_counter() - started) * 1000)
+  # counted on a separate run so query capture doesn't skew the timings
+  with CaptureQueriesContext(connection) as captured:
+    func()
+  return Result(
+    iterations=iterations,
+    p50_ms=round(percentile(samples, 50), 3),
+    p99_ms=round(percentile(samples, 99), 3),
+    mean_ms=round(statistics.fmean(samples), 3),
+    throughput_per_s=round(1000 * len(samples) / sum(samples), 2),
+    queries=len(captured),
+  )
+
+
+# ---------- baselines ----------
+
+def regressions(current: dict, baseline: dict, *, threshold=0.25, min_delta_ms=1.0) -> list:
+  """
+  Compare two `results` mappings. A scenario regresses when it runs more queries than the
+  baseline, or its p50 is more than `threshold` (and `min_delta_ms`) slower.
+  """
+  found = []
+  for name, now in current.items():
+    then = baseline.get(name)
+    if then is None:
+      continue
+    if now["queries"] > then["queries"]:
+      found.append(f"{name}: {then['queries']} -> {now['queries']} queries")
+    delta = now["p50_ms"] - then["p50_ms"]
+    if delta > min_delta_ms and delta > threshold * then["p50_ms"]:
+      found.append(f"{name}: p50 {then['p50_ms']:.2f} -> {now['p50_ms']:.2f} ms (+{delta / then['p50_ms']:.0%})")
+  return found
@@ -0,0 +1,19 @@
+"""
+Cache timeouts that account for the backend.
+
+Invalidation only reaches the cache it runs against. With the per-process default
+(`locmemcache://`, when CACHE_URL isn't set), another worker keeps whatever it cached until
+the entry expires, so values that are invalidated on change get a short timeout there.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_process_local(alias="default") -> bool:
+  """True when each process has its own copy of the `alias` cache."""
+  return isinstance(caches[alias], LocMemCache)
+
+
+def cache_timeout(shared, local, alias="default"):
+  """`shared` on a cache all processes see, `local` on a per-process one."""
+  return local if is_process_local(alias) else shared
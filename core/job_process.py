@@ -0,0 +1,19 @@
+"""
+Entry points for `run_worker --processes` pool children. Kept free of model imports so
+a spawned interpreter can unpickle them before Django is set up.
+"""
+import signal
+
+
+def init():
+  import django
+
+  # Ctrl-C is handled by the parent, which lets running jobs finish
+  signal.signal(signal.SIGINT, signal.SIG_IGN)
+  django.setup()
+
+
+def execute(job_id):
+  from core.jobs import execute
+
+  return execute(job_id)
@@ -0,0 +1,309 @@
+"""
+Database-backed background jobs.
+
+Jobs are plain functions registered with `@job("<app>.<name>")` in an app's `jobs`
+module. They get a JobContext first and the JSON payload as keyword arguments, and may
+return a JSON-serializable result:
+
+  @job("leagues.publish_snapshots")
+  def publish_snapshots(ctx, organization_id=None):
+    ...
+
+`enqueue()` inserts a Job row. `manage.py run_worker` claims batches with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers share a queue without waiting
+on each other's locks, and runs them inline or on a process pool for CPU-bound work.
+Failures are retried with exponential backoff until `max_attempts`. Each worker runs a
+heartbeat thread that refreshes `locked_at` on every job it holds, however long the job runs
+and whether or not it reports progress; jobs whose worker died are requeued once that
+heartbeat goes stale.
+"""
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from . import job_process
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+STALE_AFTER = timedelta(minutes=10)
+
+_registry = {}
+
+
+def job(name):
+  """Register the decorated function as the job `name`."""
+  def register(func):
+    existing = _registry.get(name)
+    if existing is not None and existing is not func:
+      raise ValueError(f"Job {name!r} is already registered by {existing.__module__}.")
+    _registry[name] = func
+    return func
+  return register
+
+
+def load_jobs():
+  """Import every installed app's `jobs` module so its @job functions register."""
+  autodiscover_modules("jobs")
+  return _registry
+
+
+def enqueue(name, payload=None, *, queue="default", organization=None, priority=0, run_after=None, max_attempts=3, created_by=None) -> Job:
+  if name not in load_jobs():
+    raise ValueError(f"Unknown job: {name}")
+  return Job.objects.create(
+    name=name,
+    payload=payload or {},
+    queue=queue,
+    organization=organization,
+    priority=priority,
+    run_after=run_after or timezone.now(),
+    max_attempts=max_attempts,
+    created_by=created_by,
+  )
+
+
+def retry_delay(attempts: int) -> timedelta:
+  return timedelta(seconds=min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1)))
+
+
+# ---------- claiming and running ----------
+
+def claim(worker_id, queues=("default",), limit=1) -> list:
+  """Mark up to `limit` due jobs as RUNNING for this worker and return their ids."""
+  now = timezone.now()
+  with transaction.atomic():
+    ids = list(
+      Job.objects
+      .select_for_update(skip_locked=True)
+      .filter(status=Job.Status.QUEUED, queue__in=queues, run_after__lte=now)
+      .order_by("-priority", "run_after")
+      .values_list("id", flat=True)[:limit]
+    )
+    if ids:
+      Job.objects.filter(pk__in=ids).update(
+        status=Job.Status.RUNNING,
+        locked_by=worker_id,
+        locked_at=now,
+        started_at=now,
+        attempts=F("attempts") + 1,
+      )
+  return ids
+
+
+class JobContext:
+  """Handed to job functions for reporting progress."""
+
+  # progress is written at most this often (seconds) unless forced
+  write_interval = 1.0
+
+  def __init__(self, job):
+    self.job = job
+    self._written_at = 0.0
+
+  def progress(self, current, total=None, message=None, *, force=False):
+    job = self.job
+    job.progress_current = current
+    if total is not None:
+      job.progress_total = total
+    if message is not None:
+      job.progress_message = message[:255]
+
+    now = time.monotonic()
+    if force or now - self._written_at >= self.write_interval:
+      self._written_at = now
+      Job.objects.filter(pk=job.pk).update(
+        progress_current=job.progress_current,
+        progress_total=job.progress_total,
+        progress_message=job.progress_message,
+        locked_at=timezone.now(),
+      )
+
+
+def execute(job_id) -> str:
+  """Run one claimed job to completion, recording its outcome. Returns the final status."""
+  job = Job.objects.get(pk=job_id)
+  func = load_jobs().get(job.name)
+  ctx = JobContext(job)
+  try:
+    if func is None:
+      raise LookupError(f"No job registered as {job.name!r}.")
+    result = func(ctx, **job.payload)
+  except Exception:
+    logger.exception("Job %s (%s) failed on attempt %s", job.pk, job.name, job.attempts)
+    return _record_failure(job, traceback.format_exc())
+
+  Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING).update(
+    status=Job.Status.SUCCEEDED,
+    result=result,
+    progress_current=job.progress_current,
+    progress_total=job.progress_total,
+    progress_message=job.progress_message,
+    finished_at=timezone.now(),
+    locked_by="",
+    locked_at=None,
+  )
+  return Job.Status.SUCCEEDED
+
+
+def _record_failure(job, error) -> str:
+  now = timezone.now()
+  done = {"last_error": error, "locked_by": "", "locked_at": None}
+  if job.attempts < job.max_attempts:
+    Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING).update(
+      status=Job.Status.QUEUED, run_after=now + retry_delay(job.attempts), **done
+    )
+    return Job.Status.QUEUED
+  Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING).update(status=Job.Status.FAILED, finished_at=now, **done)
+  return Job.Status.FAILED
+
+
+def requeue_stale(stale_after=STALE_AFTER) -> int:
+  """Recover RUNNING jobs whose worker stopped heartbeating; counts as a failed attempt."""
+  now = timezone.now()
+  stale = Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=now - stale_after)
+  error = "Worker stopped responding."
+  requeued = stale.filter(attempts__lt=F("max_attempts")).update(
+    status=Job.Status.QUEUED, run_after=now, last_error=error, locked_by="", locked_at=None
+  )
+  failed = stale.update(status=Job.Status.FAILED, finished_at=now, last_error=error, locked_by="", locked_at=None)
+  return requeued + failed
+
+
+def beat(worker_id) -> int:
+  """Refresh the heartbeat of every job `worker_id` is running. Returns how many."""
+  return Job.objects.filter(status=Job.Status.RUNNING, locked_by=worker_id).update(locked_at=timezone.now())
+
+
+class Heartbeat(threading.Thread):
+  """Calls `beat()` for a worker every `interval` seconds until stopped."""
+
+  def __init__(self, worker_id, interval):
+    super().__init__(name=f"heartbeat-{worker_id}", daemon=True)
+    self.worker_id = worker_id
+    self.interval = interval
+    self._stopped = threading.Event()
+
+  def run(self):
+    try:
+      while not self._stopped.wait(self.interval):
+        try:
+          beat(self.worker_id)
+        except Exception:
+          logger.exception("Heartbeat for worker %s failed", self.worker_id)
+          # reconnect on the next beat
+          connection.close()
+    finally:
+      # this thread's own connection
+      connection.close()
+
+  def stop(self):
+    self._stopped.set()
+    self.join()
+
+
+def cancel(job_ids) -> int:
+  """Cancel jobs that haven't started yet; running jobs are left to finish."""
+  return Job.objects.filter(pk__in=job_ids, status=Job.Status.QUEUED).update(
+    status=Job.Status.CANCELLED, finished_at=timezone.now()
+  )
+
+
+# ---------- worker ----------
+
+class Worker:
+  """
+  Claims and runs jobs until stopped. With `processes` > 0 jobs run on a process pool
+  (spawned, so each child opens its own DB connection); claiming stays in the parent and
+  asks for as many jobs as there are idle processes.
+  """
+
+  def __init__(self, queues=("default",), *, processes=0, poll_interval=1.0, stale_after=STALE_AFTER):
+    self.id = f"{socket.gethostname()}:{os.getpid()}"
+    self.queues = tuple(queues)
+    self.processes = processes
+    self.poll_interval = poll_interval
+    self.stale_after = stale_after
+    self.stopping = False
+    self.processed = 0
+    self._reaped_at = 0.0
+
+  def stop(self, *args):
+    self.stopping = True
+
+  def _reap(self):
+    now = time.monotonic()
+    if now - self._reaped_at >= self.stale_after.total_seconds() / 2:
+      self._reaped_at = now
+      requeue_stale(self.stale_after)
+
+  def run(self, *, burst=False, max_jobs=None) -> int:
+    """Work until stopped; `burst` returns once the queues are empty. Returns jobs processed."""
+    # several beats per stale_after, so one slow beat never gets a live job requeued
+    heartbeat = Heartbeat(self.id, self.stale_after.total_seconds() / 4)
+    heartbeat.start()
+    try:
+      if self.processes:
+        return self._run_pool(burst, max_jobs)
+      return self._run_inline(burst, max_jobs)
+    finally:
+      heartbeat.stop()
+
+  def _run_inline(self, burst, max_jobs):
+    while not self.stopping and not (max_jobs and self.processed >= max_jobs):
+      self._reap()
+      ids = claim(self.id, self.queues, 1)
+      if not ids:
+        if burst:
+          break
+        time.sleep(self.poll_interval)
+        continue
+      execute(ids[0])
+      self.processed += 1
+    return self.processed
+
+  def _run_pool(self, burst, max_jobs):
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(self.processes, mp_context=context, initializer=job_process.init) as pool:
+      running = {}  # future -> job id
+      while True:
+        for future in [f for f in running if f.done()]:
+          job_id = running.pop(future)
+          self.processed += 1
+          if future.exception() is not None:
+            logger.error("Job process crashed", exc_info=future.exception())
+            # the heartbeat would keep it RUNNING for good; a no-op if the job already recorded an outcome
+            _record_failure(Job.objects.get(pk=job_id), f"Job process crashed: {future.exception()!r}")
+
+        limit_hit = bool(max_jobs) and self.processed + len(running) >= max_jobs
+        if self.stopping or limit_hit:
+          if not running:
+            break
+        else:
+          self._reap()
+          free = self.processes - len(running)
+          if max_jobs:
+            free = min(free, max_jobs - self.processed - len(running))
+          ids = claim(self.id, self.queues, free) if free else []
+          running.update({pool.submit(job_process.execute, job_id): job_id for job_id in ids})
+          if not running:
+            if burst:
+              break
+            time.sleep(self.poll_interval)
+            continue
+
+        wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+    return self.processed
@@ -0,0 +1,100 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from core.benchmarks import percentile
+from leagues.models import Division, Venue
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure public endpoint latency with per-request connections, persistent connections "
+        "and (on Postgres with psycopg[pool]) the psycopg pool. Needs seeded data (see seed_league)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint per mode.")
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--json", dest="json_path", help="Also write results to this file.")
+
+    def _endpoints(self):
+        division = Division.objects.select_related("season__organization").first()
+        if division is None:
+            raise CommandError("No divisions found; run seed_league first.")
+        org = division.season.organization
+        venue = Venue.objects.filter(organization=org, lat__isnull=False, lng__isnull=False).first()
+
+        urls = [
+            reverse("public-division-teams", args=[division.id]),
+            reverse("public-org-calendar", args=[org.slug]) + "?view=month",
+        ]
+        if venue:
+            urls.append(reverse("public-venues-near", args=[org.slug]) + f"?lat={venue.lat}&lng={venue.lng}")
+        return urls
+
+    def _modes(self):
+        modes = [("per-request", {"CONN_MAX_AGE": 0}), ("persistent", {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True})]
+        if connection.vendor == "postgresql":
+            try:
+                import psycopg_pool  # noqa: F401
+            except ImportError:
+                self.stdout.write(self.style.WARNING("psycopg_pool not installed; skipping pool mode."))
+            else:
+                modes.append(("pool", {"CONN_MAX_AGE": 0, "OPTIONS": {**connection.settings_dict["OPTIONS"], "pool": True}}))
+        return modes
+
+    def _run_mode(self, client, urls, overrides, n, warmup):
+        original = {k: connection.settings_dict.get(k) for k in overrides}
+        connection.close()
+        connection.settings_dict.update(overrides)
+        try:
+            for url in urls:
+                for _ in range(warmup):
+                    client.get(url)
+
+            results = {}
+            for url in urls:
+                samples = []
+                for _ in range(n):
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    samples.append((time.perf_counter() - started) * 1000)
+                    if response.status_code != 200:
+                        raise CommandError(f"{url} returned {response.status_code}")
+                results[url] = {
+                    "p50_ms": round(percentile(samples, 50), 3),
+                    "p99_ms": round(percentile(samples, 99), 3),
+                    "mean_ms": round(statistics.fmean(samples), 3),
+                }
+            return results
+        finally:
+            connection.close()
+            if hasattr(connection, "close_pool"):
+                connection.close_pool()
+            connection.settings_dict.update(original)
+
+    def handle(self, *args, **opts):
+        hosts = [h for h in settings.ALLOWED_HOSTS if h != "*"]
+        client = Client(HTTP_HOST=hosts[0] if hosts else "localhost")
+        urls = self._endpoints()
+
+        report = {}
+        for name, overrides in self._modes():
+            report[name] = self._run_mode(client, urls, overrides, opts["requests"], opts["warmup"])
+
+        for url in urls:
+            self.stdout.write(self.style.MIGRATE_HEADING(url))
+            for name in report:
+                r = report[name][url]
+                self.stdout.write(f"  {name:<12} p50 {r['p50_ms']:>8.2f} ms   p99 {r['p99_ms']:>8.2f} ms   mean {r['mean_ms']:>8.2f} ms")
+
+        if opts["json_path"]:
+            with open(opts["json_path"], "w") as fh:
+                json.dump({"vendor": connection.vendor, "requests": opts["requests"], "results": report}, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {opts['json_path']}"))
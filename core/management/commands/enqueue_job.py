@@ -0,0 +1,48 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.jobs import enqueue, load_jobs
+from core.models import Organization
+
+
+class Command(BaseCommand):
+    help = "Queue a background job, e.g. enqueue_job leagues.publish_snapshots --org-slug demo."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", nargs="?", help="Registered job name; omit to list them.")
+        parser.add_argument("--payload", default="{}", help="JSON object of keyword arguments.")
+        parser.add_argument("--org-slug", help="Scope the job to an organization (also passed as organization_id).")
+        parser.add_argument("--queue", default="default")
+        parser.add_argument("--priority", type=int, default=0)
+        parser.add_argument("--max-attempts", type=int, default=3)
+
+    def handle(self, *args, **opts):
+        if not opts["name"]:
+            for name in sorted(load_jobs()):
+                self.stdout.write(name)
+            return
+
+        try:
+            payload = json.loads(opts["payload"])
+        except ValueError as exc:
+            raise CommandError(f"--payload is not valid JSON: {exc}")
+        if not isinstance(payload, dict):
+            raise CommandError("--payload must be a JSON object.")
+
+        org = None
+        if opts["org_slug"]:
+            try:
+                org = Organization.objects.get(slug=opts["org_slug"])
+            except Organization.DoesNotExist:
+                raise CommandError(f"Organization '{opts['org_slug']}' not found.")
+            payload.setdefault("organization_id", str(org.pk))
+
+        try:
+            queued = enqueue(
+                opts["name"], payload, queue=opts["queue"], organization=org,
+                priority=opts["priority"], max_attempts=opts["max_attempts"],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f"Queued {queued.name} as {queued.pk}."))
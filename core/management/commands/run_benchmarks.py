@@ -0,0 +1,119 @@
+import json
+import platform
+import tempfile
+import time
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from django.utils import timezone
+
+from core import benchmarks
+from leaguehub.db_routers import replica_configured
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic league into a throwaway test database and measure p50/p99 latency, "
+        "throughput and query counts for public endpoints, admin changelists and bulk commands. "
+        "Compares against benchmarks/<profile>-<vendor>.json when it exists."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profile", choices=sorted(benchmarks.PROFILES), default="small")
+        parser.add_argument("--iterations", type=int, default=50, help="Timed runs per HTTP scenario.")
+        parser.add_argument("--command-iterations", type=int, default=3, help="Timed runs per command scenario.")
+        parser.add_argument("--only", help="Only run scenarios whose name starts with this prefix (e.g. public.).")
+        parser.add_argument("--keepdb", action="store_true", help="Keep (and reuse) the seeded test database.")
+        parser.add_argument("--baseline", help="Baseline JSON to compare against (default: benchmarks/<profile>-<vendor>.json).")
+        parser.add_argument("--save-baseline", action="store_true", help="Write this run as the new baseline.")
+        parser.add_argument("--output", help="Also write this run's results to this file.")
+        parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p50 slowdown before flagging (0.25 = 25%%).")
+        parser.add_argument("--fail-on-regression", action="store_true", help="Exit non-zero when a regression is flagged.")
+
+    def handle(self, *args, **opts):
+        if replica_configured():
+            raise CommandError("Unset DB_REPLICA_* first: public reads would go to the real replica, not the benchmark database.")
+
+        profile_name = opts["profile"]
+        old_config = setup_databases(
+            verbosity=0, interactive=False, keepdb=opts["keepdb"], aliases={"default"}, serialized_aliases=set(),
+        )
+        try:
+            with tempfile.TemporaryDirectory() as snapshot_root, override_settings(
+                LEAGUES_SNAPSHOT_ROOT=Path(snapshot_root), ALLOWED_HOSTS=["testserver"],
+            ):
+                results = self._run(profile_name, opts)
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=opts["keepdb"])
+
+        report = {
+            "profile": profile_name,
+            "vendor": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "created_at": timezone.now().isoformat(),
+            "results": results,
+        }
+        baseline_path = Path(opts["baseline"]) if opts["baseline"] else (
+            Path(settings.BASE_DIR) / "benchmarks" / f"{profile_name}-{connection.vendor}.json"
+        )
+        self._compare(report, baseline_path, opts)
+
+        if opts["output"]:
+            self._write(Path(opts["output"]), report)
+        if opts["save_baseline"]:
+            self._write(baseline_path, report)
+
+    def _run(self, profile_name, opts):
+        profile = benchmarks.PROFILES[profile_name]
+        try:
+            seeded = benchmarks.is_seeded(profile_name)
+        except ValueError as exc:
+            raise CommandError(f"{exc} Run without --keepdb to reseed.")
+        if not seeded:
+            started = time.perf_counter()
+            counts = benchmarks.seed(profile, profile_name)
+            summary = ", ".join(f"{n} {label.split('.')[-1]}" for label, n in counts.items() if n)
+            self.stdout.write(f"Seeded {profile_name} in {time.perf_counter() - started:.1f}s: {summary}")
+
+        results = {}
+        for name, (func, kind) in benchmarks.scenarios().items():
+            if opts["only"] and not name.startswith(opts["only"]):
+                continue
+            iterations = opts["iterations"] if kind == "http" else opts["command_iterations"]
+            result = benchmarks.measure(func, iterations, warmup=2 if kind == "http" else 1)
+            results[name] = result.as_dict()
+            self.stdout.write(
+                f"{name:<30} p50 {result.p50_ms:>9.2f} ms  p99 {result.p99_ms:>9.2f} ms  "
+                f"{result.throughput_per_s:>8.1f}/s  {result.queries:>4} queries"
+            )
+        return results
+
+    def _compare(self, report, baseline_path, opts):
+        if not baseline_path.exists():
+            if opts["baseline"]:
+                raise CommandError(f"Baseline {baseline_path} not found.")
+            self.stdout.write(self.style.WARNING(f"No baseline at {baseline_path}; use --save-baseline to record one."))
+            return
+
+        baseline = json.loads(baseline_path.read_text())
+        if baseline.get("profile") != report["profile"] or baseline.get("vendor") != report["vendor"]:
+            raise CommandError(f"{baseline_path} is a {baseline.get('profile')}/{baseline.get('vendor')} baseline.")
+
+        found = benchmarks.regressions(report["results"], baseline["results"], threshold=opts["threshold"])
+        if not found:
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {baseline_path}."))
+            return
+        for line in found:
+            self.stdout.write(self.style.ERROR(f"REGRESSION {line}"))
+        if opts["fail_on_regression"]:
+            raise CommandError(f"{len(found)} regressions against {baseline_path}.")
+
+    def _write(self, path, report):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2) + "\n")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
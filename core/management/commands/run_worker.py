@@ -0,0 +1,47 @@
+import signal
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import Worker, load_jobs
+
+# notifications.send_pending runs on its own queue, so it can be given a dedicated worker
+# (`--queue notifications`) without bulk jobs holding up outgoing mail
+DEFAULT_QUEUES = ["default", "notifications"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs from the database queue. Start several workers (or use --processes) "
+        "to scale out; they claim jobs with SKIP LOCKED and never block each other."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queue", action="append", dest="queues", help=(
+            "Queue to serve (repeatable). Default: default and notifications. A worker started with "
+            "--queue must include notifications, or another worker must serve it, for email and SMS to go out."
+        ))
+        parser.add_argument("--processes", type=int, default=0, help="Run jobs on a pool of this many processes (CPU-bound work).")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--stale-after", type=int, default=600, help="Requeue running jobs without a heartbeat for this many seconds.")
+        parser.add_argument("--burst", action="store_true", help="Exit once the queues are empty.")
+        parser.add_argument("--max-jobs", type=int, help="Exit after this many jobs.")
+
+    def handle(self, *args, **opts):
+        registered = load_jobs()
+        worker = Worker(
+            opts["queues"] or DEFAULT_QUEUES,
+            processes=opts["processes"],
+            poll_interval=opts["poll_interval"],
+            stale_after=timedelta(seconds=opts["stale_after"]),
+        )
+        # finish the jobs in hand, then exit
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+
+        self.stdout.write(
+            f"Worker {worker.id} serving {', '.join(worker.queues)} "
+            f"({worker.processes or 'inline'} processes, {len(registered)} job types)."
+        )
+        processed = worker.run(burst=opts["burst"], max_jobs=opts["max_jobs"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} jobs."))
@@ -1,6 +1,11 @@
 import uuid
+from zoneinfo import ZoneInfo
+
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 
 # Create your models here.
 class Organization(models.Model):
@@ -13,6 +18,10 @@ class Organization(models.Model):
 
   def __str__(self) -> str:
     return self.name
+
+  @property
+  def tzinfo(self) -> ZoneInfo:
+    return ZoneInfo(self.timezone)
   
 class Membership(models.Model):
   class Role(models.TextChoices):
@@ -34,4 +43,63 @@ class Membership(models.Model):
     ]
 
   def __str__(self) -> str:
-    return f"{self.user_id} -> {self.organization.slug} ({self.role})"
\ No newline at end of file
+    return f"{self.user_id} -> {self.organization.slug} ({self.role})"
+
+
+class Job(models.Model):
+  """
+  A unit of background work for the database-backed queue in `core.jobs`. Workers claim
+  QUEUED rows with SELECT ... FOR UPDATE SKIP LOCKED; see `manage.py run_worker`.
+  """
+
+  class Status(models.TextChoices):
+    QUEUED = "QUEUED", "Queued"
+    RUNNING = "RUNNING", "Running"
+    SUCCEEDED = "SUCCEEDED", "Succeeded"
+    FAILED = "FAILED", "Failed"
+    CANCELLED = "CANCELLED", "Cancelled"
+
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  name = models.CharField(max_length=100)
+  queue = models.CharField(max_length=40, default="default")
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, null=True, blank=True, related_name="jobs")
+  payload = models.JSONField(encoder=DjangoJSONEncoder, default=dict, blank=True)
+
+  status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+  priority = models.SmallIntegerField(default=0)
+  run_after = models.DateTimeField(default=timezone.now)
+  attempts = models.PositiveSmallIntegerField(default=0)
+  max_attempts = models.PositiveSmallIntegerField(default=3)
+
+  progress_current = models.PositiveIntegerField(default=0)
+  progress_total = models.PositiveIntegerField(null=True, blank=True)
+  progress_message = models.CharField(max_length=255, blank=True, default="")
+  result = models.JSONField(encoder=DjangoJSONEncoder, null=True, blank=True)
+  last_error = models.TextField(blank=True, default="")
+
+  # worker id + claim / heartbeat time, for finding jobs orphaned by a dead worker
+  locked_by = models.CharField(max_length=100, blank=True, default="")
+  locked_at = models.DateTimeField(null=True, blank=True)
+
+  created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+  created_at = models.DateTimeField(auto_now_add=True)
+  started_at = models.DateTimeField(null=True, blank=True)
+  finished_at = models.DateTimeField(null=True, blank=True)
+
+  class Meta:
+    indexes = [
+      # the claim query only ever scans queued rows
+      models.Index(fields=["queue", "-priority", "run_after"], condition=Q(status="QUEUED"), name="job_claim_idx"),
+      models.Index(fields=["locked_at"], condition=Q(status="RUNNING"), name="job_running_idx"),
+      models.Index(fields=["organization", "created_at"]),
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.name} [{self.status}]"
+
+  @property
+  def progress(self):
+    """Fraction done (0..1), or None when the job hasn't reported a total."""
+    if not self.progress_total:
+      return None
+    return min(1.0, self.progress_current / self.progress_total)
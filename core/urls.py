@@ -0,0 +1,7 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+  path("<uuid:job_id>/", views.JobStatusView.as_view(), name="job-status"),
+]
@@ -1,3 +1,31 @@
-from django.shortcuts import render
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from rest_framework import serializers
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from .models import Job
+
+
+class JobStatusSerializer(serializers.ModelSerializer):
+  progress = serializers.FloatField(read_only=True, allow_null=True)
+
+  class Meta:
+    model = Job
+    fields = [
+      "id", "name", "status", "attempts", "max_attempts",
+      "progress", "progress_current", "progress_total", "progress_message",
+      "result", "created_at", "started_at", "finished_at",
+    ]
+
+
+class JobStatusView(APIView):
+  """Status and progress of a background job, for whoever queued it."""
+  permission_classes = [IsAuthenticated]
+
+  def get(self, request, job_id):
+    job = get_object_or_404(Job, pk=job_id)
+    if job.created_by_id != request.user.pk and not request.user.is_superuser:
+      raise Http404
+    return Response(JobStatusSerializer(job).data)
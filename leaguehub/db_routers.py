@@ -0,0 +1,69 @@
+"""
+Read-replica routing.
+
+Reads of `leagues` models go to the "replica" alias only while ReplicaRoutingMiddleware
+has marked the current request as an anonymous read (safe method, no credentials) of a view
+that opted in with `replica_reads = True`: the public league pages, where a little replica lag
+is harmless. Staff and captain endpoints never opt in, so they always read the
+primary. The first write in a request flips every later read of that request back to the
+primary, so a request always reads its own writes.
+"""
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_ALIAS = "replica"
+REPLICA_APPS = frozenset({"leagues"})
+
+_routing = contextvars.ContextVar("leaguehub_db_routing", default=None)
+
+
+class _RequestRouting:
+  __slots__ = ("use_replica", "wrote")
+
+  def __init__(self, use_replica):
+    self.use_replica = use_replica
+    self.wrote = False
+
+
+def replica_configured() -> bool:
+  return REPLICA_ALIAS in settings.DATABASES
+
+
+def wants_replica(view_func) -> bool:
+  """Whether the view (function, or class behind as_view()) set `replica_reads = True`."""
+  view = getattr(view_func, "view_class", None) or getattr(view_func, "cls", None) or view_func
+  return getattr(view, "replica_reads", False) is True
+
+
+@contextmanager
+def replica_reads(enabled=True):
+  """Route leagues reads in this block to the replica (used by the middleware; handy in scripts/tests)."""
+  token = _routing.set(_RequestRouting(enabled and replica_configured()))
+  try:
+    yield _routing.get()
+  finally:
+    _routing.reset(token)
+
+
+class ReplicaRouter:
+  def db_for_read(self, model, **hints):
+    state = _routing.get()
+    if state and state.use_replica and not state.wrote and model._meta.app_label in REPLICA_APPS:
+      return REPLICA_ALIAS
+    return DEFAULT_DB_ALIAS
+
+  def db_for_write(self, model, **hints):
+    state = _routing.get()
+    if state:
+      state.wrote = True
+    return DEFAULT_DB_ALIAS
+
+  def allow_relation(self, obj1, obj2, **hints):
+    # both aliases hold the same data
+    return True
+
+  def allow_migrate(self, db, app_label, model_name=None, **hints):
+    return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,56 @@
+from leagues.audit import audit_batch
+
+from .db_routers import replica_configured, replica_reads, wants_replica
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+  """
+  Send the league queries of anonymous reads of public views (`replica_reads = True` on the
+  view) to the replica. Everything else, including signed-in staff and captains, who must
+  see their own writes, stays on the primary.
+  """
+
+  def __init__(self, get_response):
+    self.get_response = get_response
+    self.enabled = replica_configured()
+
+  def __call__(self, request):
+    # off until process_view has seen which view serves the request
+    with replica_reads(False) as routing:
+      request.db_routing = routing
+      return self.get_response(request)
+
+  def process_view(self, request, view_func, view_args, view_kwargs):
+    routing = getattr(request, "db_routing", None)
+    if (
+      routing is not None
+      and self.enabled
+      and request.method in SAFE_METHODS
+      and wants_replica(view_func)
+      and "HTTP_AUTHORIZATION" not in request.META
+      and not request.user.is_authenticated
+    ):
+      routing.use_replica = True
+    return None
+
+
+class AuditBatchMiddleware:
+  """
+  Buffer the request's audit entries and write them in one insert once the view is done.
+  The insert runs synchronously, before this middleware hands the response back.
+  """
+
+  def __init__(self, get_response):
+    self.get_response = get_response
+
+  def __call__(self, request):
+    # the actor is only resolved when something was audited, so public reads never touch the session
+    with audit_batch(lambda: _request_actor(request)):
+      return self.get_response(request)
+
+
+def _request_actor(request):
+  user = getattr(request, "user", None)
+  return user if user is not None and user.is_authenticated else None
@@ -37,15 +37,20 @@ INSTALLED_APPS = [
     'core',
     'leagues',
     'registration',
+    'referees',
+    'payments',
+    'notifications',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'leaguehub.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'leaguehub.middleware.AuditBatchMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -81,9 +86,49 @@ DATABASES = {
         "PASSWORD": env("DB_PASSWORD"),
         "HOST": env("DB_HOST"),
         "PORT": env("DB_PORT"),
+        # Persistent connections: reuse a connection for DB_CONN_MAX_AGE seconds and
+        # check it is still usable before each request instead of reconnecting per request.
+        "CONN_MAX_AGE": env.int("DB_CONN_MAX_AGE", default=60),
+        "CONN_HEALTH_CHECKS": env.bool("DB_CONN_HEALTH_CHECKS", default=True),
+        "OPTIONS": {},
     }
 }
 
+# psycopg connection pool (requires psycopg[pool]); replaces persistent connections.
+if env.bool("DB_POOL", default=False):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": env.int("DB_POOL_MIN_SIZE", default=2),
+        "max_size": env.int("DB_POOL_MAX_SIZE", default=10),
+        "timeout": env.int("DB_POOL_TIMEOUT", default=10),
+    }
+
+# Optional read replica for public league reads (see leaguehub.db_routers).
+# Unset values fall back to the primary's settings.
+if env("DB_REPLICA_HOST", default=""):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": env("DB_REPLICA_NAME", default=DATABASES["default"]["NAME"]),
+        "USER": env("DB_REPLICA_USER", default=DATABASES["default"]["USER"]),
+        "PASSWORD": env("DB_REPLICA_PASSWORD", default=DATABASES["default"]["PASSWORD"]),
+        "HOST": env("DB_REPLICA_HOST"),
+        "PORT": env("DB_REPLICA_PORT", default=DATABASES["default"]["PORT"]),
+        "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["leaguehub.db_routers.ReplicaRouter"]
+
+# Tests always get a "replica" alias mirroring the test database, so routing is covered.
+TEST_RUNNER = "leaguehub.test_runner.ReplicaTestRunner"
+
+# Set CACHE_URL to a shared cache (e.g. redis://) when running several processes: cached
+# permission grants and outlooks are invalidated on change, which a per-process locmem cache
+# can't do across workers, so under locmem they're only kept briefly (see core.cache).
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+
 CORS_ALLOWED_ORIGINS = env.list("CORS_ALLOWED_ORIGINS", default=[])
 
 AUTH_USER_MODEL = "accounts.User"
@@ -98,6 +143,33 @@ REST_FRAMEWORK = {
     ],
 }
 
+# League scheduling
+# Length of the field booking a single match takes, used by the venue capacity planner.
+LEAGUES_MATCH_MINUTES = env.int("LEAGUES_MATCH_MINUTES", default=90)
+
+# Static public snapshots (schedules/standings/results JSON) written by `publish_snapshots`,
+# meant to be served by a static file server or CDN.
+LEAGUES_SNAPSHOT_ROOT = env.path("LEAGUES_SNAPSHOT_ROOT", default=BASE_DIR / "snapshots")
+LEAGUES_SNAPSHOT_HTML = env.bool("LEAGUES_SNAPSHOT_HTML", default=False)
+
+# Outgoing email, sent in batches from the notifications outbox by the job worker
+EMAIL_BACKEND = env.str("EMAIL_BACKEND", default="django.core.mail.backends.console.EmailBackend")
+DEFAULT_FROM_EMAIL = env.str("DEFAULT_FROM_EMAIL", default="leaguehub@localhost")
+
+# Notification delivery: a backend per channel (see notifications.backends), how long rows
+# wait to be digested per recipient, per-channel messages per minute, and reminder lead time.
+NOTIFICATIONS_BACKENDS = {
+    "email": "notifications.backends.EmailBackend",
+}
+if env.str("NOTIFICATIONS_SMS_BACKEND", default=""):
+    NOTIFICATIONS_BACKENDS["sms"] = env.str("NOTIFICATIONS_SMS_BACKEND")
+NOTIFICATIONS_DIGEST_SECONDS = env.int("NOTIFICATIONS_DIGEST_SECONDS", default=300)
+NOTIFICATIONS_RATE_LIMITS = {
+    "email": env.int("NOTIFICATIONS_EMAIL_PER_MINUTE", default=120),
+    "sms": env.int("NOTIFICATIONS_SMS_PER_MINUTE", default=30),
+}
+NOTIFICATIONS_REMINDER_HOURS = env.int("NOTIFICATIONS_REMINDER_HOURS", default=48)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,24 @@
+"""
+Test runner that always provides the read-replica alias.
+
+Without DB_REPLICA_HOST the settings define no "replica" alias, which would leave the
+replica routing untested. This runner adds one before the tests are collected: a second
+connection that mirrors the test database (an in-memory SQLite database in local runs, or
+the test Postgres database), so the routing is exercised without a second server.
+"""
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.runner import DiscoverRunner
+
+from .db_routers import REPLICA_ALIAS
+
+
+class ReplicaTestRunner(DiscoverRunner):
+  def setup_test_environment(self, **kwargs):
+    databases = connections.settings
+    if REPLICA_ALIAS not in databases:
+      databases[REPLICA_ALIAS] = {
+        **databases[DEFAULT_DB_ALIAS],
+        "TEST": {**databases[DEFAULT_DB_ALIAS]["TEST"], "NAME": None, "MIRROR": DEFAULT_DB_ALIAS},
+      }
+      connections.configure_settings(databases)
+    super().setup_test_environment(**kwargs)
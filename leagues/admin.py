@@ -1,15 +1,43 @@
-from django.contrib import admin
+from datetime import date
+
+from django import forms
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponseRedirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from . import forfeits, results
 from .models import (
-    Appearance, CardEvent, GoalEvent, Season, Division, Team, TeamMember, TeamSeason, Venue,
-    Match, MatchResult, TeamInviteToken, MatchAttendance
+    Appearance, CardEvent, GoalEvent, Season, Division, DivisionRules, Team, TeamMember, TeamSeason, Venue,
+    Match, MatchResult, TeamInviteToken, MatchAttendance, VenueAvailability, AuditEntry, Player,
+    MatchTurnoutForecast, RatingHistory, TeamRating
 )
 
+class RoundResultForm(forms.Form):
+    match = forms.UUIDField(widget=forms.HiddenInput)
+    home_score = forms.IntegerField(min_value=0, required=False, widget=forms.NumberInput(attrs={"style": "width: 4em"}))
+    away_score = forms.IntegerField(min_value=0, required=False, widget=forms.NumberInput(attrs={"style": "width: 4em"}))
+    is_forfeit = forms.BooleanField(required=False)
+
+    def clean(self):
+        cleaned = super().clean()
+        if (cleaned.get("home_score") is None) != (cleaned.get("away_score") is None):
+            raise forms.ValidationError("Enter both scores or leave both blank.")
+        return cleaned
+
+
+RoundResultFormSet = forms.formset_factory(RoundResultForm, extra=0)
+
 # ---------- Inlines for Match entry ----------
 
 class MatchResultInline(admin.StackedInline):
     model = MatchResult
     extra = 0
     max_num = 1
+    # saving the result here accepts it (see MatchResult.save)
+    readonly_fields = ("is_provisional",)
 
 
 class AppearanceInline(admin.TabularInline):
@@ -79,21 +107,104 @@ class CardEventInline(admin.TabularInline):
 
 @admin.register(Season)
 class SeasonAdmin(admin.ModelAdmin):
-    list_display = ("name", "organization", "start_date", "end_date", "is_active", "created_at")
+    list_display = ("name", "organization", "start_date", "end_date", "is_active", "archived_at", "created_at")
     list_filter = ("organization", "is_active")
     search_fields = ("name", "organization__name", "organization__slug")
 
+class DivisionRulesInline(admin.StackedInline):
+    model = DivisionRules
+    can_delete = False
+    extra = 0
+
+
 @admin.register(Division)
 class DivisionAdmin(admin.ModelAdmin):
-    list_display = ("name", "season", "sort_order", "created_at")
+    list_display = ("name", "season", "sort_order", "created_at", "results_link")
     list_filter = ("season__organization", "season")
     search_fields = ("name", "season__name")
+    inlines = [DivisionRulesInline]
+
+    def get_urls(self):
+        return [
+            path(
+                "<path:object_id>/results/",
+                self.admin_site.admin_view(self.round_results_view),
+                name="leagues_division_round_results",
+            ),
+        ] + super().get_urls()
+
+    @admin.display(description="Results")
+    def results_link(self, obj):
+        return format_html('<a href="{}">Enter results</a>', reverse("admin:leagues_division_round_results", args=[obj.pk]))
+
+    def round_results_view(self, request, object_id):
+        """Score grid for one match day or round; every row is saved in one batch."""
+        division = self.get_object(request, object_id)
+        if division is None or not self.has_change_permission(request, division):
+            raise Http404
+        try:
+            on = date.fromisoformat(request.GET["date"]) if request.GET.get("date") else None
+        except ValueError:
+            on = None
+            messages.error(request, "Dates are YYYY-MM-DD.")
+        round_label = request.GET.get("round", "")
+
+        fixtures = results.round_fixtures(division, on=on, round_label=round_label) if on or round_label else []
+        initial = []
+        for match in fixtures:
+            result = getattr(match, "result", None)
+            initial.append({
+                "match": match.pk,
+                "home_score": result.home_score if result else None,
+                "away_score": result.away_score if result else None,
+                "is_forfeit": result.is_forfeit if result else False,
+            })
+
+        if request.method == "POST":
+            formset = RoundResultFormSet(request.POST, initial=initial)
+            if formset.is_valid():
+                entries = [
+                    results.ResultEntry(f["match"], f["home_score"], f["away_score"], f["is_forfeit"])
+                    for f in formset.cleaned_data
+                    if f.get("home_score") is not None
+                ]
+                try:
+                    outcome = results.enter_results(division, entries, recorded_by=request.user.get_username())
+                except ValidationError as exc:
+                    for message in exc.messages:
+                        messages.error(request, message)
+                else:
+                    messages.success(
+                        request,
+                        f"Saved {len(outcome.created)} new and {len(outcome.updated)} changed results "
+                        f"({len(outcome.unchanged)} unchanged).",
+                    )
+                    return HttpResponseRedirect(request.get_full_path())
+        else:
+            formset = RoundResultFormSet(initial=initial)
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "original": division,
+            "title": f"Enter results: {division}",
+            "formset": formset,
+            "rows": list(zip(fixtures, formset.forms)),
+            "date": on,
+            "round": round_label,
+            "rounds": (
+                division.matches.exclude(round_label="").order_by("round_label")
+                .values_list("round_label", flat=True).distinct()
+            ),
+        }
+        return TemplateResponse(request, "admin/leagues/division/round_results.html", context)
 
 @admin.register(Team)
 class TeamAdmin(admin.ModelAdmin):
-    list_display = ("name", "division", "primary_contact_name", "primary_contact_email", "is_active", "created_at")
-    list_filter = ("division__season__organization", "division__season", "division", "is_active")
-    search_fields = ("name", "primary_contact_name", "primary_contact_email")
+    list_display = ("name", "division", "club", "primary_contact_name", "primary_contact_email", "is_active", "created_at")
+    raw_id_fields = ("home_venue", "previous_team")
+    list_filter = ("organization", "division__season", "division", "is_active")
+    search_fields = ("name", "club", "primary_contact_name", "primary_contact_email")
 
 @admin.register(TeamSeason)
 class TeamSeasonAdmin(admin.ModelAdmin):
@@ -101,24 +212,48 @@ class TeamSeasonAdmin(admin.ModelAdmin):
     list_filter = ("season__organization", "season", "status")
     search_fields = ("team__name", "season__name")
 
+class VenueAvailabilityInline(admin.TabularInline):
+    model = VenueAvailability
+    extra = 0
+    fields = ("weekday", "opens_at", "closes_at")
+
+
 @admin.register(Venue)
 class VenueAdmin(admin.ModelAdmin):
-    list_display = ("name", "organization", "address", "is_active")
+    list_display = ("name", "organization", "address", "field_count", "is_active")
     list_filter = ("organization", "is_active")
     search_fields = ("name", "address")
+    inlines = [VenueAvailabilityInline]
 
 @admin.register(Match)
 class MatchAdmin(admin.ModelAdmin):
     list_display = ("starts_at", "division", "home_team", "away_team", "venue", "status")
-    list_filter = ("season__organization", "season", "division", "status", "venue")
+    list_select_related = ("division__season", "home_team", "away_team", "venue")
+    list_filter = ("organization", "season", "division", "status", "venue", "is_archived")
     search_fields = ("home_team__name", "away_team__name", "division__name")
     date_hierarchy = "starts_at"
     inlines = [MatchResultInline, AppearanceInline, GoalEventInline, CardEventInline]
 
 @admin.register(MatchResult)
 class MatchResultAdmin(admin.ModelAdmin):
-    list_display = ("match", "home_score", "away_score", "is_forfeit", "recorded_at", "updated_at")
-    list_filter = ("is_forfeit",)
+    list_display = ("match", "home_score", "away_score", "is_forfeit", "is_provisional", "recorded_by", "recorded_at", "updated_at")
+    list_filter = ("is_provisional", "is_forfeit")
+    readonly_fields = ("is_provisional",)
+    actions = ("confirm_forfeits", "reject_forfeits")
+
+    @admin.action(description="Confirm selected provisional forfeits")
+    def confirm_forfeits(self, request, queryset):
+        try:
+            confirmed = forfeits.confirm_forfeits(queryset, recorded_by=request.user.get_username())
+        except ValidationError as exc:
+            self.message_user(request, "; ".join(exc.messages), messages.ERROR)
+            return
+        self.message_user(request, f"Confirmed {confirmed} forfeits.")
+
+    @admin.action(description="Reject selected provisional forfeits")
+    def reject_forfeits(self, request, queryset):
+        rejected = forfeits.reject_forfeits(queryset)
+        self.message_user(request, f"Rejected {rejected} forfeits; the matches stay scheduled.")
 
 @admin.register(TeamInviteToken)
 class TeamInviteTokenAdmin(admin.ModelAdmin):
@@ -129,7 +264,7 @@ class TeamInviteTokenAdmin(admin.ModelAdmin):
 @admin.register(MatchAttendance)
 class MatchAttendanceAdmin(admin.ModelAdmin):
     list_display = ("match", "team", "participant_name", "status", "updated_at")
-    list_filter = ("team", "status")
+    list_filter = ("organization", "team", "status")
     search_fields = ("participant_name", "team__name")
 
 
@@ -138,15 +273,39 @@ class MatchAttendanceAdmin(admin.ModelAdmin):
 @admin.register(TeamMember)
 class TeamMemberAdmin(admin.ModelAdmin):
     list_display = ("id", "team_season", "role", "jersey_number", "is_active", "joined_at")
-    list_filter = ("team_season__season", "team_season__team", "role", "is_active")
+    list_filter = ("organization", "team_season__season", "team_season__team", "role", "is_active")
     search_fields = ("display_name", "team_season__team__name")
     autocomplete_fields = ("team_season", )
+    # relink a row to merge duplicate players; career totals follow
+    raw_id_fields = ("player",)
+
+
+class PlayerMembershipInline(admin.TabularInline):
+    model = TeamMember
+    fields = ("team_season", "role", "jersey_number", "appearances_count", "goals_count", "yellow_cards_count", "red_cards_count")
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+    show_change_link = True
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Player)
+class PlayerAdmin(admin.ModelAdmin):
+    list_display = ("display_name", "organization", "user", "seasons_count", "appearances_count", "goals_count", "yellow_cards_count", "red_cards_count")
+    list_filter = ("organization",)
+    search_fields = ("display_name", "user__email", "user__username")
+    raw_id_fields = ("user",)
+    readonly_fields = ("seasons_count", "teams_count", "appearances_count", "goals_count", "yellow_cards_count", "red_cards_count")
+    inlines = [PlayerMembershipInline]
 
 
 @admin.register(GoalEvent)
 class GoalEventAdmin(admin.ModelAdmin):
     list_display = ("match", "team", "scorer", "minute", "created_at")
-    list_filter = ("match__season", "team",)
+    list_filter = ("organization", "match__season", "team",)
     search_fields = ("scorer__display_name", "team__name", "match__home_team__name", "match__away_team__name")
     autocomplete_fields = ("match", "team", "scorer")
 
@@ -154,7 +313,7 @@ class GoalEventAdmin(admin.ModelAdmin):
 @admin.register(CardEvent)
 class CardEventAdmin(admin.ModelAdmin):
     list_display = ("match", "team", "player", "card", "minute", "created_at")
-    list_filter = ("match__season", "card", "team")
+    list_filter = ("organization", "match__season", "card", "team")
     search_fields = ("player__display_name", "team__name", "match__home_team__name", "match__away_team__name")
     autocomplete_fields = ("match", "team", "player")
 
@@ -162,6 +321,78 @@ class CardEventAdmin(admin.ModelAdmin):
 @admin.register(Appearance)
 class AppearanceAdmin(admin.ModelAdmin):
     list_display = ("match", "team", "player")
-    list_filter = ("match__season", "team")
+    list_filter = ("organization", "match__season", "team")
     search_fields = ("player__display_name", "team__name", "match__home_team__name", "match__away_team__name")
-    autocomplete_fields = ("match", "team", "player")
\ No newline at end of file
+    autocomplete_fields = ("match", "team", "player")
+
+
+@admin.register(AuditEntry)
+class AuditEntryAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "entity_type", "action", "entity_id", "match_id", "actor")
+    list_filter = ("entity_type", "action")
+    search_fields = ("=entity_id", "=match_id")
+    date_hierarchy = "created_at"
+
+    # the log is written by leagues.audit only
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TeamRating)
+class TeamRatingAdmin(admin.ModelAdmin):
+    list_display = ("team", "organization", "rating", "initial_rating", "matches_rated", "last_played_at", "history_link")
+    list_filter = ("organization", "team__division__season")
+    search_fields = ("team__name",)
+    ordering = ("organization", "-rating")
+    readonly_fields = ("team", "organization", "rating", "initial_rating", "matches_rated", "last_played_at", "updated_at")
+
+    # ratings are maintained by leagues.ratings (rebuild_ratings recomputes them)
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="History")
+    def history_link(self, obj):
+        url = reverse("admin:leagues_ratinghistory_changelist") + f"?team__id__exact={obj.team_id}"
+        return format_html('<a href="{}">{} matches</a>', url, obj.matches_rated)
+
+
+@admin.register(RatingHistory)
+class RatingHistoryAdmin(admin.ModelAdmin):
+    list_display = ("played_at", "team", "match", "goals_for", "goals_against", "expected", "rating_before", "rating_after")
+    list_filter = ("organization", "team")
+    search_fields = ("team__name",)
+    ordering = ("-played_at",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(MatchTurnoutForecast)
+class MatchTurnoutForecastAdmin(admin.ModelAdmin):
+    list_display = ("match", "team", "going", "maybe", "out", "expected_players", "min_players", "shortfall_probability", "at_risk", "computed_at")
+    list_filter = ("at_risk", "organization", "match__season")
+    search_fields = ("team__name",)
+    ordering = ("match__starts_at",)
+    list_select_related = ("match__home_team", "match__away_team", "team")
+
+    # written by leagues.turnout (forecast_turnout)
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
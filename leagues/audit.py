@@ -0,0 +1,120 @@
+"""
+Change history for match results, match events and match status.
+
+Receivers in `leagues.signals` diff each save against the values snapshotted when the row
+was loaded, so recording an entry costs no queries. Entries are queued once their
+transaction commits (rolled-back edits never reach the log) and written with a single bulk
+insert when the surrounding `audit_batch()` closes. `leaguehub.middleware.AuditBatchMiddleware`
+opens one batch per request, so an admin save with a dozen inline events adds one INSERT.
+That flush is synchronous: it runs in the request thread, in autocommit, after the view
+returns and before the response goes back to the client, so the log is complete by the time
+the client sees the response (the cost is one extra round trip on requests that audited).
+Outside a batch (shell, scripts) each entry is written as soon as its transaction commits.
+"""
+import contextvars
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Appearance, AuditEntry, CardEvent, GoalEvent, Match, MatchResult
+
+# fields with a history, per audited model; Match only tracks its status
+AUDITED_FIELDS = {
+  MatchResult: ("home_score", "away_score", "is_forfeit", "recorded_by"),
+  GoalEvent: ("team_id", "scorer_id", "minute"),
+  CardEvent: ("team_id", "player_id", "card", "minute", "note"),
+  Appearance: ("team_id", "player_id"),
+  Match: ("status",),
+}
+
+_batch = contextvars.ContextVar("leagues_audit_batch", default=None)
+
+
+class _Batch:
+  __slots__ = ("entries", "get_actor", "closed")
+
+  def __init__(self, get_actor):
+    self.entries = []
+    self.get_actor = get_actor
+    self.closed = False
+
+
+@contextmanager
+def audit_batch(get_actor=None):
+  """
+  Buffer audit entries committed inside the block and insert them together on exit.
+  `get_actor` is called once, at flush time, and returns the user to credit (or None).
+  Nested blocks join the outer batch, which does the single flush.
+  """
+  outer = _batch.get()
+  if outer is not None and not outer.closed:
+    yield outer
+    return
+  batch = _Batch(get_actor)
+  token = _batch.set(batch)
+  try:
+    yield batch
+  finally:
+    _batch.reset(token)
+    batch.closed = True
+    if batch.entries:
+      actor = batch.get_actor() if batch.get_actor else None
+      if actor is not None:
+        for entry in batch.entries:
+          entry.actor = actor
+      AuditEntry.objects.bulk_create(batch.entries, batch_size=500)
+
+
+def _values(instance):
+  # read straight from __dict__ so deferred fields never trigger a query
+  return {f: instance.__dict__[f] for f in AUDITED_FIELDS[type(instance)] if f in instance.__dict__}
+
+
+def snapshot(instance):
+  instance._audit_loaded = _values(instance)
+
+
+def _queue(instance, action, changes):
+  entry = AuditEntry(
+    entity_type=instance._meta.model_name,
+    entity_id=instance.pk,
+    match_id=instance.pk if isinstance(instance, Match) else instance.match_id,
+    action=action,
+    changes=changes,
+    created_at=timezone.now(),
+  )
+  batch = _batch.get()
+
+  def enqueue():
+    if batch is None or batch.closed:
+      AuditEntry.objects.bulk_create([entry])
+    else:
+      batch.entries.append(entry)
+
+  transaction.on_commit(enqueue)
+
+
+def record_save(instance, created):
+  current = _values(instance)
+  if created:
+    changes = {f: [None, v] for f, v in current.items()}
+  else:
+    loaded = getattr(instance, "_audit_loaded", {})
+    changes = {f: [loaded[f], v] for f, v in current.items() if f in loaded and loaded[f] != v}
+  instance._audit_loaded = current
+  if changes:
+    _queue(instance, AuditEntry.Action.CREATE if created else AuditEntry.Action.UPDATE, changes)
+
+
+def record_delete(instance):
+  _queue(instance, AuditEntry.Action.DELETE, {f: [v, None] for f, v in _values(instance).items()})
+
+
+def record_bulk(instances, *, created=False):
+  """
+  Audit rows written with bulk_create / update(), which send no signals. Updated rows are
+  diffed against their post_init snapshot, so load them through the ORM before changing them.
+  """
+  for instance in instances:
+    record_save(instance, created)
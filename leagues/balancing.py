@@ -0,0 +1,350 @@
+"""
+Season set-up: which division each of last season's teams plays in next season.
+
+`propose` reads the previous season's teams, results and ratings and the new season's
+divisions in a handful of queries; `plan` does the rest in memory, in milliseconds for
+hundreds of teams:
+
+1. Rank the returning teams. A level is the divisions sharing a sort_order. With
+   basis="standings", the top `promote` of each division move up a level and the bottom
+   `relegate` move down, and teams are ranked by level, then table position. With
+   basis="ratings" they're ranked by rating alone.
+2. Cut the ranking into the new season's levels by the divisions' target sizes. When the
+   sizes can't take every team its finish moved (say two parallel divisions each promoting
+   into one division), the cut wins and the team is reported in `Proposal.overridden`.
+3. Deal each level's teams across its parallel divisions in snake order of rating, so
+   divisions on the same level are evenly matched.
+4. Keep clubs apart: a team whose club (or name) is already taken in its division swaps with
+   the nearest-ranked team in another division of the same level that clashes with neither
+   division. Swaps never cross levels, so they can't undo a promotion or relegation.
+
+`apply_proposal` then creates the new season's Team and TeamSeason rows with two bulk inserts.
+"""
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+
+from .models import Division, Match, MatchResult, Season, Team, TeamSeason
+from .publisher import mark_stale
+from .ratings import BASE_RATING
+from .standings import compute_standings
+
+BASIS_STANDINGS = "standings"
+BASIS_RATINGS = "ratings"
+BASES = (BASIS_STANDINGS, BASIS_RATINGS)
+DEFAULT_PROMOTE = 2
+DEFAULT_RELEGATE = 2
+
+
+@dataclass
+class Entry:
+  """A returning team as it finished the previous season."""
+  team_id: object
+  name: str
+  club: str = ""
+  division_id: object = None
+  level: int = 0
+  position: int = 1  # 1-based place in its division's final table
+  division_size: int = 1
+  rating: float = BASE_RATING
+
+
+def _movement(level, previous_level) -> str:
+  if level < previous_level:
+    return "up"
+  return "down" if level > previous_level else "same"
+
+
+@dataclass
+class Placement:
+  entry: Entry
+  division_id: object
+  level: int
+  rank: int  # 0-based place in the season-wide ranking
+  # moved away from its ranked division to keep a club (or name) apart
+  swapped: bool = False
+  # the level its finish earned (basis="standings"; None with ratings)
+  earned_level: int = None
+
+  @property
+  def movement(self) -> str:
+    return _movement(self.level, self.entry.level)
+
+  @property
+  def earned_movement(self) -> str:
+    return self.movement if self.earned_level is None else _movement(self.earned_level, self.entry.level)
+
+  @property
+  def overridden(self) -> bool:
+    """The division sizes put the team on another level than its finish earned."""
+    return self.earned_level is not None and self.level != self.earned_level
+
+
+@dataclass
+class Proposal:
+  previous_season: object
+  # [(division id, name, level, size)] of the new season, top level first
+  divisions: list
+  placements: list = field(default_factory=list)
+  # placements still sharing a club with a division-mate: no swap could fix them
+  clashes: list = field(default_factory=list)
+
+  @property
+  def overridden(self) -> list:
+    """Placements whose promotion, relegation or stay the division sizes didn't allow."""
+    return sorted((p for p in self.placements if p.overridden), key=lambda p: p.rank)
+
+  def by_division(self) -> dict:
+    grouped = defaultdict(list)
+    for p in sorted(self.placements, key=lambda p: p.rank):
+      grouped[p.division_id].append(p)
+    return grouped
+
+
+# ---------- planning ----------
+
+def _levels(sort_orders) -> dict:
+  return {order: level for level, order in enumerate(sorted(set(sort_orders)))}
+
+
+def _earned(e, promote, relegate, bottom):
+  """(level `e`'s finish sends it to, 0 relegated into it / 1 stayed / 2 promoted into it)."""
+  if e.level > 0 and e.position <= promote:
+    return e.level - 1, 2
+  if e.level < bottom and e.position > e.division_size - relegate:
+    return e.level + 1, 0
+  return e.level, 1
+
+
+def _ranking(entries, basis, promote, relegate):
+  """Entries in ranked order, with the level each one's finish earned (None with ratings)."""
+  if basis == BASIS_RATINGS:
+    return [(e, None) for e in sorted(entries, key=lambda e: (-e.rating, e.level, e.position, e.name))]
+  bottom = max((e.level for e in entries), default=0)
+  earned = [(e, _earned(e, promote, relegate, bottom)) for e in entries]
+  # promoted teams rank at the bottom of the level they move up to, relegated ones at the top
+  earned.sort(key=lambda pair: (*pair[1], pair[0].position, -pair[0].rating))
+  return [(e, level) for e, (level, _) in earned]
+
+
+def _snake(count):
+  while True:
+    yield from range(count)
+    yield from reversed(range(count))
+
+
+def _deal(level_entries, divisions, start_rank):
+  """Snake-draft one level's ranked entries across its divisions, strongest rating first."""
+  room = [d[3] for d in divisions]
+  turns = _snake(len(divisions))
+  placed = {}
+  for i in sorted(range(len(level_entries)), key=lambda i: (-level_entries[i].rating, i)):
+    d = next(d for d in turns if room[d])
+    room[d] -= 1
+    placed[i] = divisions[d][0]
+  return [(entry, placed[i], start_rank + i) for i, entry in enumerate(level_entries)]
+
+
+def _tags(entry, separate_clubs):
+  tags = {"name:" + entry.name.strip().lower()}
+  if separate_clubs and entry.club.strip():
+    tags.add("club:" + entry.club.strip().lower())
+  return tags
+
+
+def _separate(placements, separate_clubs):
+  """Swap clashing teams apart; returns the placements that still clash."""
+  tags = {id(p): _tags(p.entry, separate_clubs) for p in placements}
+  counts = defaultdict(Counter)
+  for p in placements:
+    counts[p.division_id].update(tags[id(p)])
+
+  def clashing(p):
+    return any(counts[p.division_id][t] > 1 for t in tags[id(p)])
+
+  def fits(p, q):
+    # p moves into q's division and q into p's without a new clash
+    return (
+      all(counts[q.division_id][t] - (t in tags[id(q)]) == 0 for t in tags[id(p)])
+      and all(counts[p.division_id][t] - (t in tags[id(p)]) == 0 for t in tags[id(q)])
+    )
+
+  unresolved = []
+  # lowest-ranked first, so the stronger team keeps its place
+  for p in sorted(placements, key=lambda p: -p.rank):
+    if not clashing(p):
+      continue
+    # same level only: a swap across levels would undo a promotion or relegation
+    candidates = sorted(
+      (q for q in placements if q.level == p.level and q.division_id != p.division_id),
+      key=lambda q: abs(q.rank - p.rank),
+    )
+    q = next((q for q in candidates if fits(p, q)), None)
+    if q is None:
+      unresolved.append(p)
+      continue
+    counts[p.division_id].subtract(tags[id(p)])
+    counts[q.division_id].subtract(tags[id(q)])
+    p.division_id, q.division_id = q.division_id, p.division_id
+    p.swapped = q.swapped = True
+    counts[p.division_id].update(tags[id(p)])
+    counts[q.division_id].update(tags[id(q)])
+  return [p for p in unresolved if clashing(p)]
+
+
+def plan(entries, divisions, *, promote=DEFAULT_PROMOTE, relegate=DEFAULT_RELEGATE, basis=BASIS_STANDINGS, separate_clubs=True):
+  """
+  Placements for `entries` in `divisions` [(id, name, sort_order, size)]. Returns
+  (placements, clashes, divisions as [(id, name, level, size)]).
+  """
+  if basis not in BASES:
+    raise ValidationError({"basis": f"Choose one of: {', '.join(BASES)}."})
+  if sum(d[3] for d in divisions) != len(entries):
+    raise ValidationError({"sizes": f"Division sizes add up to {sum(d[3] for d in divisions)}, but {len(entries)} teams return."})
+
+  levels = _levels(d[2] for d in divisions)
+  by_level = defaultdict(list)
+  for division_id, name, sort_order, size in divisions:
+    by_level[levels[sort_order]].append((division_id, name, levels[sort_order], size))
+
+  ranking = _ranking(entries, basis, promote, relegate)
+  placements = []
+  start = 0
+  for level in sorted(by_level):
+    level_divisions = by_level[level]
+    capacity = sum(d[3] for d in level_divisions)
+    ranked = ranking[start:start + capacity]
+    for entry, division_id, rank in _deal([e for e, _ in ranked], level_divisions, start):
+      placements.append(Placement(entry, division_id, level, rank, earned_level=ranked[rank - start][1]))
+    start += capacity
+  clashes = _separate(placements, separate_clubs)
+  return placements, clashes, [d for level in sorted(by_level) for d in by_level[level]]
+
+
+# ---------- loading and applying ----------
+
+def previous_season_for(season):
+  """The organization's most recent other season that has teams."""
+  return (
+    Season.objects
+    .filter(organization_id=season.organization_id, divisions__teams__isnull=False)
+    .exclude(pk=season.pk)
+    .order_by(F("start_date").desc(nulls_last=True), "-created_at")
+    .first()
+  )
+
+
+def returning_entries(previous, *, exclude=()):
+  """Entries for the previous season's active, non-withdrawn teams, with final positions."""
+  teams = list(
+    Team.objects
+    .filter(division__season=previous, is_active=True)
+    .exclude(team_seasons__season=previous, team_seasons__status=TeamSeason.Status.WITHDRAWN)
+    .exclude(pk__in=list(exclude))
+    .values_list("pk", "name", "club", "division_id", "division__sort_order", "rating__rating")
+  )
+  results = defaultdict(list)
+  for division_id, *result in (
+    MatchResult.objects
+    .filter(match__season=previous, match__status=Match.Status.FINAL)
+    .values_list("match__division_id", "match__home_team_id", "match__away_team_id", "home_score", "away_score")
+  ):
+    results[division_id].append(result)
+
+  levels = _levels(t[4] for t in teams)
+  by_division = defaultdict(list)
+  for team in teams:
+    by_division[team[3]].append(team)
+  entries = []
+  for division_id, division_teams in by_division.items():
+    table = compute_standings([(t[0], t[1]) for t in division_teams], results[division_id])
+    position = {row.team_id: i for i, row in enumerate(table, start=1)}
+    for pk, name, club, _, sort_order, rating in division_teams:
+      entries.append(Entry(
+        team_id=pk,
+        name=name,
+        club=club,
+        division_id=division_id,
+        level=levels[sort_order],
+        position=position[pk],
+        division_size=len(division_teams),
+        rating=BASE_RATING if rating is None else rating,
+      ))
+  return entries
+
+
+def _default_sizes(divisions, previous_sizes, total):
+  """The previous season's sizes when the division count is unchanged, else an even split."""
+  if len(previous_sizes) == len(divisions) and sum(previous_sizes) == total:
+    return previous_sizes
+  base, extra = divmod(total, len(divisions))
+  return [base + (1 if i < extra else 0) for i in range(len(divisions))]
+
+
+def propose(season, previous=None, *, promote=DEFAULT_PROMOTE, relegate=DEFAULT_RELEGATE, basis=BASIS_STANDINGS,
+            sizes=None, exclude=(), separate_clubs=True) -> Proposal:
+  """
+  Proposed divisions for `season` from `previous` (default: the organization's last
+  season). `sizes` maps the new season's division ids to their number of teams.
+  """
+  previous = previous or previous_season_for(season)
+  if previous is None:
+    raise ValidationError({"previous_season": "The organization has no earlier season with teams."})
+  if previous.pk == season.pk or previous.organization_id != season.organization_id:
+    raise ValidationError({"previous_season": "Choose another season of the same organization."})
+  divisions = list(Division.objects.filter(season=season).order_by("sort_order", "name").values_list("pk", "name", "sort_order"))
+  if not divisions:
+    raise ValidationError({"season": "Create the season's divisions first."})
+
+  entries = returning_entries(previous, exclude=exclude)
+  if sizes:
+    unknown = set(sizes) - {d[0] for d in divisions}
+    if unknown:
+      raise ValidationError({"sizes": f"Not divisions of {season.name}: {', '.join(map(str, sorted(unknown)))}."})
+    counts = [sizes.get(d[0], 0) for d in divisions]
+  else:
+    previous_counts = Counter(e.division_id for e in entries)
+    previous_order = Division.objects.filter(season=previous).order_by("sort_order", "name").values_list("pk", flat=True)
+    counts = _default_sizes(divisions, [previous_counts[d] for d in previous_order if previous_counts[d]], len(entries))
+
+  placements, clashes, levelled = plan(
+    entries,
+    [(*d, size) for d, size in zip(divisions, counts)],
+    promote=promote,
+    relegate=relegate,
+    basis=basis,
+    separate_clubs=separate_clubs,
+  )
+  return Proposal(previous, levelled, placements, clashes)
+
+
+def apply_proposal(season, proposal) -> list:
+  """Create the new season's teams, linked to their previous teams, and their TeamSeasons."""
+  with transaction.atomic():
+    ids = [p.entry.team_id for p in proposal.placements]
+    if Team.objects.filter(division__season=season, previous_team_id__in=ids).exists():
+      raise ValidationError({"season": f"Teams from {proposal.previous_season.name} have already been carried into {season.name}."})
+    previous = Team.objects.in_bulk(ids)
+    teams = []
+    for p in sorted(proposal.placements, key=lambda p: p.rank):
+      old = previous[p.entry.team_id]
+      teams.append(Team(
+        division_id=p.division_id,
+        # bulk_create skips Team.save(), which would derive this
+        organization_id=season.organization_id,
+        name=old.name,
+        short_name=old.short_name,
+        club=old.club,
+        primary_contact_name=old.primary_contact_name,
+        primary_contact_email=old.primary_contact_email,
+        primary_contact_phone=old.primary_contact_phone,
+        home_venue_id=old.home_venue_id,
+        previous_team=old,
+      ))
+    Team.objects.bulk_create(teams, batch_size=500)
+    TeamSeason.objects.bulk_create([TeamSeason(season=season, team=t) for t in teams], batch_size=500)
+    mark_stale(*{t.division_id for t in teams})
+  return teams
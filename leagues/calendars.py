@@ -0,0 +1,55 @@
+from datetime import date, timedelta
+from itertools import groupby
+
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+from .models import Match
+
+VIEWS = ("day", "week", "month")
+
+
+def refresh_local_dates(organization) -> int:
+  """Recompute Match.local_date for one organization in the database (e.g. after a timezone change)."""
+  return (
+    Match.objects
+    .filter(organization=organization)
+    .update(local_date=TruncDate("starts_at", tzinfo=organization.tzinfo))
+  )
+
+
+def date_window(view: str, anchor: date) -> tuple[date, date]:
+  """Inclusive [start, end] local dates for a day/week/month view containing `anchor` (weeks start Monday)."""
+  if view == "day":
+    return anchor, anchor
+  if view == "week":
+    start = anchor - timedelta(days=anchor.weekday())
+    return start, start + timedelta(days=6)
+  if view == "month":
+    start = anchor.replace(day=1)
+    next_month = (start + timedelta(days=32)).replace(day=1)
+    return start, next_month - timedelta(days=1)
+  raise ValueError(f"Unknown calendar view: {view}")
+
+
+def calendar_queryset(organization, start: date, end: date, *, season_id=None, venue_id=None, team_id=None):
+  qs = Match.objects.filter(organization=organization, local_date__range=(start, end))
+  if season_id:
+    qs = qs.filter(season_id=season_id)
+  if venue_id:
+    qs = qs.filter(venue_id=venue_id)
+  if team_id:
+    qs = qs.filter(Q(home_team_id=team_id) | Q(away_team_id=team_id))
+  return qs
+
+
+def day_counts(qs) -> dict:
+  """{local_date: match count}, grouped in the database."""
+  return dict(
+    qs.order_by().values("local_date").annotate(n=Count("id")).values_list("local_date", "n")
+  )
+
+
+def group_by_day(matches):
+  """Group matches already ordered by (local_date, starts_at) into [(local_date, [matches])]."""
+  return [(d, list(ms)) for d, ms in groupby(matches, key=lambda m: m.local_date)]
@@ -0,0 +1,248 @@
+"""
+Venue capacity planner.
+
+Availability windows (weekly, org-local time) times `Venue.field_count` give the bookable
+field-minutes of a venue. Booked matches are swept against them to get utilization,
+over-bookings and the free slots still left in a date range.
+"""
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+
+from .models import Match, Venue, VenueAvailability
+
+# statuses that hold a field booking
+BOOKED_STATUSES = (Match.Status.SCHEDULED, Match.Status.FINAL)
+
+
+def match_duration() -> timedelta:
+  return timedelta(minutes=settings.LEAGUES_MATCH_MINUTES)
+
+
+@dataclass(frozen=True)
+class Slot:
+  venue_id: object
+  starts_at: datetime
+  free_fields: int
+
+
+@dataclass(frozen=True)
+class Overbooking:
+  venue_id: object
+  starts_at: datetime
+  ends_at: datetime
+  booked: int
+  capacity: int
+
+
+@dataclass
+class VenueUsage:
+  venue_id: object
+  name: str
+  available_minutes: int = 0
+  booked_minutes: int = 0
+
+  @property
+  def utilization(self) -> float:
+    return self.booked_minutes / self.available_minutes if self.available_minutes else 0.0
+
+
+@dataclass
+class CapacityPlan:
+  start: date
+  end: date
+  usage: dict = field(default_factory=dict)
+  free_slots: list = field(default_factory=list)
+  overbookings: list = field(default_factory=list)
+
+  @property
+  def available_minutes(self) -> int:
+    return sum(u.available_minutes for u in self.usage.values())
+
+  @property
+  def booked_minutes(self) -> int:
+    return sum(u.booked_minutes for u in self.usage.values())
+
+  @property
+  def utilization(self) -> float:
+    return self.booked_minutes / self.available_minutes if self.available_minutes else 0.0
+
+  @property
+  def free_capacity(self) -> int:
+    """Number of additional matches that fit in the range."""
+    return sum(s.free_fields for s in self.free_slots)
+
+  def slots_for(self, matches: int) -> list:
+    """Earliest (venue_id, starts_at) placements for `matches` new fixtures (fewer if they don't fit)."""
+    placements = []
+    for slot in self.free_slots:
+      for _ in range(slot.free_fields):
+        if len(placements) == matches:
+          return placements
+        placements.append((slot.venue_id, slot.starts_at))
+    return placements
+
+
+# ---------- sweep ----------
+
+def _merge(intervals):
+  merged = []
+  for s, e in sorted(intervals):
+    if merged and s <= merged[-1][1]:
+      merged[-1][1] = max(merged[-1][1], e)
+    else:
+      merged.append([s, e])
+  return [(s, e) for s, e in merged]
+
+
+class _Timeline:
+  """Piecewise-constant booking count of one venue, built with a single sweep over start/end events."""
+
+  def __init__(self, bookings, duration):
+    events = defaultdict(int)
+    for s in bookings:
+      events[s] += 1
+      events[s + duration] -= 1
+    self.starts = []
+    self.ends = []
+    self.counts = []
+    running = 0
+    points = sorted(events)
+    for a, b in zip(points, points[1:]):
+      running += events[a]
+      if running:
+        self.starts.append(a)
+        self.ends.append(b)
+        self.counts.append(running)
+
+  def segments(self, lo, hi):
+    """(start, end, count) pieces overlapping [lo, hi), clipped to it."""
+    i = max(bisect_right(self.starts, lo) - 1, 0)
+    while i < len(self.starts) and self.starts[i] < hi:
+      if self.ends[i] > lo:
+        yield max(self.starts[i], lo), min(self.ends[i], hi), self.counts[i]
+      i += 1
+
+  def __iter__(self):
+    return zip(self.starts, self.ends, self.counts)
+
+  def peak(self, lo, hi) -> int:
+    return max((c for _, _, c in self.segments(lo, hi)), default=0)
+
+
+def _window_intervals(windows, start, end, tz):
+  by_weekday = defaultdict(list)
+  for w in windows:
+    by_weekday[w.weekday].append(w)
+
+  intervals = []
+  day = start
+  while day <= end:
+    for w in by_weekday.get(day.weekday(), ()):
+      intervals.append((
+        datetime.combine(day, w.opens_at, tzinfo=tz),
+        datetime.combine(day, w.closes_at, tzinfo=tz),
+      ))
+    day += timedelta(days=1)
+  return _merge(intervals)
+
+
+def _plan_venue(plan, venue, windows, bookings, start, end, tz, duration):
+  usage = plan.usage[venue.id] = VenueUsage(venue_id=venue.id, name=venue.name)
+  opening = _window_intervals(windows, start, end, tz)
+  timeline = _Timeline(bookings, duration)
+  capacity = venue.field_count
+
+  for ws, we in opening:
+    usage.available_minutes += int((we - ws).total_seconds() // 60) * capacity
+    for a, b, count in timeline.segments(ws, we):
+      usage.booked_minutes += int((b - a).total_seconds() // 60) * min(count, capacity)
+
+    t = ws
+    while t + duration <= we:
+      free = capacity - timeline.peak(t, t + duration)
+      if free > 0:
+        plan.free_slots.append(Slot(venue.id, t, free))
+      t += duration
+
+  # anything booked above capacity, including bookings outside opening hours
+  cursor = None
+  for a, b, count in timeline:
+    open_here = any(ws <= a and b <= we for ws, we in opening)
+    cap = capacity if open_here else 0
+    if count > cap:
+      if cursor and cursor.ends_at == a and cursor.capacity == cap:
+        cursor = Overbooking(venue.id, cursor.starts_at, b, max(cursor.booked, count), cap)
+        plan.overbookings[-1] = cursor
+      else:
+        cursor = Overbooking(venue.id, a, b, count, cap)
+        plan.overbookings.append(cursor)
+
+
+def plan_capacity(organization, start: date, end: date, *, venues=None) -> CapacityPlan:
+  """
+  Utilization, free slots and over-bookings for every active venue of `organization`
+  between the local dates `start` and `end` (inclusive). Runs three queries in total.
+  Venues without availability windows are left out (their capacity is unknown).
+  """
+  tz = organization.tzinfo
+  duration = match_duration()
+
+  if venues is None:
+    venues = Venue.objects.filter(organization=organization, is_active=True)
+  venues = {v.id: v for v in venues}
+
+  windows = defaultdict(list)
+  for w in VenueAvailability.objects.filter(venue_id__in=venues):
+    windows[w.venue_id].append(w)
+
+  bookings = defaultdict(list)
+  booked = (
+    Match.live
+    .filter(venue_id__in=windows, status__in=BOOKED_STATUSES, local_date__range=(start, end))
+    .values_list("venue_id", "starts_at")
+  )
+  for venue_id, starts_at in booked:
+    bookings[venue_id].append(starts_at)
+
+  plan = CapacityPlan(start=start, end=end)
+  for venue_id, venue_windows in windows.items():
+    _plan_venue(plan, venues[venue_id], venue_windows, bookings[venue_id], start, end, tz, duration)
+
+  plan.free_slots.sort(key=lambda s: (s.starts_at, str(s.venue_id)))
+  return plan
+
+
+def booking_conflict(venue, starts_at, *, exclude_match_id=None):
+  """
+  Reason a match can't be booked at `venue` / `starts_at`, or None when it fits.
+  Venues without availability windows are not checked.
+  """
+  windows = list(venue.availability_windows.all())
+  if not windows:
+    return None
+
+  tz = venue.organization.tzinfo
+  duration = match_duration()
+  local = starts_at.astimezone(tz)
+  opening = _window_intervals(windows, local.date(), local.date(), tz)
+  if not any(ws <= local and local + duration <= we for ws, we in opening):
+    return "Venue is not open for the full match at that time."
+
+  overlapping = (
+    Match.live
+    .filter(
+      venue=venue,
+      status__in=BOOKED_STATUSES,
+      starts_at__gt=starts_at - duration,
+      starts_at__lt=starts_at + duration,
+    )
+    .exclude(pk=exclude_match_id)
+    .values_list("starts_at", flat=True)
+  )
+  if _Timeline(overlapping, duration).peak(starts_at, starts_at + duration) >= venue.field_count:
+    return "All fields at this venue are booked at that time."
+  return None
@@ -0,0 +1,71 @@
+from django.db.models import OuterRef, Q, Subquery
+from django.utils import timezone
+
+from .models import Match, Team
+
+
+def _team_matches():
+  return Match.objects.filter(Q(home_team=OuterRef("pk")) | Q(away_team=OuterRef("pk")))
+
+
+def refresh_team_match_pointers(team_ids=None, *, now=None) -> int:
+  """
+  Recompute Team.next_match / Team.last_final_match in a single UPDATE.
+
+  `team_ids=None` refreshes every team (bulk recompute); otherwise only the given teams.
+  Returns the number of teams updated.
+  """
+  now = now or timezone.now()
+
+  next_match = (
+    _team_matches()
+    .filter(status=Match.Status.SCHEDULED, starts_at__gte=now)
+    .order_by("starts_at", "id")
+    .values("pk")[:1]
+  )
+  last_final = (
+    _team_matches()
+    .filter(status=Match.Status.FINAL)
+    .order_by("-starts_at", "-id")
+    .values("pk")[:1]
+  )
+
+  qs = Team.objects.all()
+  if team_ids is not None:
+    team_ids = {t for t in team_ids if t}
+    if not team_ids:
+      return 0
+    qs = qs.filter(pk__in=team_ids)
+
+  return qs.update(next_match=Subquery(next_match), last_final_match=Subquery(last_final))
+
+
+def resolve_next_matches(teams, *, related=(), now=None):
+  """
+  Read-time fallback for `Team.next_match`, which only moves when a match is saved and so
+  still points at a fixture after it kicks off. Teams whose pointer is in the past get their
+  real next match (fetched in one query, with `related` select_related) set in memory; nothing
+  is written. Returns the teams.
+  """
+  now = now or timezone.now()
+  stale = {t.pk: t for t in teams if t.next_match_id and t.next_match.starts_at < now}
+  if not stale:
+    return teams
+
+  upcoming = (
+    Match.objects
+    .filter(Q(home_team_id__in=stale) | Q(away_team_id__in=stale), status=Match.Status.SCHEDULED, starts_at__gte=now)
+    .select_related(*related)
+    .order_by("starts_at", "id")
+  )
+  pending = dict(stale)
+  for match in upcoming:
+    for team_id in (match.home_team_id, match.away_team_id):
+      team = pending.pop(team_id, None)
+      if team is not None:
+        team.next_match = match
+    if not pending:
+      break
+  for team in pending.values():
+    team.next_match = None
+  return teams
@@ -0,0 +1,217 @@
+"""
+Forfeits from attendance: pre-match warnings and provisional walkovers, per DivisionRules.
+
+`sweep` is meant to run every few minutes (`manage.py forfeit_sweep` from cron, or the
+`leagues.forfeit_sweep` job). It's opt-in per division: only divisions with a DivisionRules
+row are swept. One aggregate query over MatchAttendance reads both sides' reply and GOING
+counts, with the division's rules, for every result-less scheduled match from
+SWEEP_LOOKBACK ago to SWEEP_HORIZON ahead. A side that has replied at all but has fewer
+than `min_players` GOING is short; a side with no replies is left alone, since silence
+says nothing about who turns up. Then:
+
+- a short side within `warning_hours` of kick-off gets one warning per fixture time, to its
+  contacts and captains, through the notifications outbox;
+- with `auto_forfeit` on, `grace_minutes` after kick-off a match with a short side gets a
+  provisional forfeit MatchResult (one bulk insert): `forfeit_goals`-0 to the side that
+  turned up, 0-0 when neither did. The match stays SCHEDULED, so the result counts nowhere until an admin
+  confirms it (`confirm_forfeits`, which enters it like any other result) or rejects it
+  (`reject_forfeits`, after which the sweep leaves the match alone).
+"""
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from notifications import outbox
+from notifications.backends import channels
+from notifications.models import Notification
+
+from . import audit, results
+from .models import Division, Match, MatchAttendance, MatchResult, TeamMember
+
+SWEEP_HORIZON = timedelta(hours=72)  # DivisionRules.warning_hours is capped to this
+# kick-offs further back than this are left to the admins
+SWEEP_LOOKBACK = timedelta(hours=48)
+RECORDED_BY = "forfeit sweep"
+
+RULE_FIELDS = ("min_players", "forfeit_goals", "warning_hours", "grace_minutes", "auto_forfeit")
+
+
+@dataclass
+class SweepOutcome:
+  scanned: int = 0
+  warned: list = field(default_factory=list)  # (match id, team id)
+  forfeited: list = field(default_factory=list)  # match ids
+
+
+def _replies(side, **status):
+  return Count(
+    "attendances",
+    filter=Q(attendances__team_id=F(f"{side}_team_id"), **{f"attendances__{k}": v for k, v in status.items()}),
+  )
+
+
+def scan(now):
+  """
+  Every result-less scheduled match of a division with rules in the sweep window, with
+  reply and GOING counts and the rules, in one query.
+  """
+  rules = {name: F(f"division__rules__{name}") for name in RULE_FIELDS}
+  return list(
+    Match.live
+    .filter(
+      division__rules__isnull=False,
+      status=Match.Status.SCHEDULED,
+      result__isnull=True,
+      forfeit_rejected_at__isnull=True,
+      starts_at__gt=now - SWEEP_LOOKBACK,
+      starts_at__lte=now + SWEEP_HORIZON,
+    )
+    .values("pk", "starts_at", "division_id", "home_team_id", "away_team_id")
+    .annotate(
+      home_replies=_replies("home"),
+      away_replies=_replies("away"),
+      home_going=_replies("home", status=MatchAttendance.Status.GOING),
+      away_going=_replies("away", status=MatchAttendance.Status.GOING),
+      **rules,
+    )
+  )
+
+
+def forfeit_score(home_short, away_short, goals):
+  if home_short and away_short:
+    return 0, 0
+  return (0, goals) if home_short else (goals, 0)
+
+
+def sweep(*, now=None) -> SweepOutcome:
+  now = now or timezone.now()
+  outcome = SweepOutcome()
+  rows = scan(now)
+  outcome.scanned = len(rows)
+
+  warn, forfeit = [], []
+  for row in rows:
+    short = {
+      side: row[f"{side}_replies"] > 0 and row[f"{side}_going"] < row["min_players"]
+      for side in ("home", "away")
+    }
+    if not any(short.values()):
+      continue
+    if row["starts_at"] > now:
+      if row["starts_at"] <= now + timedelta(hours=row["warning_hours"]):
+        warn.extend((row["pk"], row[f"{side}_team_id"], row[f"{side}_going"], row["min_players"]) for side in short if short[side])
+    elif row["auto_forfeit"] and row["starts_at"] + timedelta(minutes=row["grace_minutes"]) <= now:
+      home_score, away_score = forfeit_score(short["home"], short["away"], row["forfeit_goals"])
+      forfeit.append(MatchResult(
+        match_id=row["pk"],
+        home_score=home_score,
+        away_score=away_score,
+        is_forfeit=True,
+        is_provisional=True,
+        recorded_by=RECORDED_BY,
+      ))
+
+  if warn:
+    outcome.warned = [(match_id, team_id) for match_id, team_id, _, _ in warn]
+    _queue_warnings(warn)
+  if forfeit:
+    with audit.audit_batch(), transaction.atomic():
+      MatchResult.objects.bulk_create(forfeit, ignore_conflicts=True)
+      # ignore_conflicts hands back every row; only those whose pk landed were inserted, the
+      # rest lost to a result entered meanwhile
+      created = list(MatchResult.objects.filter(pk__in=[r.pk for r in forfeit]))
+      audit.record_bulk(created, created=True)
+    outcome.forfeited = [r.match_id for r in created]
+  return outcome
+
+
+# ---------- warnings ----------
+
+def _captain_contacts(pairs):
+  """(channel, address) pairs of the active captains per (season id, team id)."""
+  configured = channels()
+  contacts = defaultdict(list)
+  rows = (
+    TeamMember.objects
+    .filter(
+      role=TeamMember.Role.CAPTAIN,
+      is_active=True,
+      team_season__team_id__in={team_id for _, team_id in pairs},
+      team_season__season_id__in={season_id for season_id, _ in pairs},
+    )
+    .values_list("team_season__season_id", "team_season__team_id", "email", "phone")
+  )
+  for season_id, team_id, email, phone in rows:
+    if email and Notification.Channel.EMAIL in configured:
+      contacts[(season_id, team_id)].append((Notification.Channel.EMAIL, email))
+    if phone and Notification.Channel.SMS in configured:
+      contacts[(season_id, team_id)].append((Notification.Channel.SMS, phone))
+  return contacts
+
+
+def _dedupe_key(match, team_id, channel, recipient) -> str:
+  who = hashlib.sha1(recipient.strip().lower().encode()).hexdigest()
+  return f"forfeit-warning:{match.pk}:{team_id}:{int(match.starts_at.timestamp())}:{channel}:{who}"
+
+
+def _queue_warnings(warn):
+  matches = Match.objects.select_related("season__organization", "division", "home_team", "away_team", "venue").in_bulk(
+    {match_id for match_id, *_ in warn}
+  )
+  captains = _captain_contacts({(matches[match_id].season_id, team_id) for match_id, team_id, *_ in warn})
+  notifications = []
+  for match_id, team_id, going, minimum in warn:
+    match = matches[match_id]
+    team = match.home_team if team_id == match.home_team_id else match.away_team
+    org = match.season.organization
+    when = timezone.localtime(match.starts_at, org.tzinfo)
+    recipients = dict.fromkeys([*outbox.team_contacts(team), *captains[(match.season_id, team_id)]])
+    for channel, recipient in recipients:
+      notifications.append(Notification(
+        organization=org,
+        kind="match.forfeit_warning",
+        channel=channel,
+        recipient=recipient,
+        subject=f"{team.name}: only {going} of {minimum} players confirmed for {when:%a %d %b %H:%M}",
+        body=(
+          f"{match.home_team.name} vs {match.away_team.name} ({match.division.name}) kicks off "
+          f"{when:%A %d %B %Y, %H:%M}. {going} players have replied GOING; {minimum} are needed.\n\n"
+          f"If fewer than {minimum} turn up the match will be recorded as a forfeit.\n"
+        ),
+        match=match,
+        dedupe_key=_dedupe_key(match, team_id, channel, recipient),
+      ))
+  # warnings are urgent: no digest window
+  outbox.queue(notifications, delay=timedelta(0))
+
+
+# ---------- admin confirmation ----------
+
+def confirm_forfeits(results_qs, *, recorded_by="") -> int:
+  """Make provisional forfeits final, entered per division like any other result. Returns how many."""
+  pending = list(results_qs.filter(is_provisional=True).select_related("match"))
+  by_division = defaultdict(list)
+  for result in pending:
+    by_division[result.match.division_id].append(
+      results.ResultEntry(result.match_id, result.home_score, result.away_score, is_forfeit=True)
+    )
+  divisions = Division.objects.in_bulk(list(by_division))
+  with transaction.atomic():
+    for division_id, entries in by_division.items():
+      results.enter_results(divisions[division_id], entries, recorded_by=recorded_by)
+  return len(pending)
+
+
+def reject_forfeits(results_qs) -> int:
+  """Drop provisional forfeits; the matches stay scheduled and the sweep won't enter them again."""
+  with transaction.atomic():
+    pending = results_qs.filter(is_provisional=True)
+    match_ids = list(pending.values_list("match_id", flat=True))
+    Match.objects.filter(pk__in=match_ids).update(forfeit_rejected_at=timezone.now())
+    pending.delete()
+  return len(match_ids)
@@ -0,0 +1,102 @@
+"""
+Proximity queries on Venue.lat / Venue.lng without PostGIS.
+
+A (organization, lat, lng) B-tree index narrows candidates to a bounding box, then the
+haversine distance is computed as a SQL expression so ranking happens in the database.
+"""
+import math
+
+from django.db.models import Count, F, FloatField, Q, Sum, Value
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
+
+from .models import Match, Venue
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def bounding_box(lat: float, lng: float, radius_km: float):
+  """(min_lat, max_lat, min_lng, max_lng) containing every point within radius_km."""
+  dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+  cos_lat = math.cos(math.radians(lat))
+  dlng = 180.0 if cos_lat < 1e-6 else min(180.0, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+  return max(-90.0, lat - dlat), min(90.0, lat + dlat), lng - dlng, lng + dlng
+
+
+def _rad(value):
+  if isinstance(value, (int, float)):
+    return Value(math.radians(value), output_field=FloatField())
+  return Radians(Cast(value, FloatField()))
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+  """SQL expression for the great-circle distance between two points; each argument is a field name or a float."""
+  def ref(v):
+    return F(v) if isinstance(v, str) else v
+
+  phi1, phi2 = _rad(ref(lat1)), _rad(ref(lat2))
+  lam1, lam2 = _rad(ref(lng1)), _rad(ref(lng2))
+  a = Power(Sin((phi2 - phi1) / 2), 2) + Cos(phi1) * Cos(phi2) * Power(Sin((lam2 - lam1) / 2), 2)
+  return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(a), output_field=FloatField())
+
+
+def distance_km(lat1, lng1, lat2, lng2) -> float:
+  """Plain-Python haversine, for single pairs."""
+  phi1, phi2 = math.radians(lat1), math.radians(lat2)
+  a = math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+  return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def venues_near(organization, lat: float, lng: float, radius_km: float):
+  """Active venues of `organization` within radius_km of (lat, lng), nearest first, annotated with distance_km."""
+  min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+
+  if min_lng < -180 or max_lng > 180:
+    # the box wraps the antimeridian: take both sides
+    lng_q = Q(lng__gte=(min_lng + 540) % 360 - 180) | Q(lng__lte=(max_lng + 540) % 360 - 180)
+  else:
+    lng_q = Q(lng__range=(min_lng, max_lng))
+
+  return (
+    Venue.objects
+    .filter(organization=organization, is_active=True, lat__range=(min_lat, max_lat))
+    .filter(lng_q)
+    .annotate(distance_km=haversine_km("lat", "lng", lat, lng))
+    .filter(distance_km__lte=radius_km)
+    .order_by("distance_km", "name")
+  )
+
+
+def team_travel_report(season) -> list:
+  """
+  Per-team travel from the team's home venue to the venues of its matches this season.
+  Distances are summed in the database, one aggregate query per side (home / away).
+  Matches without a venue, or teams without a located home venue, are skipped.
+  """
+  base = Match.objects.filter(season=season).exclude(status=Match.Status.CANCELLED).filter(
+    venue__lat__isnull=False, venue__lng__isnull=False
+  )
+
+  totals = {}
+  for side in ("home_team", "away_team"):
+    rows = (
+      base
+      .filter(**{f"{side}__home_venue__lat__isnull": False, f"{side}__home_venue__lng__isnull": False})
+      .values(side, f"{side}__name")
+      .annotate(
+        matches=Count("id"),
+        total_km=Sum(haversine_km(f"{side}__home_venue__lat", f"{side}__home_venue__lng", "venue__lat", "venue__lng")),
+      )
+      .order_by()
+    )
+    for row in rows:
+      entry = totals.setdefault(row[side], {"team": row[side], "name": row[f"{side}__name"], "matches": 0, "total_km": 0.0})
+      entry["matches"] += row["matches"]
+      entry["total_km"] += row["total_km"] or 0.0
+
+  report = []
+  for entry in totals.values():
+    entry["total_km"] = round(entry["total_km"], 2)
+    entry["avg_km"] = round(entry["total_km"] / entry["matches"], 2) if entry["matches"] else 0.0
+    report.append(entry)
+  report.sort(key=lambda e: e["avg_km"], reverse=True)
+  return report
@@ -0,0 +1,73 @@
+import uuid
+from datetime import datetime
+
+from core.jobs import job
+from core.models import Organization
+
+from . import forfeits, ratings, turnout, whatif
+from .fixtures import refresh_team_match_pointers
+from .models import Division, Season, Team
+from .publisher import publish_division, publish_org_index, publish_season_index
+
+
+@job("leagues.publish_snapshots")
+def publish_snapshots(ctx, organization_id):
+  """Full snapshot rebuild for one organization."""
+  org = Organization.objects.get(pk=organization_id)
+  publish_org_index(org)
+  divisions = list(Division.objects.filter(season__organization=org).select_related("season__organization"))
+  seasons = {d.season_id: d.season for d in divisions}
+  for season in seasons.values():
+    publish_season_index(season)
+  for done, division in enumerate(divisions, start=1):
+    publish_division(division)
+    ctx.progress(done, len(divisions), str(division))
+  return {"divisions": len(divisions)}
+
+
+@job("leagues.recompute_team_pointers")
+def recompute_team_pointers(ctx, season_id=None):
+  team_ids = None
+  if season_id:
+    team_ids = list(Team.objects.filter(division__season_id=season_id).values_list("pk", flat=True))
+  return {"teams": refresh_team_match_pointers(team_ids)}
+
+
+@job("leagues.division_outlook")
+def division_outlook(ctx, division_id, playoff_spots=None, simulations=whatif.DEFAULT_SIMULATIONS):
+  """Warm the what-if outlook cache for a division (e.g. with more simulations than a request would run)."""
+  data = whatif.outlook(division_id, playoff_spots=playoff_spots, simulations=simulations)
+  return {"teams": len(data["teams"]), "simulations": data["simulations"]}
+
+
+@job("leagues.replay_ratings")
+def replay_ratings(ctx, organization_id, since=None, since_match=None):
+  """Re-rate an organization's results from (since, since_match) on, or its whole history."""
+  point = (datetime.fromisoformat(since), uuid.UUID(since_match)) if since else None
+  return {"results": ratings.replay(organization_id, point)}
+
+
+@job("leagues.rebuild_ratings")
+def rebuild_ratings(ctx, organization_id=None):
+  """Full-history rating recompute for one organization, or all of them."""
+  org_ids = [organization_id] if organization_id else list(Organization.objects.values_list("pk", flat=True))
+  total = 0
+  for done, org_id in enumerate(org_ids, start=1):
+    total += ratings.replay(org_id)
+    ctx.progress(done, len(org_ids))
+  return {"organizations": len(org_ids), "results": total}
+
+
+@job("leagues.forecast_turnout")
+def forecast_turnout(ctx, season_id=None):
+  """Turnout forecasts for one season's upcoming matches, or for every active season."""
+  if season_id:
+    return {"forecasts": len(turnout.forecast_season(Season.objects.get(pk=season_id)))}
+  return {"forecasts": turnout.forecast_active_seasons()}
+
+
+@job("leagues.forfeit_sweep")
+def forfeit_sweep(ctx):
+  """Warn short-handed sides before kick-off and enter provisional forfeits after it."""
+  outcome = forfeits.sweep()
+  return {"scanned": outcome.scanned, "warned": len(outcome.warned), "forfeited": len(outcome.forfeited)}
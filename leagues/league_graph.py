@@ -0,0 +1,518 @@
+"""
+Compact, array-backed model of one division for what-if questions.
+
+Teams are indexes 0..n-1 into flat `array`s of points, goal difference and goals for; the
+remaining fixtures are two parallel arrays of home/away indexes. Everything here is plain
+Python with no Django imports, so a LeagueGraph pickles small and process-pool children
+can run `simulate` without setting Django up. `leagues.whatif` builds graphs from the
+database and caches the answers.
+
+With 3-1-0 scoring, deciding elimination exactly is NP-complete, so the questions answer
+with a Verdict: a max-flow relaxation proves eliminations cheaply, and a pruned exhaustive
+search over the remaining fixtures settles the rest within a node budget ("unknown" when it
+runs out).
+"""
+import random
+from array import array
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import NamedTuple
+
+HOME_WIN, DRAW, AWAY_WIN = 0, 1, 2
+
+YES, NO, UNKNOWN = "yes", "no", "unknown"
+SEARCH_BUDGET = 200_000
+
+
+class Verdict(NamedTuple):
+  answer: str  # YES / NO / UNKNOWN
+  method: str  # how it was decided: "bounds", "max-flow", "search" or "budget"
+
+  def __bool__(self):
+    return self.answer == YES
+
+
+@dataclass
+class LeagueGraph:
+  team_ids: list
+  names: list
+  points: array
+  goal_difference: array
+  goals_for: array
+  # remaining fixtures, in kick-off order
+  fixture_ids: list
+  home: array
+  away: array
+  win_points: int = 3
+  draw_points: int = 1
+  # finished results of the division as (home wins, draws, away wins), for base rates
+  outcome_counts: tuple = (0, 0, 0)
+  version: str = ""
+
+  @classmethod
+  def build(cls, teams, results, fixtures, *, win_points=3, draw_points=1, version=""):
+    """
+    `teams` [(id, name)], `results` [(home_id, away_id, home_score, away_score)],
+    `fixtures` [(match_id, home_id, away_id)] still to be played.
+    """
+    teams = list(teams)
+    index = {team_id: i for i, (team_id, _) in enumerate(teams)}
+    n = len(teams)
+    points, gd, gf = array("i", [0] * n), array("i", [0] * n), array("i", [0] * n)
+    counts = [0, 0, 0]
+    for home_id, away_id, home_score, away_score in results:
+      h, a = index.get(home_id), index.get(away_id)
+      if h is None or a is None:
+        continue
+      gf[h] += home_score
+      gf[a] += away_score
+      gd[h] += home_score - away_score
+      gd[a] += away_score - home_score
+      if home_score > away_score:
+        points[h] += win_points
+        counts[HOME_WIN] += 1
+      elif home_score == away_score:
+        points[h] += draw_points
+        points[a] += draw_points
+        counts[DRAW] += 1
+      else:
+        points[a] += win_points
+        counts[AWAY_WIN] += 1
+
+    fixture_ids, home, away = [], array("i"), array("i")
+    for match_id, home_id, away_id in fixtures:
+      h, a = index.get(home_id), index.get(away_id)
+      if h is not None and a is not None:
+        fixture_ids.append(match_id)
+        home.append(h)
+        away.append(a)
+
+    return cls(
+      team_ids=[t for t, _ in teams],
+      names=[name for _, name in teams],
+      points=points,
+      goal_difference=gd,
+      goals_for=gf,
+      fixture_ids=fixture_ids,
+      home=home,
+      away=away,
+      win_points=win_points,
+      draw_points=draw_points,
+      outcome_counts=tuple(counts),
+      version=version,
+    )
+
+  # ---------- basics ----------
+
+  @property
+  def size(self) -> int:
+    return len(self.team_ids)
+
+  def index(self, team_id) -> int:
+    return self.team_ids.index(team_id)
+
+  def remaining(self) -> array:
+    left = array("i", [0] * self.size)
+    for h, a in zip(self.home, self.away):
+      left[h] += 1
+      left[a] += 1
+    return left
+
+  def max_points(self) -> array:
+    return array("i", (p + self.win_points * r for p, r in zip(self.points, self.remaining())))
+
+  def table(self) -> list:
+    """Team indexes in standings order (points, goal difference, goals for, name)."""
+    return sorted(
+      range(self.size),
+      key=lambda t: (-self.points[t], -self.goal_difference[t], -self.goals_for[t], self.names[t]),
+    )
+
+  def with_result(self, fixture, outcome) -> "LeagueGraph":
+    """A copy with remaining fixture number `fixture` decided (goals are left unchanged)."""
+    points = array("i", self.points)
+    h, a = self.home[fixture], self.away[fixture]
+    if outcome == HOME_WIN:
+      points[h] += self.win_points
+    elif outcome == AWAY_WIN:
+      points[a] += self.win_points
+    else:
+      points[h] += self.draw_points
+      points[a] += self.draw_points
+    keep = [k for k in range(len(self.fixture_ids)) if k != fixture]
+    return replace(
+      self,
+      points=points,
+      fixture_ids=[self.fixture_ids[k] for k in keep],
+      home=array("i", (self.home[k] for k in keep)),
+      away=array("i", (self.away[k] for k in keep)),
+    )
+
+  # ---------- clinching and elimination ----------
+
+  def _others_games(self, team):
+    return [(h, a) for h, a in zip(self.home, self.away) if h != team and a != team]
+
+  def can_finish_top(self, team, spots=1, *, budget=SEARCH_BUDGET) -> Verdict:
+    """
+    Whether `team` can still finish in the top `spots` on points (level on points counts,
+    as tie-breakers are still open). `team` is assumed to win every remaining match.
+    """
+    target = self.max_points()[team]
+    others = [t for t in range(self.size) if t != team]
+    already_above = sum(1 for t in others if self.points[t] > target)
+    if already_above >= spots:
+      return Verdict(NO, "bounds")
+
+    games = self._others_games(team)
+    caps = {t: target - self.points[t] for t in others}
+    rivals_max = self._max_from(games)
+    if sum(1 for t in others if self.points[t] + rivals_max[t] > target) < spots:
+      return Verdict(YES, "bounds")
+    # the relaxation is only sound while a win is worth at least two draws
+    if spots == 1 and self.win_points >= 2 * self.draw_points and not _fits(games, caps, 2 * self.draw_points):
+      return Verdict(NO, "max-flow")
+
+    search = _Search(self, games, budget)
+    found = search.keep_below(caps, spots - 1)
+    if found is None:
+      return Verdict(UNKNOWN, "budget")
+    return Verdict(YES if found else NO, "search")
+
+  def clinched_top(self, team, spots=1, *, budget=SEARCH_BUDGET) -> Verdict:
+    """
+    Whether `team` finishes in the top `spots` whatever happens: even losing every remaining
+    match, fewer than `spots` rivals can reach its points (a tie counts as not clinched).
+    """
+    floor = self.points[team]
+    others = [t for t in range(self.size) if t != team]
+    # rivals get a win against `team` for free; the rest of their points come from each other
+    bonus = {t: 0 for t in others}
+    for h, a in zip(self.home, self.away):
+      if h == team:
+        bonus[a] += self.win_points
+      elif a == team:
+        bonus[h] += self.win_points
+    games = self._others_games(team)
+    rivals_max = self._max_from(games)
+    contenders = [t for t in others if self.points[t] + bonus[t] + rivals_max[t] >= floor]
+    if len(contenders) < spots:
+      return Verdict(YES, "bounds")
+    if sum(1 for t in others if self.points[t] + bonus[t] >= floor) >= spots:
+      return Verdict(NO, "bounds")
+
+    need = {t: floor - self.points[t] - bonus[t] for t in others}
+    search = _Search(self, games, budget)
+    found = search.lift_to(need, spots)
+    if found is None:
+      return Verdict(UNKNOWN, "budget")
+    return Verdict(NO if found else YES, "search")
+
+  def _max_from(self, games):
+    best = [0] * self.size
+    for h, a in games:
+      best[h] += self.win_points
+      best[a] += self.win_points
+    return best
+
+  def magic_number(self, team, spots=1):
+    """
+    Points `team` still needs to be sure of a top-`spots` finish if every rival won all of
+    its remaining matches; 0 once clinched, None when its own results can't get it there.
+    """
+    max_points = self.max_points()
+    rivals = sorted((max_points[t] for t in range(self.size) if t != team), reverse=True)
+    if len(rivals) < spots:
+      return 0
+    needed = max(0, rivals[spots - 1] + 1 - self.points[team])
+    if needed > self.win_points * self.remaining()[team]:
+      return None
+    return needed
+
+  def clinching_results(self, team, spots=1, *, budget=SEARCH_BUDGET) -> list:
+    """
+    Outcomes of `team`'s next fixture that would clinch a top-`spots` finish on their own,
+    as [(match id, "win" | "draw" | "loss")].
+    """
+    fixture = next((k for k, (h, a) in enumerate(zip(self.home, self.away)) if team in (h, a)), None)
+    if fixture is None or self.clinched_top(team, spots, budget=budget):
+      return []
+    at_home = self.home[fixture] == team
+    clinching = []
+    for outcome in (HOME_WIN, DRAW, AWAY_WIN):
+      result = "draw" if outcome == DRAW else ("win" if (outcome == HOME_WIN) == at_home else "loss")
+      if self.with_result(fixture, outcome).clinched_top(team, spots, budget=budget):
+        clinching.append((self.fixture_ids[fixture], result))
+    return clinching
+
+  # ---------- Monte Carlo ----------
+
+  def base_rates(self):
+    """(home win, draw) probabilities from the division's finished results, smoothed."""
+    home, draw, away = (c + 1 for c in self.outcome_counts)
+    total = home + draw + away
+    return home / total, draw / total
+
+
+@dataclass
+class Projection:
+  """Finishing-position probabilities per team from `iterations` simulated seasons."""
+  iterations: int
+  positions: list = field(default_factory=list)  # positions[team][place] -> probability
+  expected_points: list = field(default_factory=list)
+
+  def top(self, team, spots) -> float:
+    return sum(self.positions[team][:spots])
+
+
+def simulate(graph, iterations, seed, probabilities=None):
+  """
+  Play out the remaining fixtures `iterations` times. `probabilities` is a list of
+  (home win, draw) per remaining fixture (default: the division's base rates). Returns raw
+  position counts (flat, team * size + place) and summed final points.
+  """
+  rng = random.Random(seed)
+  n = graph.size
+  fixtures = len(graph.fixture_ids)
+  if probabilities is None:
+    probabilities = [graph.base_rates()] * fixtures
+  p_home = array("d", (p[0] for p in probabilities))
+  p_draw = array("d", (p[0] + p[1] for p in probabilities))
+  home, away = graph.home, graph.away
+  win, draw = graph.win_points, graph.draw_points
+  gd, gf = graph.goal_difference, graph.goals_for
+
+  counts = array("q", [0] * (n * n))
+  point_sums = array("q", [0] * n)
+  for _ in range(iterations):
+    points = array("i", graph.points)
+    for k in range(fixtures):
+      r = rng.random()
+      if r < p_home[k]:
+        points[home[k]] += win
+      elif r < p_draw[k]:
+        points[home[k]] += draw
+        points[away[k]] += draw
+      else:
+        points[away[k]] += win
+    shuffle = [rng.random() for _ in range(n)]
+    order = sorted(range(n), key=lambda t: (-points[t], -gd[t], -gf[t], shuffle[t]))
+    for place, t in enumerate(order):
+      counts[t * n + place] += 1
+      point_sums[t] += points[t]
+  return counts, point_sums
+
+
+def project(graph, iterations, *, probabilities=None, seed=None, processes=0, chunks_per_process=4) -> Projection:
+  """
+  Monte Carlo projection of the final table. With `processes` > 1 the iterations are split
+  into seeded chunks and run on a spawned process pool.
+  """
+  n = graph.size
+  seed = random.randrange(2 ** 32) if seed is None else seed
+  if processes > 1 and iterations >= processes:
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = processes * chunks_per_process
+    sizes = [iterations // chunks + (1 if c < iterations % chunks else 0) for c in range(chunks)]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(processes, mp_context=context) as pool:
+      parts = list(pool.map(
+        simulate, [graph] * chunks, sizes, [seed + c for c in range(chunks)], [probabilities] * chunks
+      ))
+  else:
+    parts = [simulate(graph, iterations, seed, probabilities)]
+
+  counts = [0] * (n * n)
+  point_sums = [0] * n
+  for part_counts, part_points in parts:
+    for i, c in enumerate(part_counts):
+      counts[i] += c
+    for t, p in enumerate(part_points):
+      point_sums[t] += p
+  runs = max(iterations, 1)
+  return Projection(
+    iterations=iterations,
+    positions=[[counts[t * n + place] / runs for place in range(n)] for t in range(n)],
+    expected_points=[point_sums[t] / runs for t in range(n)],
+  )
+
+
+# ---------- max-flow relaxation ----------
+
+def _fits(games, caps, points_per_game):
+  """
+  Whether `points_per_game` points from each game can be shared out without any team
+  passing its cap. Every real result hands out at least a draw's worth, so when even this
+  doesn't fit the team the caps were built for is eliminated.
+  """
+  if any(c < 0 for c in caps.values()):
+    return False
+  pairs = {}
+  for h, a in games:
+    key = (min(h, a), max(h, a))
+    pairs[key] = pairs.get(key, 0) + 1
+  teams = sorted(caps)
+  node = {t: 1 + len(pairs) + i for i, t in enumerate(teams)}
+  sink = 1 + len(pairs) + len(teams)
+  graph = _FlowGraph(sink + 1)
+  need = 0
+  for i, ((a, b), count) in enumerate(pairs.items(), start=1):
+    need += points_per_game * count
+    graph.add(0, i, points_per_game * count)
+    graph.add(i, node[a], points_per_game * count)
+    graph.add(i, node[b], points_per_game * count)
+  for t in teams:
+    graph.add(node[t], sink, caps[t])
+  return graph.max_flow(0, sink) >= need
+
+
+class _FlowGraph:
+  """Edmonds-Karp over adjacency lists; the graphs here have a few hundred edges at most."""
+
+  def __init__(self, size):
+    self.adjacent = [[] for _ in range(size)]
+    self.to, self.capacity = array("i"), array("q")
+
+  def add(self, u, v, capacity):
+    self.adjacent[u].append(len(self.to))
+    self.to.append(v)
+    self.capacity.append(capacity)
+    self.adjacent[v].append(len(self.to))
+    self.to.append(u)
+    self.capacity.append(0)
+
+  def max_flow(self, source, sink):
+    flow = 0
+    while True:
+      via = [-1] * len(self.adjacent)
+      via[source] = -2
+      queue = deque([source])
+      while queue and via[sink] == -1:
+        u = queue.popleft()
+        for e in self.adjacent[u]:
+          v = self.to[e]
+          if via[v] == -1 and self.capacity[e] > 0:
+            via[v] = e
+            queue.append(v)
+      if via[sink] == -1:
+        return flow
+      push, v = None, sink
+      while v != source:
+        e = via[v]
+        push = self.capacity[e] if push is None else min(push, self.capacity[e])
+        v = self.to[e ^ 1]
+      v = sink
+      while v != source:
+        e = via[v]
+        self.capacity[e] -= push
+        self.capacity[e ^ 1] += push
+        v = self.to[e ^ 1]
+      flow += push
+
+
+# ---------- exhaustive search ----------
+
+class _Search:
+  """Depth-first search over the outcomes of `games`, pruned, with a node budget."""
+
+  def __init__(self, graph, games, budget):
+    self.win = graph.win_points
+    self.draw = graph.draw_points
+    self.games = games
+    self.budget = budget
+
+  def _spend(self):
+    self.budget -= 1
+    if self.budget < 0:
+      raise _OutOfBudget
+
+  def keep_below(self, caps, allowed_over):
+    """
+    Is there an outcome where at most `allowed_over` teams pass their cap? Returns True,
+    False, or None when the budget runs out.
+    """
+    slack = dict(caps)
+    over = {t for t, c in slack.items() if c < 0}
+    if len(over) > allowed_over:
+      return False
+    # most constrained games first
+    games = sorted(self.games, key=lambda g: min(slack[g[0]], slack[g[1]]))
+    outcomes = ((self.win, 0), (self.draw, self.draw), (0, self.win))
+
+    def go(k, over_count):
+      self._spend()
+      if k == len(games):
+        return True
+      h, a = games[k]
+      # try the outcome that leaves the most room first
+      ordered = sorted(outcomes, key=lambda o: -min(slack[h] - o[0], slack[a] - o[1]))
+      for ph, pa in ordered:
+        newly = (slack[h] >= 0 and slack[h] - ph < 0) + (slack[a] >= 0 and slack[a] - pa < 0)
+        if over_count + newly > allowed_over:
+          continue
+        slack[h] -= ph
+        slack[a] -= pa
+        found = go(k + 1, over_count + newly)
+        slack[h] += ph
+        slack[a] += pa
+        if found:
+          return True
+      return False
+
+    try:
+      return go(0, len(over))
+    except _OutOfBudget:
+      return None
+
+  def lift_to(self, need, count):
+    """
+    Is there an outcome where at least `count` teams gain at least their `need`? Returns
+    True, False, or None when the budget runs out.
+    """
+    need = dict(need)
+    left = {t: 0 for t in need}
+    for h, a in self.games:
+      left[h] += self.win
+      left[a] += self.win
+    games = list(self.games)
+    outcomes = ((self.win, 0), (self.draw, self.draw), (0, self.win))
+
+    def reachable():
+      done = sum(1 for n in need.values() if n <= 0)
+      possible = sum(1 for t, n in need.items() if 0 < n <= left[t])
+      return done, possible
+
+    def go(k):
+      self._spend()
+      done, possible = reachable()
+      if done >= count:
+        return True
+      if done + possible < count or k == len(games):
+        return False
+      h, a = games[k]
+      left[h] -= self.win
+      left[a] -= self.win
+      try:
+        for ph, pa in outcomes:
+          need[h] -= ph
+          need[a] -= pa
+          found = go(k + 1)
+          need[h] += ph
+          need[a] += pa
+          if found:
+            return True
+        return False
+      finally:
+        left[h] += self.win
+        left[a] += self.win
+
+    try:
+      return go(0)
+    except _OutOfBudget:
+      return None
+
+
+class _OutOfBudget(Exception):
+  pass
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from leagues.models import Appearance, CardEvent, GoalEvent, Match, MatchAttendance, Season
+
+
+class Command(BaseCommand):
+    help = (
+        "Flag an ended season's matches and match events as archived so they drop out of the "
+        "partial 'live' indexes. Archived rows stay readable through the default managers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("season", help="Season id.")
+        parser.add_argument("--restore", action="store_true", help="Move an archived season back to live.")
+
+    def handle(self, *args, **opts):
+        try:
+            season = Season.objects.get(pk=opts["season"])
+        except (Season.DoesNotExist, ValueError):
+            raise CommandError(f"Season {opts['season']} not found.")
+
+        archiving = not opts["restore"]
+        if archiving and season.is_active:
+            raise CommandError("Active seasons can't be archived.")
+
+        counts = {}
+        with transaction.atomic():
+            counts["matches"] = Match.objects.filter(season=season).update(is_archived=archiving)
+            for label, model in (
+                ("goals", GoalEvent),
+                ("cards", CardEvent),
+                ("appearances", Appearance),
+                ("attendance", MatchAttendance),
+            ):
+                counts[label] = model.objects.filter(match__season=season).update(is_archived=archiving)
+            season.archived_at = timezone.now() if archiving else None
+            season.save(update_fields=["archived_at"])
+
+        summary = ", ".join(f"{n} {label}" for label, n in counts.items())
+        verb = "Archived" if archiving else "Restored"
+        self.stdout.write(self.style.SUCCESS(f"{verb} season {season}: {summary}."))
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from leagues import whatif
+from leagues.models import Division
+
+
+class Command(BaseCommand):
+    help = (
+        "Print a division's what-if outlook: who can still win or make the playoffs, who has "
+        "clinched, magic numbers and simulated finishing odds. Also warms the outlook cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("division", help="Division id.")
+        parser.add_argument("--playoff-spots", type=int, help="Number of playoff places.")
+        parser.add_argument("--simulations", type=int, default=20000, help="Monte Carlo runs (0 to skip).")
+        parser.add_argument("--processes", type=int, default=0, help="Run the simulations on this many processes.")
+        parser.add_argument("--seed", type=int, help="Random seed, for reproducible odds.")
+
+    def handle(self, *args, **opts):
+        try:
+            division = Division.objects.select_related("season").get(pk=opts["division"])
+        except (Division.DoesNotExist, ValueError):
+            raise CommandError(f"Division {opts['division']} not found.")
+
+        data = whatif.outlook(
+            division.pk,
+            playoff_spots=opts["playoff_spots"],
+            simulations=opts["simulations"],
+            processes=opts["processes"],
+            seed=opts["seed"],
+        )
+
+        def flag(value):
+            return "?" if value is None else ("yes" if value else "no")
+
+        spots = opts["playoff_spots"]
+        self.stdout.write(f"{division.season} / {division}: {data['remaining_matches']} matches left, {data['simulations']} simulations")
+        header = f"{'#':>3} {'Team':<28} {'Pts':>4} {'Max':>4} {'Win?':>5} {'Won':>4} {'Magic':>5}"
+        if spots:
+            header += f" {'PO?':>4} {'In':>4} {'Magic':>5}"
+        if data["simulations"]:
+            header += f" {'P(1st)':>7}" + (f" {'P(PO)':>7}" if spots else "") + f" {'xPts':>6}"
+        self.stdout.write(header)
+        for row in data["teams"]:
+            line = (
+                f"{row['position']:>3} {row['name'][:28]:<28} {row['points']:>4} {row['max_points']:>4} "
+                f"{flag(row['can_win']):>5} {flag(row['clinched_title']):>4} {row['title_magic_number'] if row['title_magic_number'] is not None else '-':>5}"
+            )
+            if spots:
+                magic = row["playoff_magic_number"]
+                line += f" {flag(row['can_make_playoffs']):>4} {flag(row['clinched_playoffs']):>4} {magic if magic is not None else '-':>5}"
+            if data["simulations"]:
+                line += f" {row['title_probability']:>7.1%}"
+                if spots:
+                    line += f" {row['playoff_probability']:>7.1%}"
+                line += f" {row['expected_points']:>6.1f}"
+            self.stdout.write(line)
@@ -0,0 +1,40 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from leagues import turnout
+from leagues.models import MatchTurnoutForecast, Season
+
+
+class Command(BaseCommand):
+    help = (
+        "Forecast each team's turnout for upcoming matches from RSVPs and past no-shows, "
+        "and list the matches at risk of a forfeit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--season", help="Season id (default: every active season).")
+
+    def handle(self, *args, **opts):
+        if opts["season"]:
+            try:
+                seasons = [Season.objects.get(pk=opts["season"])]
+            except (Season.DoesNotExist, ValueError, ValidationError):
+                raise CommandError(f"Season {opts['season']} not found.")
+        else:
+            seasons = list(Season.objects.filter(is_active=True, archived_at__isnull=True))
+
+        written = 0
+        for season in seasons:
+            written += len(turnout.forecast_season(season))
+            at_risk = (
+                MatchTurnoutForecast.objects
+                .filter(match__season=season, at_risk=True)
+                .select_related("team", "match__home_team", "match__away_team")
+                .order_by("match__starts_at")
+            )
+            for f in at_risk:
+                self.stdout.write(self.style.WARNING(
+                    f"{season.name}: {f.match.home_team} vs {f.match.away_team} {f.match.starts_at:%Y-%m-%d %H:%M} - "
+                    f"{f.team} expects {f.expected_players:.1f} of {f.min_players} needed ({f.shortfall_probability:.0%} short)"
+                ))
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} forecasts for {len(seasons)} seasons."))
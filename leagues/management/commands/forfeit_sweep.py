@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from leagues import forfeits
+
+
+class Command(BaseCommand):
+    help = (
+        "Warn captains of sides short of their division's minimum players before kick-off, and "
+        "enter provisional forfeits for admin confirmation after it. Run every few minutes from cron."
+    )
+
+    def handle(self, *args, **opts):
+        outcome = forfeits.sweep()
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {outcome.scanned} matches: {len(outcome.warned)} sides warned, "
+            f"{len(outcome.forfeited)} provisional forfeits entered."
+        ))
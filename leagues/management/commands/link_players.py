@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Organization
+from leagues.models import TeamMember
+from leagues.players import link_members, rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Link TeamMember rows to cross-season Player profiles and rebuild career stats."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org-slug", help="Only this organization.")
+        parser.add_argument("--no-rebuild", action="store_true", help="Only link; skip recounting stats from match events.")
+
+    def handle(self, *args, **opts):
+        members = TeamMember.objects.all()
+        if opts["org_slug"]:
+            try:
+                org = Organization.objects.get(slug=opts["org_slug"])
+            except Organization.DoesNotExist:
+                raise CommandError(f"Organization '{opts['org_slug']}' not found.")
+            members = members.filter(organization=org)
+
+        # oldest seasons first, so a player's profile takes their first roster name
+        unlinked = list(
+            members.filter(player__isnull=True)
+            .select_related("team_season")
+            .order_by("team_season__season__start_date", "joined_at")
+        )
+        linked = link_members(unlinked)
+        self.stdout.write(self.style.SUCCESS(f"Linked {linked} team members to players."))
+
+        if not opts["no_rebuild"]:
+            rebuilt = rebuild_stats(members)
+            self.stdout.write(self.style.SUCCESS(f"Recounted stats for {rebuilt} team members."))
@@ -0,0 +1,83 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from leagues import balancing
+from leagues.models import Division, Season
+
+
+class Command(BaseCommand):
+    help = (
+        "Propose the new season's divisions from last season's final tables (or ratings), with "
+        "promotion/relegation and clubs kept apart; --apply creates the teams."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("season", help="Id of the season being set up.")
+        parser.add_argument("--from", dest="previous", help="Previous season id (default: the organization's last season).")
+        parser.add_argument("--promote", type=int, default=balancing.DEFAULT_PROMOTE, help="Teams promoted from each division.")
+        parser.add_argument("--relegate", type=int, default=balancing.DEFAULT_RELEGATE, help="Teams relegated from each division.")
+        parser.add_argument("--basis", choices=balancing.BASES, default=balancing.BASIS_STANDINGS)
+        parser.add_argument("--size", action="append", default=[], metavar="DIVISION=N", help="Target size of a division, by name (repeatable).")
+        parser.add_argument("--exclude", action="append", default=[], metavar="TEAM", help="Id of a team that isn't returning (repeatable).")
+        parser.add_argument("--allow-club-mates", action="store_true", help="Don't keep teams of the same club apart.")
+        parser.add_argument("--apply", action="store_true", help="Create the teams; otherwise just print the proposal.")
+
+    def _season(self, pk):
+        try:
+            return Season.objects.get(pk=pk)
+        except (Season.DoesNotExist, ValueError, ValidationError):
+            raise CommandError(f"Season {pk} not found.")
+
+    def handle(self, *args, **opts):
+        season = self._season(opts["season"])
+        previous = self._season(opts["previous"]) if opts["previous"] else None
+
+        sizes = None
+        if opts["size"]:
+            by_name = {d.name.lower(): d.pk for d in Division.objects.filter(season=season)}
+            sizes = {}
+            for item in opts["size"]:
+                name, _, count = item.rpartition("=")
+                if name.lower() not in by_name or not count.isdigit():
+                    raise CommandError(f"Bad --size {item!r}: expected DIVISION=N with a division of {season.name}.")
+                sizes[by_name[name.lower()]] = int(count)
+
+        try:
+            proposal = balancing.propose(
+                season,
+                previous,
+                promote=opts["promote"],
+                relegate=opts["relegate"],
+                basis=opts["basis"],
+                sizes=sizes,
+                exclude=opts["exclude"],
+                separate_clubs=not opts["allow_club_mates"],
+            )
+        except ValidationError as exc:
+            raise CommandError("; ".join(exc.messages))
+
+        arrows = {"up": "^", "down": "v", "same": " "}
+        grouped = proposal.by_division()
+        for division_id, name, level, size in proposal.divisions:
+            self.stdout.write(f"{name} (level {level + 1}, {size} teams)")
+            for p in grouped[division_id]:
+                club = f" [{p.entry.club}]" if p.entry.club else ""
+                note = " (swapped to keep clubs apart)" if p.swapped else ""
+                self.stdout.write(f"  {arrows[p.movement]} {p.entry.name}{club}  rating {p.entry.rating:.0f}{note}")
+        for p in proposal.overridden:
+            self.stdout.write(self.style.WARNING(
+                f"{p.entry.name} finished to go {p.earned_movement} but stays {p.movement}: the division sizes have no room."
+                if p.movement == "same" else
+                f"{p.entry.name} finished to go {p.earned_movement} but goes {p.movement}: the division sizes have no room."
+            ))
+        for p in proposal.clashes:
+            self.stdout.write(self.style.WARNING(f"{p.entry.name} still shares a club or name with a division-mate."))
+
+        if not opts["apply"]:
+            self.stdout.write(self.style.SUCCESS(f"Proposed {len(proposal.placements)} teams from {proposal.previous_season.name}; rerun with --apply to create them."))
+            return
+        try:
+            teams = balancing.apply_proposal(season, proposal)
+        except ValidationError as exc:
+            raise CommandError("; ".join(exc.messages))
+        self.stdout.write(self.style.SUCCESS(f"Created {len(teams)} teams in {season.name}."))
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Organization
+from leagues import publisher
+
+
+class Command(BaseCommand):
+    help = "Render public league snapshots to LEAGUES_SNAPSHOT_ROOT (full rebuild, pending queue, or --watch)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org-slug", help="Full rebuild for one organization only.")
+        parser.add_argument("--pending", action="store_true", help="Publish queued stale divisions once and exit.")
+        parser.add_argument("--watch", action="store_true", help="Keep draining the stale-division queue.")
+        parser.add_argument("--debounce", type=float, default=5, help="Quiet seconds before a division is republished.")
+        parser.add_argument("--max-wait", type=float, default=60, help="Republish after this long even if still changing.")
+        parser.add_argument("--interval", type=float, default=1, help="Polling interval for --watch.")
+        parser.add_argument("--html", action="store_true", default=None, help="Also render index.html per division.")
+
+    def handle(self, *args, **opts):
+        drain = dict(debounce_seconds=opts["debounce"], max_wait_seconds=opts["max_wait"], html=opts["html"])
+
+        if opts["watch"]:
+            self.stdout.write(self.style.SUCCESS("Watching for stale divisions (Ctrl+C to stop)..."))
+            try:
+                while True:
+                    published = publisher.publish_pending(**drain)
+                    if published:
+                        self.stdout.write(f"Published {published} divisions.")
+                    time.sleep(opts["interval"])
+            except KeyboardInterrupt:
+                return
+
+        if opts["pending"]:
+            published = publisher.publish_pending(**drain)
+            self.stdout.write(self.style.SUCCESS(f"Published {published} stale divisions."))
+            return
+
+        org = None
+        if opts["org_slug"]:
+            try:
+                org = Organization.objects.get(slug=opts["org_slug"])
+            except Organization.DoesNotExist:
+                raise CommandError(f"Unknown organization: {opts['org_slug']}")
+
+        published = publisher.publish_all(org, html=opts["html"])
+        self.stdout.write(self.style.SUCCESS(f"Published {published} divisions to {publisher.snapshot_root()}."))
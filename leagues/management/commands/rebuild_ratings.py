@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import jobs
+from core.models import Organization
+from leagues import ratings
+
+
+class Command(BaseCommand):
+    help = "Recompute every team rating from the full result history (all organizations by default)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", help="Only this organization (slug).")
+        parser.add_argument("--queue", action="store_true", help="Queue a leagues.rebuild_ratings job instead.")
+
+    def handle(self, *args, **opts):
+        orgs = Organization.objects.order_by("slug")
+        if opts["org"]:
+            orgs = orgs.filter(slug=opts["org"])
+            if not orgs.exists():
+                raise CommandError(f"Organization {opts['org']} not found.")
+
+        if opts["queue"]:
+            org = orgs.first() if opts["org"] else None
+            job = jobs.enqueue("leagues.rebuild_ratings", {"organization_id": str(org.pk) if org else None}, organization=org)
+            self.stdout.write(self.style.SUCCESS(f"Queued job {job.pk}."))
+            return
+
+        started = time.monotonic()
+        total = 0
+        for org in orgs:
+            rated = ratings.replay(org.pk)
+            total += rated
+            self.stdout.write(f"{org.slug}: {rated} results")
+        self.stdout.write(self.style.SUCCESS(f"Rated {total} results in {time.monotonic() - started:.1f}s."))
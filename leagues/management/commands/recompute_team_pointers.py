@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from leagues.fixtures import refresh_team_match_pointers
+from leagues.models import Team
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized next_match / last_final_match pointers on Team."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--division", help="Only recompute teams in this division id.")
+        parser.add_argument("--season", help="Only recompute teams in this season id.")
+
+    def handle(self, *args, **opts):
+        team_ids = None
+        if opts["division"] or opts["season"]:
+            qs = Team.objects.all()
+            if opts["division"]:
+                qs = qs.filter(division_id=opts["division"])
+            if opts["season"]:
+                qs = qs.filter(division__season_id=opts["season"])
+            team_ids = list(qs.values_list("pk", flat=True))
+
+        updated = refresh_team_match_pointers(team_ids)
+        self.stdout.write(self.style.SUCCESS(f"Refreshed fixture pointers for {updated} teams."))
@@ -0,0 +1,56 @@
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from leagues.models import Venue
+from leagues.reschedule import DEFAULT_HORIZON_DAYS, reschedule_venue
+
+
+class Command(BaseCommand):
+    help = (
+        "Move every scheduled or postponed match at a closed venue between two local dates "
+        "into the next free slots, and queue notifications to the teams."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("venue", help="Venue id.")
+        parser.add_argument("start", type=date.fromisoformat, help="First closed day (YYYY-MM-DD).")
+        parser.add_argument("end", type=date.fromisoformat, help="Last closed day (YYYY-MM-DD).")
+        parser.add_argument("--after", type=date.fromisoformat, help="Earliest day to move matches to (default: the day after end).")
+        parser.add_argument("--horizon-days", type=int, default=DEFAULT_HORIZON_DAYS, help="How many days from --after to search for slots.")
+        parser.add_argument("--venue", dest="venues", action="append", help="Candidate venue id (repeatable; default: all active venues).")
+        parser.add_argument("--reason", default="", help="Included in the notifications, e.g. 'Waterlogged pitches'.")
+        parser.add_argument("--dry-run", action="store_true", help="Show the moves without saving them.")
+
+    def handle(self, *args, **opts):
+        try:
+            venue = Venue.objects.select_related("organization").get(pk=opts["venue"])
+        except (Venue.DoesNotExist, ValueError, ValidationError):
+            raise CommandError(f"Venue {opts['venue']} not found.")
+
+        try:
+            plan = reschedule_venue(
+                venue,
+                opts["start"],
+                opts["end"],
+                after=opts["after"],
+                horizon_days=opts["horizon_days"],
+                venues=opts["venues"],
+                reason=opts["reason"],
+                dry_run=opts["dry_run"],
+            )
+        except ValidationError as exc:
+            raise CommandError("; ".join(exc.messages))
+
+        tz = venue.organization.tzinfo
+        for move in plan.moves:
+            when = move.starts_at.astimezone(tz)
+            self.stdout.write(f"{move.match.home_team} vs {move.match.away_team} -> {when:%Y-%m-%d %H:%M} at {plan.venue_names[move.venue_id]}")
+        for match in plan.unplaced:
+            self.stdout.write(self.style.WARNING(f"{match.home_team} vs {match.away_team}: no free slot, postponed"))
+
+        prefix = "Would move" if opts["dry_run"] else "Moved"
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {len(plan.moves)} matches, {len(plan.unplaced)} postponed, {plan.notifications} notifications queued."
+        ))
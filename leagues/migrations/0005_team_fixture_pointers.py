@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Q, Subquery
+from django.utils import timezone
+
+
+def backfill_pointers(apps, schema_editor):
+    Match = apps.get_model('leagues', 'Match')
+    Team = apps.get_model('leagues', 'Team')
+    team_matches = Match.objects.filter(Q(home_team=OuterRef('pk')) | Q(away_team=OuterRef('pk')))
+    Team.objects.update(
+        next_match=Subquery(
+            team_matches.filter(status='SCHEDULED', starts_at__gte=timezone.now())
+            .order_by('starts_at', 'id').values('pk')[:1]
+        ),
+        last_final_match=Subquery(
+            team_matches.filter(status='FINAL').order_by('-starts_at', '-id').values('pk')[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leagues', '0004_remove_teammember_display_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='last_final_match',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='leagues.match'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='next_match',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='leagues.match'),
+        ),
+        migrations.RunPython(backfill_pointers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:51
+
+from zoneinfo import ZoneInfo
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def backfill_local_dates(apps, schema_editor):
+    Organization = apps.get_model('core', 'Organization')
+    Match = apps.get_model('leagues', 'Match')
+    for org in Organization.objects.all():
+        Match.objects.filter(season__organization=org).update(
+            local_date=TruncDate('starts_at', tzinfo=ZoneInfo(org.timezone))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('leagues', '0005_team_fixture_pointers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='local_date',
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_local_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='match',
+            name='local_date',
+            field=models.DateField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['season', 'local_date'], name='leagues_mat_season__75ab81_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['venue', 'local_date'], name='leagues_mat_venue_i_536231_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['home_team', 'local_date'], name='leagues_mat_home_te_b8a4ca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['away_team', 'local_date'], name='leagues_mat_away_te_4f3474_idx'),
+        ),
+    ]
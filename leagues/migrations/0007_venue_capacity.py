@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:52
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leagues', '0006_match_local_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='field_count',
+            field=models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.CreateModel(
+            name='VenueAvailability',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')])),
+                ('opens_at', models.TimeField()),
+                ('closes_at', models.TimeField()),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability_windows', to='leagues.venue')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['venue', 'weekday'], name='leagues_ven_venue_i_0c74ca_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(('closes_at__gt', models.F('opens_at'))), name='chk_venue_availability_window_order')],
+            },
+        ),
+    ]
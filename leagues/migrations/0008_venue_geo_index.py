@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('leagues', '0007_venue_capacity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='home_venue',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='home_teams', to='leagues.venue'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['organization', 'lat', 'lng'], name='leagues_ven_organiz_c15035_idx'),
+        ),
+    ]
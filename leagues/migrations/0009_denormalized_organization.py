@@ -0,0 +1,142 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_organization(apps, schema_editor):
+    Team = apps.get_model('leagues', 'Team')
+    Match = apps.get_model('leagues', 'Match')
+    TeamMember = apps.get_model('leagues', 'TeamMember')
+
+    Team.objects.update(organization=Subquery(
+        Team.objects.filter(pk=OuterRef('pk')).values('division__season__organization_id')[:1]
+    ))
+    Match.objects.update(organization=Subquery(
+        Match.objects.filter(pk=OuterRef('pk')).values('season__organization_id')[:1]
+    ))
+    TeamMember.objects.update(organization=Subquery(
+        TeamMember.objects.filter(pk=OuterRef('pk')).values('team_season__season__organization_id')[:1]
+    ))
+    for name in ('GoalEvent', 'CardEvent', 'Appearance', 'MatchAttendance'):
+        model = apps.get_model('leagues', name)
+        model.objects.update(organization=Subquery(
+            Match.objects.filter(pk=OuterRef('match_id')).values('organization_id')[:1]
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('leagues', '0008_venue_geo_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appearance',
+            name='organization',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='appearances', to='core.organization'),
+        ),
+        migrations.AddField(
+            model_name='cardevent',
+            name='organization',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='card_events', to='core.organization'),
+        ),
+        migrations.AddField(
+            model_name='goalevent',
+            name='organization',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='goal_events', to='core.organization'),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='organization',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='core.organization'),
+        ),
+        migrations.AddField(
+            model_name='matchattendance',
+            name='organization',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attendances', to='core.organization'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='organization',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='teams', to='core.organization'),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='organization',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='team_members', to='core.organization'),
+        ),
+        migrations.RunPython(backfill_organization, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='appearance',
+            name='organization',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='appearances', to='core.organization'),
+        ),
+        migrations.AlterField(
+            model_name='cardevent',
+            name='organization',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='card_events', to='core.organization'),
+        ),
+        migrations.AlterField(
+            model_name='goalevent',
+            name='organization',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='goal_events', to='core.organization'),
+        ),
+        migrations.AlterField(
+            model_name='match',
+            name='organization',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='core.organization'),
+        ),
+        migrations.AlterField(
+            model_name='matchattendance',
+            name='organization',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='attendances', to='core.organization'),
+        ),
+        migrations.AlterField(
+            model_name='team',
+            name='organization',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='teams', to='core.organization'),
+        ),
+        migrations.AlterField(
+            model_name='teammember',
+            name='organization',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='team_members', to='core.organization'),
+        ),
+        migrations.AddIndex(
+            model_name='appearance',
+            index=models.Index(fields=['organization', 'player'], name='leagues_app_organiz_f21a8b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cardevent',
+            index=models.Index(fields=['organization', 'card'], name='leagues_car_organiz_d531dd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalevent',
+            index=models.Index(fields=['organization', 'scorer'], name='leagues_goa_organiz_3c2886_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['organization', 'starts_at'], name='leagues_mat_organiz_75ad4c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['organization', 'local_date'], name='leagues_mat_organiz_4505fc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matchattendance',
+            index=models.Index(fields=['organization', 'status'], name='leagues_mat_organiz_9ac50f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(fields=['organization', 'name'], name='leagues_tea_organiz_7c947a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(fields=['organization', 'full_name'], name='leagues_tea_organiz_8e0a08_idx'),
+        ),
+    ]
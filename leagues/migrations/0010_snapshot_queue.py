@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leagues', '0009_denormalized_organization'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SnapshotQueue',
+            fields=[
+                ('division', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='leagues.division')),
+                ('first_marked_at', models.DateTimeField()),
+                ('marked_at', models.DateTimeField()),
+            ],
+        ),
+    ]
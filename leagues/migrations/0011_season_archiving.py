@@ -0,0 +1,140 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('leagues', '0010_snapshot_queue'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='appearance',
+            name='leagues_app_organiz_f21a8b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='cardevent',
+            name='leagues_car_organiz_d531dd_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='goalevent',
+            name='leagues_goa_organiz_3c2886_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='match',
+            name='leagues_mat_divisio_37431d_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='match',
+            name='leagues_mat_venue_i_00ad93_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='match',
+            name='leagues_mat_home_te_dc0559_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='match',
+            name='leagues_mat_away_te_d63843_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='match',
+            name='leagues_mat_venue_i_536231_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='match',
+            name='leagues_mat_home_te_b8a4ca_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='match',
+            name='leagues_mat_away_te_4f3474_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='match',
+            name='leagues_mat_organiz_75ad4c_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='matchattendance',
+            name='leagues_mat_organiz_9ac50f_idx',
+        ),
+        migrations.AddField(
+            model_name='appearance',
+            name='is_archived',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='cardevent',
+            name='is_archived',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='goalevent',
+            name='is_archived',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='is_archived',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='matchattendance',
+            name='is_archived',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='season',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='appearance',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['organization', 'player'], name='appearance_live_org_player_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cardevent',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['organization', 'card'], name='card_live_org_card_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalevent',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['organization', 'scorer'], name='goal_live_org_scorer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['division', 'starts_at'], name='match_live_division_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['venue', 'starts_at'], name='match_live_venue_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['home_team', 'starts_at'], name='match_live_home_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['away_team', 'starts_at'], name='match_live_away_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['venue', 'local_date'], name='match_live_venue_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['home_team', 'local_date'], name='match_live_home_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['away_team', 'local_date'], name='match_live_away_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['organization', 'starts_at'], name='match_live_org_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matchattendance',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['organization', 'status'], name='attendance_live_org_status_idx'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:16
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_jobs'),
+        ('leagues', '0012_audit_log'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teammember',
+            name='appearances_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='goals_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='red_cards_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='yellow_cards_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='Player',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('display_name', models.CharField(max_length=120)),
+                ('match_key', models.CharField(blank=True, default='', editable=False, max_length=255)),
+                ('seasons_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('teams_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('appearances_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('goals_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('yellow_cards_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('red_cards_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='players', to='core.organization')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='player_profiles', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='player',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='memberships', to='leagues.player'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['organization', 'match_key'], name='leagues_pla_organiz_b59427_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='player',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', False)), fields=('organization', 'user'), name='uniq_player_org_user'),
+        ),
+    ]
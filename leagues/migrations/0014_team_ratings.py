@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:34
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_jobs'),
+        ('leagues', '0013_player_identity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingHistory',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('played_at', models.DateTimeField()),
+                ('goals_for', models.PositiveSmallIntegerField()),
+                ('goals_against', models.PositiveSmallIntegerField()),
+                ('expected', models.FloatField()),
+                ('rating_before', models.FloatField()),
+                ('rating_after', models.FloatField()),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_history', to='leagues.match')),
+                ('organization', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.organization')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_history', to='leagues.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['team', 'played_at'], name='leagues_rat_team_id_8eb17a_idx'), models.Index(fields=['organization', 'played_at', 'match'], name='leagues_rat_organiz_8d7a22_idx')],
+                'constraints': [models.UniqueConstraint(fields=('team', 'match'), name='uniq_rating_history_team_match')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TeamRating',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('rating', models.FloatField()),
+                ('initial_rating', models.FloatField()),
+                ('matches_rated', models.PositiveIntegerField(default=0)),
+                ('last_played_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='team_ratings', to='core.organization')),
+                ('team', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rating', to='leagues.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['organization', '-rating'], name='leagues_tea_organiz_81bc5f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leagues', '0014_team_ratings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='club',
+            field=models.CharField(blank=True, default='', max_length=120),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='previous_team',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='next_teams', to='leagues.team'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:41
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_jobs'),
+        ('leagues', '0015_team_club_previous_team'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchTurnoutForecast',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('going', models.PositiveSmallIntegerField(default=0)),
+                ('maybe', models.PositiveSmallIntegerField(default=0)),
+                ('out', models.PositiveSmallIntegerField(default=0)),
+                ('going_show_rate', models.FloatField()),
+                ('maybe_show_rate', models.FloatField()),
+                ('walk_ins', models.FloatField()),
+                ('history_matches', models.PositiveIntegerField(default=0)),
+                ('expected_players', models.FloatField()),
+                ('min_players', models.PositiveSmallIntegerField()),
+                ('shortfall_probability', models.FloatField()),
+                ('at_risk', models.BooleanField(default=False)),
+                ('computed_at', models.DateTimeField()),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='turnout_forecasts', to='leagues.match')),
+                ('organization', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.organization')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='turnout_forecasts', to='leagues.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['team', 'match'], name='leagues_mat_team_id_e63a20_idx'), models.Index(fields=['organization', 'at_risk'], name='leagues_mat_organiz_128af2_idx')],
+                'constraints': [models.UniqueConstraint(fields=('match', 'team'), name='uniq_turnout_forecast_match_team')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:45
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leagues', '0016_match_turnout_forecast'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DivisionRules',
+            fields=[
+                ('division', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rules', serialize=False, to='leagues.division')),
+                ('min_players', models.PositiveSmallIntegerField(default=7, validators=[django.core.validators.MinValueValidator(1)])),
+                ('forfeit_goals', models.PositiveSmallIntegerField(default=3)),
+                ('warning_hours', models.PositiveSmallIntegerField(default=24, validators=[django.core.validators.MaxValueValidator(72)])),
+                ('grace_minutes', models.PositiveSmallIntegerField(default=15)),
+                ('auto_forfeit', models.BooleanField(default=True)),
+            ],
+            options={
+                'verbose_name_plural': 'division rules',
+            },
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='forfeit_rejected_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='matchresult',
+            name='is_provisional',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leagues', '0017_division_rules_forfeits'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='divisionrules',
+            name='auto_forfeit',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_jobs'),
+        ('leagues', '0018_division_rules_opt_in'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='match',
+            name='match_live_division_start_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='match',
+            name='match_live_home_start_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='match',
+            name='match_live_away_start_idx',
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['division', 'starts_at'], name='leagues_mat_divisio_37431d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['home_team', 'starts_at'], name='leagues_mat_home_te_dc0559_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['away_team', 'starts_at'], name='leagues_mat_away_te_d63843_idx'),
+        ),
+    ]
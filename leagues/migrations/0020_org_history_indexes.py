@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_jobs'),
+        ('leagues', '0019_match_history_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='appearance',
+            name='appearance_live_org_player_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='cardevent',
+            name='card_live_org_card_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='goalevent',
+            name='goal_live_org_scorer_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='match',
+            name='match_live_org_start_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='matchattendance',
+            name='attendance_live_org_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='appearance',
+            index=models.Index(fields=['organization', 'player'], name='leagues_app_organiz_f21a8b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cardevent',
+            index=models.Index(fields=['organization', 'card'], name='leagues_car_organiz_d531dd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalevent',
+            index=models.Index(fields=['organization', 'scorer'], name='leagues_goa_organiz_3c2886_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['organization', 'starts_at'], name='leagues_mat_organiz_75ad4c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matchattendance',
+            index=models.Index(fields=['organization', 'status'], name='leagues_mat_organiz_9ac50f_idx'),
+        ),
+    ]
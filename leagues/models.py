@@ -7,8 +7,53 @@ from django.db.models import Q, F
 from django.core.exceptions import ValidationError
 
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+class LiveManager(models.Manager):
+  """
+  Rows of seasons that have not been archived. Filtering through it lets Postgres use
+  the partial "live" indexes, which leave archived history out.
+  """
+  def get_queryset(self):
+    return super().get_queryset().filter(is_archived=False)
+
+
+class TenantKeyMixin:
+  """
+  For models with a denormalized `organization` derived from the parent FK named by
+  `tenant_parent`: `derive_organization` sets it on the first save and again whenever the
+  parent has changed since the row was loaded, so a moved row never keeps its old tenant key.
+  Models with an `is_archived` flag pass `archived` to derive it from the parent the same way,
+  so rows added to an archived season never land in the live indexes.
+  """
+  tenant_parent = None
+
+  @classmethod
+  def from_db(cls, db, field_names, values):
+    instance = super().from_db(db, field_names, values)
+    attname = cls._meta.get_field(cls.tenant_parent).attname
+    if attname in instance.__dict__:
+      instance._loaded_parent_id = instance.__dict__[attname]
+    return instance
+
+  def derive_organization(self, derive, kwargs, archived=None) -> None:
+    """Set organization_id from `derive()`, and is_archived from `archived()`, if needed; both join any `update_fields`."""
+    parent_id = getattr(self, self._meta.get_field(self.tenant_parent).attname)
+    moved = parent_id != getattr(self, "_loaded_parent_id", parent_id)
+    derived = set()
+    if self.organization_id is None or moved:
+      self.organization_id = derive()
+      derived.add("organization")
+    if archived is not None and (self._state.adding or moved):
+      self.is_archived = archived()
+      derived.add("is_archived")
+    update_fields = kwargs.get("update_fields")
+    if derived and update_fields is not None:
+      kwargs["update_fields"] = {*update_fields, *derived}
+    self._loaded_parent_id = parent_id
+
+
 class Season(models.Model):
   id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
   organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="seasons")
@@ -16,6 +61,9 @@ class Season(models.Model):
   start_date = models.DateField(null=True, blank=True)
   end_date = models.DateField(null=True, blank=True)
   is_active = models.BooleanField(default=False)
+  # set by `archive_season`, which flags the season's matches and events is_archived;
+  # rows saved into the season later derive the flag from it
+  archived_at = models.DateTimeField(null=True, blank=True, editable=False)
   created_at = models.DateTimeField(auto_now_add=True)
 
   class Meta:
@@ -41,10 +89,37 @@ class Division(models.Model):
 
   def __str__(self) -> str:
     return f"{self.season.name} - {self.name}"
-  
-class Team(models.Model):
+
+
+class DivisionRules(models.Model):
+  """
+  Match-day rules of a division, applied by leagues.forfeits. The sweep only looks at
+  divisions with a row, and enters forfeits only where auto_forfeit is switched on.
+  """
+  division = models.OneToOneField(Division, on_delete=models.CASCADE, primary_key=True, related_name="rules")
+  # fewer players than this (by GOING replies) and a side forfeits
+  min_players = models.PositiveSmallIntegerField(default=7, validators=[MinValueValidator(1)])
+  # the walkover score, e.g. 3 for 3-0
+  forfeit_goals = models.PositiveSmallIntegerField(default=3)
+  # captains of a short side are warned this long before kick-off
+  warning_hours = models.PositiveSmallIntegerField(default=24, validators=[MaxValueValidator(72)])
+  # provisional forfeits are entered this long after kick-off
+  grace_minutes = models.PositiveSmallIntegerField(default=15)
+  auto_forfeit = models.BooleanField(default=False)
+
+  class Meta:
+    verbose_name_plural = "division rules"
+
+  def __str__(self) -> str:
+    return f"Rules for {self.division}"
+
+
+class Team(TenantKeyMixin, models.Model):
   id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
   division = models.ForeignKey(Division, on_delete=models.CASCADE, related_name="teams")
+  # denormalized tenant key, derived from division on save
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, editable=False, related_name="teams")
+  tenant_parent = "division"
 
   name = models.CharField(max_length=120)
   short_name = models.CharField(max_length=40, blank=True, default="")
@@ -53,9 +128,27 @@ class Team(models.Model):
   primary_contact_email = models.EmailField(blank=True, default="")
   primary_contact_phone = models.CharField(max_length=40, blank=True, default="")
 
+  # where the team usually plays; the origin for travel-distance reports
+  home_venue = models.ForeignKey("Venue", on_delete=models.SET_NULL, null=True, blank=True, related_name="home_teams")
+
+  # teams entered by the same club are kept in different divisions (see leagues.balancing)
+  club = models.CharField(max_length=120, blank=True, default="")
+  # this side's Team in the previous season, set when a season is set up from the last one
+  previous_team = models.ForeignKey(
+    "self", on_delete=models.SET_NULL, null=True, blank=True, related_name="next_teams"
+  )
+
   is_active = models.BooleanField(default=True)
   created_at = models.DateTimeField(auto_now_add=True)
 
+  # Denormalized fixture pointers, maintained by leagues.fixtures (see signals)
+  next_match = models.ForeignKey(
+    "Match", on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name="+"
+  )
+  last_final_match = models.ForeignKey(
+    "Match", on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name="+"
+  )
+
   class Meta:
     constraints = [
       models.UniqueConstraint(fields=["division", "name"], name="uniq_team_division_name")
@@ -63,12 +156,27 @@ class Team(models.Model):
     indexes = [
       models.Index(fields=["division", "name"]),
       models.Index(fields=["is_active"]),
+      models.Index(fields=["organization", "name"]),
     ]
 
   def __str__(self) -> str:
     return self.name
+
+  def save(self, *args, **kwargs):
+    self.derive_organization(lambda: self.division.season.organization_id, kwargs)
+    super().save(*args, **kwargs)
   
 
+class SnapshotQueue(models.Model):
+  """Divisions whose public snapshots are stale; drained by `publish_snapshots --watch`."""
+  division = models.OneToOneField(Division, on_delete=models.CASCADE, primary_key=True, related_name="+")
+  first_marked_at = models.DateTimeField()
+  marked_at = models.DateTimeField()
+
+  def __str__(self) -> str:
+    return f"{self.division_id} stale since {self.first_marked_at}"
+
+
 class TeamSeason(models.Model):
   """
   Anchor for future payments (team owes fees to the league each season),
@@ -101,17 +209,55 @@ class Venue(models.Model):
   notes = models.CharField(max_length=255, blank=True, default="")
   lat = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
   lng = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+  field_count = models.PositiveSmallIntegerField(default=1, validators=[MinValueValidator(1)])
   is_active = models.BooleanField(default=True)
 
   class Meta:
     constraints = [
       models.UniqueConstraint(fields=["organization", "name"], name="uniq_venue_org_name")
     ]
+    indexes = [
+      # bounding-box prefilter for proximity queries (see leagues.geo)
+      models.Index(fields=["organization", "lat", "lng"]),
+    ]
 
   def __str__(self) -> str:
     return self.name
+
+
+class VenueAvailability(models.Model):
+  """Weekly opening window of a venue, in the organization's local time."""
+
+  class Weekday(models.IntegerChoices):
+    MONDAY = 0, "Monday"
+    TUESDAY = 1, "Tuesday"
+    WEDNESDAY = 2, "Wednesday"
+    THURSDAY = 3, "Thursday"
+    FRIDAY = 4, "Friday"
+    SATURDAY = 5, "Saturday"
+    SUNDAY = 6, "Sunday"
+
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name="availability_windows")
+  weekday = models.PositiveSmallIntegerField(choices=Weekday.choices)
+  opens_at = models.TimeField()
+  closes_at = models.TimeField()
+
+  class Meta:
+    constraints = [
+      models.CheckConstraint(
+        condition=Q(closes_at__gt=F("opens_at")),
+        name="chk_venue_availability_window_order"
+      )
+    ]
+    indexes = [
+      models.Index(fields=["venue", "weekday"]),
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.venue} {self.get_weekday_display()} {self.opens_at:%H:%M}-{self.closes_at:%H:%M}"
   
-class Match(models.Model):
+class Match(TenantKeyMixin, models.Model):
   class Status(models.TextChoices):
     SCHEDULED = "SCHEDULED", "Scheduled"
     FINAL = "FINAL", "Final"
@@ -120,6 +266,9 @@ class Match(models.Model):
 
   id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
   season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="matches")
+  # denormalized tenant key, derived from season on save
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, editable=False, related_name="matches")
+  tenant_parent = "season"
   division = models.ForeignKey(Division, on_delete=models.CASCADE, related_name="matches")
   venue = models.ForeignKey(Venue, on_delete=models.PROTECT, null=True, blank=True, related_name="matches")
 
@@ -127,19 +276,39 @@ class Match(models.Model):
   away_team = models.ForeignKey(Team, on_delete=models.PROTECT, related_name="away_matches")
 
   starts_at = models.DateTimeField()
+  # starts_at as a calendar date in the organization's timezone, kept in sync on save
+  local_date = models.DateField(editable=False)
   status = models.CharField(max_length=12, choices=Status.choices, default=Status.SCHEDULED)
   round_label = models.CharField(max_length=80, blank=True, default="")
   notes = models.TextField(blank=True, default="")
+  is_archived = models.BooleanField(default=False, editable=False)
+  # set when an admin rejects a provisional forfeit, so the forfeit sweep leaves the match alone
+  forfeit_rejected_at = models.DateTimeField(null=True, blank=True, editable=False)
 
   created_at = models.DateTimeField(auto_now_add=True)
 
+  objects = models.Manager()
+  live = LiveManager()
+
   class Meta:
     indexes = [
+      # full history, for season pages and the org calendar
       models.Index(fields=["season", "starts_at"]),
+      models.Index(fields=["season", "local_date"]),
+      models.Index(fields=["organization", "local_date"]),
+      # org-scoped listings (the admin's organization filter, ordered by start) read every row
+      models.Index(fields=["organization", "starts_at"]),
+      # division and team reads (standings, result entry, the outlook, snapshots, fixture
+      # pointers) serve archived seasons' history too, so these cover every row; a division's
+      # or team's entries sit together, so archived ones don't slow live lookups
       models.Index(fields=["division", "starts_at"]),
-      models.Index(fields=["venue", "starts_at"]),
       models.Index(fields=["home_team", "starts_at"]),
       models.Index(fields=["away_team", "starts_at"]),
+      # match-day paths through Match.live only cover live (non-archived) rows
+      models.Index(fields=["venue", "starts_at"], condition=Q(is_archived=False), name="match_live_venue_start_idx"),
+      models.Index(fields=["venue", "local_date"], condition=Q(is_archived=False), name="match_live_venue_date_idx"),
+      models.Index(fields=["home_team", "local_date"], condition=Q(is_archived=False), name="match_live_home_date_idx"),
+      models.Index(fields=["away_team", "local_date"], condition=Q(is_archived=False), name="match_live_away_date_idx"),
     ]
     constraints = [
       models.CheckConstraint(
@@ -167,8 +336,28 @@ class Match(models.Model):
         if team.division_id != self.division_id:
           errors[field_name] = f"{field_name.replace('_', ' ').title()} must belong to the match division"
 
+    # venue must be open and have a free field
+    if self.venue_id and self.starts_at and self.status == self.Status.SCHEDULED and "venue" not in errors:
+      from .capacity import booking_conflict
+
+      conflict = booking_conflict(self.venue, self.starts_at, exclude_match_id=self.pk)
+      if conflict:
+        errors["venue"] = conflict
+
     if errors:
       raise ValidationError(errors)
+
+  def save(self, *args, **kwargs):
+    self.derive_organization(lambda: self.season.organization_id, kwargs, archived=lambda: self.season.archived_at is not None)
+    update_fields = kwargs.get("update_fields")
+    if update_fields is None or "starts_at" in update_fields:
+      self.local_date = timezone.localtime(self.starts_at, self.season.organization.tzinfo).date()
+      if update_fields is not None:
+        kwargs["update_fields"] = {*update_fields, "local_date"}
+    super().save(*args, **kwargs)
+    if self.status == self.Status.FINAL:
+      # finalizing the match by hand (e.g. in the admin) accepts a provisional forfeit too
+      MatchResult.objects.filter(match_id=self.pk, is_provisional=True).update(is_provisional=False)
   
 class MatchResult(models.Model):
   id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -177,11 +366,22 @@ class MatchResult(models.Model):
   home_score = models.IntegerField()
   away_score = models.IntegerField()
   is_forfeit = models.BooleanField(default=False)
+  # entered by the forfeit sweep and waiting for an admin: the match stays SCHEDULED, so the
+  # result counts nowhere until leagues.forfeits.confirm_forfeits makes it final
+  is_provisional = models.BooleanField(default=False)
 
   recorded_by = models.CharField(max_length=120, blank=True, default="")
   recorded_at = models.DateTimeField(default=timezone.now)
   updated_at = models.DateTimeField(auto_now=True)
 
+  def save(self, *args, **kwargs):
+    # the sweep bulk-inserts provisional forfeits; any result saved one by one is someone's entry
+    self.is_provisional = False
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None:
+      kwargs["update_fields"] = {*update_fields, "is_provisional"}
+    super().save(*args, **kwargs)
+
 
 # Attendance Lite (per team)
 class TeamInviteToken(models.Model):
@@ -205,7 +405,7 @@ class TeamInviteToken(models.Model):
         self.save(update_fields=["token", "is_active", "rotated_at"])
 
 
-class MatchAttendance(models.Model):
+class MatchAttendance(TenantKeyMixin, models.Model):
   class Status(models.TextChoices):
       GOING = "GOING", "Going"
       MAYBE = "MAYBE", "Maybe"
@@ -213,14 +413,21 @@ class MatchAttendance(models.Model):
 
   id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
   match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name="attendances")
+  # denormalized tenant key, derived from match on save
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, editable=False, related_name="attendances")
+  tenant_parent = "match"
   team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="attendances")
 
   participant_name = models.CharField(max_length=80)
   status = models.CharField(max_length=10, choices=Status.choices)
   note = models.CharField(max_length=255, blank=True, default="")
   device_key = models.CharField(max_length=64, blank=True, default="")
+  is_archived = models.BooleanField(default=False, editable=False)
   updated_at = models.DateTimeField(auto_now=True)
 
+  objects = models.Manager()
+  live = LiveManager()
+
   class Meta:
       constraints = [
           models.UniqueConstraint(
@@ -228,14 +435,58 @@ class MatchAttendance(models.Model):
               name="uniq_attendance_match_team_name",
           )
       ]
+      indexes = [
+          # org-scoped listings read archived history too, so these event indexes are full
+          models.Index(fields=["organization", "status"]),
+      ]
+
+  def save(self, *args, **kwargs):
+    self.derive_organization(lambda: self.match.organization_id, kwargs, archived=lambda: self.match.is_archived)
+    super().save(*args, **kwargs)
+
+class Player(models.Model):
+  """
+  One person across seasons. Each TeamSeason gets its own TeamMember row; those rows link
+  here (see leagues.players), and the career totals below are kept up to date incrementally.
+  """
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="players")
+  user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, related_name="player_profiles", null=True, blank=True)
+  display_name = models.CharField(max_length=120)
+  # email or normalized name used to match unlinked TeamMember rows
+  match_key = models.CharField(max_length=255, blank=True, default="", editable=False)
+
+  seasons_count = models.PositiveIntegerField(default=0, editable=False)
+  teams_count = models.PositiveIntegerField(default=0, editable=False)
+  appearances_count = models.PositiveIntegerField(default=0, editable=False)
+  goals_count = models.PositiveIntegerField(default=0, editable=False)
+  yellow_cards_count = models.PositiveIntegerField(default=0, editable=False)
+  red_cards_count = models.PositiveIntegerField(default=0, editable=False)
+
+  created_at = models.DateTimeField(auto_now_add=True)
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=["organization", "user"], condition=Q(user__isnull=False), name="uniq_player_org_user")
+    ]
+    indexes = [
+      models.Index(fields=["organization", "match_key"]),
+    ]
 
-class TeamMember(models.Model):
+  def __str__(self) -> str:
+    return self.display_name
+
+
+class TeamMember(TenantKeyMixin, models.Model):
   class Role(models.TextChoices):
     CAPTAIN = "CAPTAIN", "Captain"
     PLAYER = "PLAYER", "Player"
 
   id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
   team_season = models.ForeignKey("TeamSeason", on_delete=models.CASCADE, related_name="members")
+  # denormalized tenant key, derived from team_season on save
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, editable=False, related_name="team_members")
+  tenant_parent = "team_season"
   user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, related_name="team_memberships", null=True, blank=True)
 
   role = models.CharField(max_length=10, choices=Role.choices, default=Role.PLAYER)
@@ -251,68 +502,100 @@ class TeamMember(models.Model):
   is_active = models.BooleanField(default=True)
   joined_at = models.DateTimeField(auto_now_add=True)
 
+  player = models.ForeignKey(Player, on_delete=models.SET_NULL, null=True, blank=True, related_name="memberships")
+  # this season's stats, maintained by leagues.players; Player holds the career sums
+  appearances_count = models.PositiveIntegerField(default=0, editable=False)
+  goals_count = models.PositiveIntegerField(default=0, editable=False)
+  yellow_cards_count = models.PositiveIntegerField(default=0, editable=False)
+  red_cards_count = models.PositiveIntegerField(default=0, editable=False)
+
   class Meta:
     constraints = [
       models.UniqueConstraint(fields=["team_season", "full_name"], name="uniq_teamseason_member_name")
     ]
     indexes = [
       models.Index(fields=["team_season", "role"]),
+      models.Index(fields=["organization", "full_name"]),
     ]
 
   def __str__(self):
     return f"{self.full_name} -- {self.team_season.team.name}"
+
+  def save(self, *args, **kwargs):
+    self.derive_organization(lambda: self.team_season.season.organization_id, kwargs)
+    super().save(*args, **kwargs)
   
 
-class GoalEvent(models.Model):
+class GoalEvent(TenantKeyMixin, models.Model):
   id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
   match = models.ForeignKey("Match", on_delete=models.CASCADE, related_name="goal_events")
+  # denormalized tenant key, derived from match on save
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, editable=False, related_name="goal_events")
+  tenant_parent = "match"
   team = models.ForeignKey("Team", on_delete=models.PROTECT, related_name="goal_events")
   scorer = models.ForeignKey("TeamMember", on_delete=models.PROTECT, related_name="goals")
 
   minute = models.PositiveSmallIntegerField(null=True, blank=True)
+  is_archived = models.BooleanField(default=False, editable=False)
 
   created_at = models.DateTimeField(auto_now_add=True)
 
+  objects = models.Manager()
+  live = LiveManager()
+
   class Meta:
     indexes = [
       models.Index(fields=["match"]),
-      models.Index(fields=["scorer"])
+      models.Index(fields=["scorer"]),
+      models.Index(fields=["organization", "scorer"]),
     ]
   def clean(self):
-    if not self.match_id or not self.player_id:
+    if not self.match_id or not self.scorer_id:
         return  # let admin handle required field errors
 
-    player_team_id = self.player.team_season.team_id
+    player_team_id = self.scorer.team_season.team_id
 
     # Auto-set team from player
     self.team_id = player_team_id
 
     if player_team_id not in (self.match.home_team_id, self.match.away_team_id):
         raise ValidationError({
-            "player": "Player must belong to a team playing in this match."
+            "scorer": "Player must belong to a team playing in this match."
         })
 
-class CardEvent(models.Model):
+  def save(self, *args, **kwargs):
+    self.derive_organization(lambda: self.match.organization_id, kwargs, archived=lambda: self.match.is_archived)
+    super().save(*args, **kwargs)
+
+class CardEvent(TenantKeyMixin, models.Model):
   class Card(models.TextChoices):
     YELLOW = "YELLOW", "Yellow"
     RED = "RED", "Red"
   
   id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
   match = models.ForeignKey("Match", on_delete=models.CASCADE, related_name="card_events")
+  # denormalized tenant key, derived from match on save
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, editable=False, related_name="card_events")
+  tenant_parent = "match"
   team = models.ForeignKey("Team", on_delete=models.PROTECT, related_name="card_events")
   player = models.ForeignKey("TeamMember", on_delete=models.PROTECT, related_name="cards")
 
   card = models.CharField(max_length=10, choices=Card.choices)
   minute = models.PositiveSmallIntegerField(null=True, blank=True)
   note = models.CharField(max_length=255, blank=True, default="")
+  is_archived = models.BooleanField(default=False, editable=False)
 
   created_at = models.DateTimeField(auto_now_add=True)
 
+  objects = models.Manager()
+  live = LiveManager()
+
   class Meta:
     indexes = [
       models.Index(fields=["match"]),
       models.Index(fields=["player"]),
       models.Index(fields=["card"]),
+      models.Index(fields=["organization", "card"]),
     ]
 
   def clean(self):
@@ -329,11 +612,22 @@ class CardEvent(models.Model):
             "player": "Player must belong to a team playing in this match."
         })
 
-class Appearance(models.Model):
+  def save(self, *args, **kwargs):
+    self.derive_organization(lambda: self.match.organization_id, kwargs, archived=lambda: self.match.is_archived)
+    super().save(*args, **kwargs)
+
+class Appearance(TenantKeyMixin, models.Model):
   id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
   match = models.ForeignKey("Match", on_delete=models.CASCADE, related_name="appearances")
+  # denormalized tenant key, derived from match on save
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, editable=False, related_name="appearances")
+  tenant_parent = "match"
   team = models.ForeignKey("Team", on_delete=models.PROTECT, related_name="appearances")
   player = models.ForeignKey("TeamMember", on_delete=models.PROTECT, related_name="appearances_as_player")
+  is_archived = models.BooleanField(default=False, editable=False)
+
+  objects = models.Manager()
+  live = LiveManager()
 
   class Meta:
     constraints = [
@@ -342,6 +636,7 @@ class Appearance(models.Model):
     indexes = [
         models.Index(fields=["match", "team"]),
         models.Index(fields=["player"]),
+        models.Index(fields=["organization", "player"]),
     ]
 
   def clean(self):
@@ -356,4 +651,140 @@ class Appearance(models.Model):
     if player_team_id not in (self.match.home_team_id, self.match.away_team_id):
         raise ValidationError({
             "player": "Player must belong to a team playing in this match."
-        })
\ No newline at end of file
+        })
+
+  def save(self, *args, **kwargs):
+    self.derive_organization(lambda: self.match.organization_id, kwargs, archived=lambda: self.match.is_archived)
+    super().save(*args, **kwargs)
+
+
+class AuditEntry(models.Model):
+  """
+  Append-only change history for results, match events and match status. Rows are
+  written in batches by `leagues.audit`; `changes` maps field -> [old, new].
+  """
+
+  class Action(models.TextChoices):
+    CREATE = "CREATE", "Create"
+    UPDATE = "UPDATE", "Update"
+    DELETE = "DELETE", "Delete"
+
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  entity_type = models.CharField(max_length=32)
+  entity_id = models.UUIDField()
+  # plain ids rather than FKs so the history outlives deleted rows
+  match_id = models.UUIDField(null=True, blank=True)
+  action = models.CharField(max_length=10, choices=Action.choices)
+  changes = models.JSONField(encoder=DjangoJSONEncoder, default=dict)
+
+  actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+  created_at = models.DateTimeField(default=timezone.now)
+
+  class Meta:
+    indexes = [
+      models.Index(fields=["entity_type", "entity_id", "created_at"]),
+      models.Index(fields=["match_id", "created_at"]),
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.action} {self.entity_type} {self.entity_id} @ {self.created_at}"
+
+  def save(self, *args, **kwargs):
+    if not self._state.adding:
+      raise ValidationError("Audit entries are append-only.")
+    super().save(*args, **kwargs)
+
+  def delete(self, *args, **kwargs):
+    raise ValidationError("Audit entries are append-only.")
+
+
+class TeamRating(models.Model):
+  """
+  Current strength rating of a team, maintained by `leagues.ratings` from final results in
+  kick-off order. A team's first rating carries over (regressed to the mean) from its
+  previous_team, or from the organization's team of the same name in an earlier season.
+  """
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  team = models.OneToOneField(Team, on_delete=models.CASCADE, related_name="rating")
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, editable=False, related_name="team_ratings")
+  rating = models.FloatField()
+  initial_rating = models.FloatField()
+  matches_rated = models.PositiveIntegerField(default=0)
+  last_played_at = models.DateTimeField(null=True, blank=True)
+  updated_at = models.DateTimeField(auto_now=True)
+
+  class Meta:
+    indexes = [
+      models.Index(fields=["organization", "-rating"]),
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.team} {self.rating:.0f}"
+
+
+class RatingHistory(models.Model):
+  """One rated match from one team's side; replayed from the edited point when an older result changes."""
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, editable=False, related_name="+")
+  team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="rating_history")
+  match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name="rating_history")
+  # the match's starts_at, copied so replays can seek by (played_at, match) without a join
+  played_at = models.DateTimeField()
+  goals_for = models.PositiveSmallIntegerField()
+  goals_against = models.PositiveSmallIntegerField()
+  expected = models.FloatField()
+  rating_before = models.FloatField()
+  rating_after = models.FloatField()
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=["team", "match"], name="uniq_rating_history_team_match")
+    ]
+    indexes = [
+      models.Index(fields=["team", "played_at"]),
+      models.Index(fields=["organization", "played_at", "match"]),
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.team} {self.rating_before:.0f} -> {self.rating_after:.0f}"
+
+
+class MatchTurnoutForecast(models.Model):
+  """
+  Expected turnout of one team for an upcoming match, from its RSVPs and how its past RSVPs
+  turned into Appearances. Written per season by `leagues.turnout`.
+  """
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name="turnout_forecasts")
+  team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="turnout_forecasts")
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, editable=False, related_name="+")
+
+  # RSVPs at computation time
+  going = models.PositiveSmallIntegerField(default=0)
+  maybe = models.PositiveSmallIntegerField(default=0)
+  out = models.PositiveSmallIntegerField(default=0)
+
+  # the team's history: share of GOING / MAYBE replies that played, players per match who played without replying
+  going_show_rate = models.FloatField()
+  maybe_show_rate = models.FloatField()
+  walk_ins = models.FloatField()
+  history_matches = models.PositiveIntegerField(default=0)
+
+  expected_players = models.FloatField()
+  min_players = models.PositiveSmallIntegerField()
+  # probability of fewer than min_players turning up
+  shortfall_probability = models.FloatField()
+  at_risk = models.BooleanField(default=False)
+  computed_at = models.DateTimeField()
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=["match", "team"], name="uniq_turnout_forecast_match_team")
+    ]
+    indexes = [
+      models.Index(fields=["team", "match"]),
+      models.Index(fields=["organization", "at_risk"]),
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.team} @ {self.match_id}: {self.expected_players:.1f}"
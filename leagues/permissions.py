@@ -0,0 +1,155 @@
+"""
+Object-level authorization for league actions.
+
+A user's grants (org roles from Membership, captaincies from TeamMember) are resolved in
+one UNION query, cached per user, and invalidated by signals whenever a Membership or
+TeamMember row for that user changes. Invalidation can't reach other processes' copies of a
+per-process cache, so there grants are only cached for LOCAL_GRANTS_CACHE_TIMEOUT.
+"""
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+from django.db.models import CharField, F, Value
+from rest_framework.permissions import BasePermission
+
+from core.cache import cache_timeout
+from core.models import Membership, Organization
+
+from .models import TeamMember, TeamSeason
+
+STAFF_ROLES = frozenset({
+  Membership.Role.ORG_ADMIN,
+  Membership.Role.LEAGUE_ADMIN,
+  Membership.Role.TEAM_MANAGER,
+})
+GRANTS_CACHE_TIMEOUT = 60 * 10
+# how long another worker may go on honouring a revoked role under a locmem cache
+LOCAL_GRANTS_CACHE_TIMEOUT = 15
+
+
+@dataclass(frozen=True)
+class Grants:
+  org_roles: dict = field(default_factory=dict)  # organization id -> Membership.Role
+  org_slugs: dict = field(default_factory=dict)  # organization slug -> organization id
+  captain_of: dict = field(default_factory=dict)  # team season id -> organization id
+
+  def is_org_staff(self, organization_id, roles=STAFF_ROLES) -> bool:
+    return self.org_roles.get(str(organization_id)) in roles
+
+  def is_org_staff_by_slug(self, slug, roles=STAFF_ROLES) -> bool:
+    org_id = self.org_slugs.get(slug)
+    return org_id is not None and self.is_org_staff(org_id, roles)
+
+  def is_captain(self, team_season_id) -> bool:
+    return str(team_season_id) in self.captain_of
+
+
+def _cache_key(user_id) -> str:
+  return f"leagues:grants:{user_id}"
+
+
+def compute_grants(user_id) -> Grants:
+  def kind(value):
+    return Value(value, output_field=CharField())
+
+  memberships = (
+    Membership.objects
+    .filter(user_id=user_id)
+    .annotate(kind=kind("M"), object_id=F("organization_id"), org_id=F("organization_id"), org_slug=F("organization__slug"))
+    .values_list("kind", "object_id", "org_id", "org_slug", "role")
+  )
+  captaincies = (
+    TeamMember.objects
+    .filter(user_id=user_id, role=TeamMember.Role.CAPTAIN, is_active=True)
+    .annotate(
+      kind=kind("C"),
+      object_id=F("team_season_id"),
+      org_id=F("organization_id"),
+      org_slug=F("organization__slug"),
+      grant=kind(TeamMember.Role.CAPTAIN),
+    )
+    .values_list("kind", "object_id", "org_id", "org_slug", "grant")
+  )
+
+  org_roles, org_slugs, captain_of = {}, {}, {}
+  for row_kind, object_id, org_id, org_slug, role in memberships.union(captaincies, all=True):
+    if row_kind == "M":
+      org_roles[str(org_id)] = role
+      org_slugs[org_slug] = str(org_id)
+    else:
+      captain_of[str(object_id)] = str(org_id)
+  return Grants(org_roles=org_roles, org_slugs=org_slugs, captain_of=captain_of)
+
+
+def get_grants(user) -> Grants:
+  """Grants for `user`, memoized on the user object for the request and cached across requests."""
+  grants = getattr(user, "_league_grants", None)
+  if grants is None:
+    key = _cache_key(user.pk)
+    grants = cache.get(key)
+    if grants is None:
+      grants = compute_grants(user.pk)
+      cache.set(key, grants, cache_timeout(GRANTS_CACHE_TIMEOUT, LOCAL_GRANTS_CACHE_TIMEOUT))
+    user._league_grants = grants
+  return grants
+
+
+def invalidate_grants(*user_ids) -> None:
+  cache.delete_many([_cache_key(u) for u in user_ids if u])
+
+
+def organization_id_for(obj):
+  if isinstance(obj, Organization):
+    return obj.pk
+  if hasattr(obj, "organization_id"):
+    return obj.organization_id
+  if isinstance(obj, TeamSeason):
+    return obj.season.organization_id
+  if hasattr(obj, "season"):
+    return obj.season.organization_id
+  return None
+
+
+def team_season_id_for(obj):
+  if isinstance(obj, TeamSeason):
+    return obj.pk
+  return getattr(obj, "team_season_id", None)
+
+
+# ---------- DRF permission classes ----------
+
+class IsOrgStaff(BasePermission):
+  """ORG_ADMIN / LEAGUE_ADMIN / TEAM_MANAGER of the organization in the URL (org_slug) or of the object."""
+
+  def has_permission(self, request, view):
+    user = request.user
+    if not (user and user.is_authenticated):
+      return False
+    if user.is_superuser:
+      return True
+    slug = view.kwargs.get("org_slug")
+    if slug is not None:
+      return get_grants(user).is_org_staff_by_slug(slug)
+    return True
+
+  def has_object_permission(self, request, view, obj):
+    if request.user.is_superuser:
+      return True
+    return get_grants(request.user).is_org_staff(organization_id_for(obj))
+
+
+class IsCaptainOrOrgStaff(IsOrgStaff):
+  """Captain of the object's TeamSeason, or staff of its organization."""
+
+  def has_permission(self, request, view):
+    # captains are only known per object; the org check happens in has_object_permission
+    return bool(request.user and request.user.is_authenticated)
+
+  def has_object_permission(self, request, view, obj):
+    if request.user.is_superuser:
+      return True
+    grants = get_grants(request.user)
+    team_season_id = team_season_id_for(obj)
+    if team_season_id is not None and grants.is_captain(team_season_id):
+      return True
+    return grants.is_org_staff(organization_id_for(obj))
@@ -0,0 +1,160 @@
+"""
+Player identity across seasons and incrementally maintained career stats.
+
+A TeamMember row is linked to a Player by its user, otherwise by email, otherwise by a
+normalized name that exactly one player in the organization carries (and who isn't already
+on a roster that season). Ambiguous rows get a new Player and can be merged in the admin.
+
+Each match event bumps its member's season counter and the player's career total with F()
+updates, so a career page is a single query over the player's TeamMember rows however long
+their history is.
+"""
+from collections import defaultdict
+
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import Appearance, CardEvent, GoalEvent, Player, TeamMember
+
+CARD_COUNTERS = {
+  CardEvent.Card.YELLOW: "yellow_cards_count",
+  CardEvent.Card.RED: "red_cards_count",
+}
+STAT_COUNTERS = ("appearances_count", "goals_count", "yellow_cards_count", "red_cards_count")
+
+
+def normalize_name(name) -> str:
+  return " ".join((name or "").split()).casefold()
+
+
+def match_key(member) -> str:
+  if member.email:
+    return f"email:{member.email.strip().lower()}"
+  name = normalize_name(member.full_name)
+  return f"name:{name}" if name else ""
+
+
+# ---------- linking ----------
+
+def link_members(members) -> int:
+  """Attach unlinked TeamMembers to a Player, creating players as needed. Returns members linked."""
+  members = [m for m in members if m.player_id is None]
+  if not members:
+    return 0
+
+  by_org = defaultdict(list)
+  for m in members:
+    by_org[m.organization_id].append(m)
+
+  linked = []
+  for org_id, org_members in by_org.items():
+    user_ids = {m.user_id for m in org_members if m.user_id}
+    keys = {match_key(m) for m in org_members} - {""}
+    existing = list(Player.objects.filter(Q(user_id__in=user_ids) | Q(match_key__in=keys), organization_id=org_id))
+    by_user = {p.user_id: p for p in existing if p.user_id}
+    by_key = defaultdict(list)
+    for p in existing:
+      if p.match_key:
+        by_key[p.match_key].append(p)
+    seasons = _seasons_by_player([p.pk for p in existing])
+
+    created, claimed = [], []
+    for m in org_members:
+      season_id = m.team_season.season_id
+      key = match_key(m)
+      player = by_user.get(m.user_id) if m.user_id else None
+      if player is None and key:
+        candidates = [p for p in by_key[key] if season_id not in seasons[p.pk] and (not m.user_id or not p.user_id)]
+        if len(candidates) == 1 and (key.startswith("email:") or len(by_key[key]) == 1):
+          player = candidates[0]
+      if player is None:
+        player = Player(organization_id=org_id, user_id=m.user_id, display_name=m.full_name or key.split(":", 1)[-1] or "Unnamed", match_key=key)
+        created.append(player)
+        if key:
+          by_key[key].append(player)
+      if m.user_id and player.user_id is None:
+        player.user_id = m.user_id
+        by_user[m.user_id] = player
+        if player not in created:
+          claimed.append(player)
+      seasons[player.pk].add(season_id)
+      m.player = player
+      linked.append(m)
+
+    Player.objects.bulk_create(created, batch_size=500)
+    if claimed:
+      Player.objects.bulk_update(claimed, ["user"], batch_size=500)
+
+  TeamMember.objects.bulk_update(linked, ["player"], batch_size=500)
+  refresh_players({m.player_id for m in linked})
+  return len(linked)
+
+
+def _seasons_by_player(player_ids):
+  seasons = defaultdict(set)
+  rows = TeamMember.objects.filter(player_id__in=player_ids).values_list("player_id", "team_season__season_id")
+  for player_id, season_id in rows:
+    seasons[player_id].add(season_id)
+  return seasons
+
+
+# ---------- counters ----------
+
+def _sum(field):
+  members = TeamMember.objects.filter(player=OuterRef("pk")).order_by().values("player")
+  return Coalesce(Subquery(members.annotate(total=Sum(field)).values("total")), Value(0), output_field=IntegerField())
+
+
+def _distinct(field):
+  members = TeamMember.objects.filter(player=OuterRef("pk")).order_by().values("player")
+  return Coalesce(Subquery(members.annotate(n=Count(field, distinct=True)).values("n")), Value(0), output_field=IntegerField())
+
+
+def refresh_players(player_ids) -> int:
+  """Re-sum the career totals of these players from their memberships (one UPDATE)."""
+  player_ids = {pk for pk in player_ids if pk}
+  if not player_ids:
+    return 0
+  return Player.objects.filter(pk__in=player_ids).update(
+    seasons_count=_distinct("team_season__season"),
+    # a Team row is per season, so the same club carried over is counted by name
+    teams_count=_distinct("team_season__team__name"),
+    **{field: _sum(field) for field in STAT_COUNTERS},
+  )
+
+
+def event_stat(event):
+  """(member id, counter) an Appearance, GoalEvent or CardEvent counts towards, as loaded."""
+  values = event.__dict__
+  if isinstance(event, GoalEvent):
+    return values.get("scorer_id"), "goals_count"
+  if isinstance(event, CardEvent):
+    return values.get("player_id"), CARD_COUNTERS.get(values.get("card"))
+  return values.get("player_id"), "appearances_count"
+
+
+def bump(member_id, counter, delta) -> None:
+  """Apply one event to a member's season counter and to its player's career totals."""
+  if not member_id or not counter:
+    return
+  TeamMember.objects.filter(pk=member_id).update(**{counter: F(counter) + delta})
+  Player.objects.filter(memberships__pk=member_id).update(**{counter: F(counter) + delta})
+
+
+def _count(model, fk, **filters):
+  rows = model.objects.filter(**{fk: OuterRef("pk")}, **filters).order_by().values(fk)
+  return Coalesce(Subquery(rows.annotate(n=Count("pk")).values("n")), Value(0), output_field=IntegerField())
+
+
+def rebuild_stats(members=None) -> int:
+  """Recount member counters from the event tables and re-sum their players (repair/backfill)."""
+  members = TeamMember.objects.all() if members is None else members
+  updated = members.update(
+    appearances_count=_count(Appearance, "player"),
+    goals_count=_count(GoalEvent, "scorer"),
+    yellow_cards_count=_count(CardEvent, "player", card=CardEvent.Card.YELLOW),
+    red_cards_count=_count(CardEvent, "player", card=CardEvent.Card.RED),
+  )
+  player_ids = set(members.exclude(player=None).values_list("player_id", flat=True))
+  refresh_players(player_ids)
+  return updated
@@ -0,0 +1,167 @@
+"""
+Static snapshot publisher.
+
+Public schedules, standings and results are rendered to JSON (optionally HTML) under
+LEAGUES_SNAPSHOT_ROOT so a static file server or CDN can serve them without Django:
+
+  <root>/<org>/index.json
+  <root>/<org>/<season>/index.json
+  <root>/<org>/<season>/<division>/{schedule,results,standings}.json  (+ index.html)
+
+Files are written to a temp file and os.replace()d, so readers never see a partial file.
+Signals only mark divisions stale (SnapshotQueue); `publish_snapshots --watch` drains the
+queue once a division has been quiet for the debounce period.
+"""
+import json
+import os
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from core.models import Organization
+
+from .models import Division, Match, Season, SnapshotQueue
+from .serializers import MatchPublicSerializer
+from .standings import compute_standings
+
+
+def snapshot_root() -> Path:
+  return Path(settings.LEAGUES_SNAPSHOT_ROOT)
+
+
+def write_atomic(path: Path, content: str) -> None:
+  path.parent.mkdir(parents=True, exist_ok=True)
+  fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+  try:
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+      fh.write(content)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+  except BaseException:
+    if os.path.exists(tmp):
+      os.unlink(tmp)
+    raise
+
+
+def _write_json(path: Path, payload) -> None:
+  write_atomic(path, json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":")))
+
+
+def _season_dir(root, season):
+  return root / season.organization.slug / str(season.id)
+
+
+# ---------- renderers ----------
+
+def publish_division(division, *, root=None, html=None) -> None:
+  root = root or snapshot_root()
+  html = settings.LEAGUES_SNAPSHOT_HTML if html is None else html
+  season = division.season
+  out = _season_dir(root, season) / str(division.id)
+
+  matches = list(
+    Match.objects
+    .filter(division=division)
+    .select_related("home_team", "away_team", "venue", "division", "result")
+    .order_by("starts_at")
+  )
+  teams = list(division.teams.filter(is_active=True).values_list("id", "name"))
+  results = [
+    (m.home_team_id, m.away_team_id, m.result.home_score, m.result.away_score)
+    for m in matches
+    if m.status == Match.Status.FINAL and getattr(m, "result", None)
+  ]
+
+  meta = {"division": division.id, "name": division.name, "season": season.id, "published_at": timezone.now()}
+  schedule = MatchPublicSerializer(
+    [m for m in matches if m.status in (Match.Status.SCHEDULED, Match.Status.POSTPONED)], many=True
+  ).data
+  finals = MatchPublicSerializer([m for m in matches if m.status == Match.Status.FINAL], many=True).data
+  standings = [row.as_dict() for row in compute_standings(teams, results)]
+
+  _write_json(out / "schedule.json", {**meta, "matches": schedule})
+  _write_json(out / "results.json", {**meta, "matches": finals})
+  _write_json(out / "standings.json", {**meta, "standings": standings})
+  if html:
+    write_atomic(out / "index.html", render_to_string("leagues/snapshots/division.html", {
+      "division": division, "season": season, "schedule": schedule, "results": finals, "standings": standings,
+    }))
+
+
+def publish_season_index(season, *, root=None) -> None:
+  root = root or snapshot_root()
+  divisions = season.divisions.order_by("sort_order", "name").values("id", "name", "sort_order")
+  _write_json(_season_dir(root, season) / "index.json", {
+    "season": season.id, "name": season.name, "is_active": season.is_active, "divisions": list(divisions),
+  })
+
+
+def publish_org_index(organization, *, root=None) -> None:
+  root = root or snapshot_root()
+  seasons = organization.seasons.order_by("-start_date", "name").values("id", "name", "is_active", "start_date", "end_date")
+  _write_json(root / organization.slug / "index.json", {
+    "organization": organization.slug, "name": organization.name, "timezone": organization.timezone,
+    "seasons": list(seasons),
+  })
+
+
+def publish_all(organization=None, *, root=None, html=None) -> int:
+  """Full rebuild. Returns the number of divisions published."""
+  orgs = Organization.objects.filter(is_active=True)
+  if organization is not None:
+    orgs = orgs.filter(pk=organization.pk)
+
+  published = 0
+  for org in orgs:
+    publish_org_index(org, root=root)
+    for season in Season.objects.filter(organization=org).select_related("organization"):
+      publish_season_index(season, root=root)
+      for division in season.divisions.select_related("season__organization"):
+        publish_division(division, root=root, html=html)
+        published += 1
+  return published
+
+
+# ---------- incremental mode ----------
+
+def mark_stale(*division_ids) -> None:
+  """Queue divisions for republishing; repeated marks just push marked_at forward."""
+  now = timezone.now()
+  SnapshotQueue.objects.bulk_create(
+    [SnapshotQueue(division_id=d, first_marked_at=now, marked_at=now) for d in set(division_ids) if d],
+    update_conflicts=True,
+    unique_fields=["division"],
+    update_fields=["marked_at"],
+  )
+
+
+def publish_pending(*, debounce_seconds=5, max_wait_seconds=60, root=None, html=None) -> int:
+  """
+  Publish divisions that have been quiet for `debounce_seconds` (or stale for longer than
+  `max_wait_seconds`, so a busy result night still goes out). Returns divisions published.
+  """
+  now = timezone.now()
+  due = list(
+    SnapshotQueue.objects.filter(marked_at__lte=now - timedelta(seconds=debounce_seconds))
+    | SnapshotQueue.objects.filter(first_marked_at__lte=now - timedelta(seconds=max_wait_seconds))
+  )
+  if not due:
+    return 0
+
+  divisions = Division.objects.filter(pk__in=[q.division_id for q in due]).select_related("season__organization")
+  seasons = {}
+  for division in divisions:
+    publish_division(division, root=root, html=html)
+    seasons[division.season_id] = division.season
+  for season in seasons.values():
+    publish_season_index(season, root=root)
+
+  # rows marked again while we were publishing stay queued
+  for q in due:
+    SnapshotQueue.objects.filter(pk=q.pk, marked_at=q.marked_at).delete()
+  return len(divisions)
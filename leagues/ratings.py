@@ -0,0 +1,291 @@
+"""
+Elo strength ratings for teams.
+
+Final, non-forfeit results are rated per organization in (starts_at, match id) order, with
+home advantage and a goal-margin multiplier. A team's first rating carries over from the
+team's `previous_team` (or, failing that, the organization's team of the same name in an
+earlier season), regressed towards the mean, so strength follows a side from one season's
+Team row to the next.
+
+`replay(organization_id, since)` is the one engine behind every path:
+
+- a new result after everything already rated replays just that result (a handful of rows);
+- an edited, deleted or late-entered older result replays from that point on, large
+  replays going to the `leagues.replay_ratings` job instead of the request;
+- `since=None` rebuilds an organization's whole history in one pass over flat arrays with
+  set-based reads and bulk writes (`manage.py rebuild_ratings`).
+"""
+from array import array
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Lower, Trim
+
+from core import jobs
+from core.models import Job, Organization
+
+from .models import Match, RatingHistory, Team, TeamRating
+
+BASE_RATING = 1500.0
+K_FACTOR = 24.0
+HOME_ADVANTAGE = 60.0
+# share of last season's distance from the mean a club keeps into the new season
+CARRY_OVER = 0.75
+# replays touching more results than this run on the job worker
+INLINE_REPLAY_LIMIT = 500
+
+
+def team_key(name) -> str:
+  return (name or "").strip().lower()
+
+
+def expected_score(rating, opponent) -> float:
+  return 1.0 / (1.0 + 10 ** ((opponent - rating) / 400.0))
+
+
+def margin_multiplier(goal_difference) -> float:
+  margin = abs(goal_difference)
+  if margin <= 1:
+    return 1.0
+  if margin == 2:
+    return 1.5
+  return (11 + margin) / 8
+
+
+def home_expectation(home_rating, away_rating) -> float:
+  return expected_score(home_rating + HOME_ADVANTAGE, away_rating)
+
+
+# ---------- replay ----------
+
+def _since_filter(since, time_field, match_field, *, before=False):
+  """Q for rows at or after (`before`: strictly before) the (starts_at, match id) point."""
+  at, match_id = since
+  if before:
+    return Q(**{f"{time_field}__lt": at}) | Q(**{time_field: at, f"{match_field}__lt": match_id})
+  return Q(**{f"{time_field}__gt": at}) | Q(**{time_field: at, f"{match_field}__gte": match_id})
+
+
+def _results(organization_id, since):
+  qs = Match.objects.filter(organization_id=organization_id, status=Match.Status.FINAL, result__is_forfeit=False)
+  if since is not None:
+    qs = qs.filter(_since_filter(since, "starts_at", "pk"))
+  return qs.order_by("starts_at", "pk")
+
+
+def _starting_state(organization_id, team_ids, since):
+  """
+  (team id, key, season id, previous team id, rating, initial, rated, last played) of the
+  given teams, their previous teams and every team sharing their names, as of just before
+  `since`.
+  """
+  teams = Team.objects.filter(organization_id=organization_id).annotate(key=Lower(Trim("name")))
+  if team_ids is not None:
+    related = list(teams.filter(pk__in=team_ids).values_list("key", "previous_team_id"))
+    teams = teams.filter(
+      Q(pk__in=team_ids) | Q(key__in={key for key, _ in related}) | Q(pk__in={p for _, p in related if p})
+    )
+  columns = ("pk", "key", "division__season_id", "previous_team_id")
+  if since is None:
+    # a full replay starts everyone from scratch
+    return [(*row, None, None, 0, None) for row in teams.values_list(*columns)]
+  before = RatingHistory.objects.filter(team=OuterRef("pk")).filter(
+    _since_filter(since, "played_at", "match_id", before=True)
+  )
+  latest = before.order_by("-played_at", "-match_id")
+  rated = before.order_by().values("team").annotate(n=Count("pk")).values("n")
+  return teams.annotate(
+    last_rating=Subquery(latest.values("rating_after")[:1]),
+    last_at=Subquery(latest.values("played_at")[:1]),
+    rated=Subquery(rated),
+    initial=F("rating__initial_rating"),
+  ).values_list(*columns, "last_rating", "initial", "rated", "last_at")
+
+
+def replay(organization_id, since=None) -> int:
+  """
+  Re-rate the organization's results from the (starts_at, match id) point `since` onwards
+  (everything when None). Returns the number of results rated.
+  """
+  with transaction.atomic():
+    # one replay per organization at a time
+    Organization.objects.select_for_update().filter(pk=organization_id).first()
+
+    results = list(
+      _results(organization_id, since)
+      .values_list("pk", "starts_at", "home_team_id", "away_team_id", "result__home_score", "result__away_score")
+    )
+    stale = RatingHistory.objects.filter(organization_id=organization_id)
+    if since is not None:
+      stale = stale.filter(_since_filter(since, "played_at", "match_id"))
+    involved = {t for r in results for t in (r[2], r[3])}
+    involved.update(stale.values_list("team_id", flat=True).distinct())
+    if not involved:
+      return 0
+
+    # per-team state lives in parallel arrays indexed by `slot`
+    slot, keys, seasons, previous = {}, [], [], []
+    rating, initial, rated = array("d"), array("d"), array("q")
+    last_at = []
+    # key -> season -> (last played, rating): where a new season's team carries over from
+    by_key = defaultdict(dict)
+    for pk, key, season_id, previous_id, last_rating, init, n, at in _starting_state(
+      organization_id, None if since is None else involved, since
+    ):
+      slot[pk] = len(keys)
+      keys.append(key)
+      seasons.append(season_id)
+      previous.append(previous_id)
+      rating.append(last_rating if last_rating is not None else 0.0)
+      initial.append(init if (init is not None and n) else 0.0)
+      rated.append(n or 0)
+      last_at.append(at)
+      if at is not None:
+        _remember(by_key, key, season_id, at, last_rating)
+
+    stale.delete()
+
+    history = []
+    for match_id, at, home, away, home_score, away_score in results:
+      h, a = slot[home], slot[away]
+      for s in (h, a):
+        if not rated[s]:
+          p = slot.get(previous[s])
+          if p is not None and rated[p]:
+            initial[s] = rating[s] = _regressed(rating[p])
+          else:
+            initial[s] = rating[s] = _carried_over(by_key[keys[s]], seasons[s])
+      expected = home_expectation(rating[h], rating[a])
+      actual = 1.0 if home_score > away_score else 0.5 if home_score == away_score else 0.0
+      delta = K_FACTOR * margin_multiplier(home_score - away_score) * (actual - expected)
+      for s, team_id, gf, ga, exp, change in (
+        (h, home, home_score, away_score, expected, delta),
+        (a, away, away_score, home_score, 1.0 - expected, -delta),
+      ):
+        history.append(RatingHistory(
+          organization_id=organization_id,
+          team_id=team_id,
+          match_id=match_id,
+          played_at=at,
+          goals_for=gf,
+          goals_against=ga,
+          expected=exp,
+          rating_before=rating[s],
+          rating_after=rating[s] + change,
+        ))
+        rating[s] += change
+        rated[s] += 1
+        last_at[s] = at
+        _remember(by_key, keys[s], seasons[s], at, rating[s])
+
+    RatingHistory.objects.bulk_create(history, batch_size=1000)
+
+    touched = [pk for pk in involved if pk in slot]
+    TeamRating.objects.filter(team_id__in=[pk for pk in touched if not rated[slot[pk]]]).delete()
+    TeamRating.objects.bulk_create(
+      [
+        TeamRating(
+          team_id=pk,
+          organization_id=organization_id,
+          rating=rating[slot[pk]],
+          initial_rating=initial[slot[pk]],
+          matches_rated=rated[slot[pk]],
+          last_played_at=last_at[slot[pk]],
+        )
+        for pk in touched if rated[slot[pk]]
+      ],
+      batch_size=1000,
+      update_conflicts=True,
+      unique_fields=["team"],
+      update_fields=["rating", "initial_rating", "matches_rated", "last_played_at", "updated_at"],
+    )
+  return len(results)
+
+
+def _remember(by_key, key, season_id, at, value):
+  seen = by_key[key].get(season_id)
+  if seen is None or at >= seen[0]:
+    by_key[key][season_id] = (at, value)
+
+
+def _carried_over(seasons_seen, season_id) -> float:
+  earlier = [seen for s, seen in seasons_seen.items() if s != season_id]
+  if not earlier:
+    return BASE_RATING
+  _, previous = max(earlier, key=lambda seen: seen[0])
+  return _regressed(previous)
+
+
+def _regressed(rating) -> float:
+  return BASE_RATING + CARRY_OVER * (rating - BASE_RATING)
+
+
+# ---------- triggering ----------
+
+def request_replay(organization_id, since) -> None:
+  """Replay from `since` now if it's small, otherwise (coalesced) on the job worker."""
+  if _results(organization_id, since).count() <= INLINE_REPLAY_LIMIT:
+    replay(organization_id, since)
+    return
+
+  at, match_id = since
+  payload = {"organization_id": str(organization_id), "since": at.isoformat(), "since_match": str(match_id)}
+  with transaction.atomic():
+    queued = (
+      Job.objects.select_for_update()
+      .filter(name="leagues.replay_ratings", status=Job.Status.QUEUED, organization_id=organization_id)
+      .first()
+    )
+    if queued is None:
+      jobs.enqueue("leagues.replay_ratings", payload, organization=Organization.objects.get(pk=organization_id))
+    elif queued.payload.get("since") and (at.isoformat(), str(match_id)) < (queued.payload["since"], queued.payload["since_match"]):
+      queued.payload = payload
+      queued.save(update_fields=["payload"])
+
+
+def results_changed(match_ids) -> None:
+  """
+  Bring ratings up to date after the results of `match_ids` were created, edited or
+  removed. Results whose rated score hasn't changed are skipped.
+  """
+  matches = list(
+    Match.objects.filter(pk__in=list(match_ids))
+    .values_list("pk", "organization_id", "starts_at", "status", "result__home_score", "result__away_score", "result__is_forfeit")
+  )
+  rated = {
+    match_id: (at, gf, ga)
+    for match_id, at, gf, ga in RatingHistory.objects
+    .filter(match_id__in=[m[0] for m in matches], team_id=F("match__home_team_id"))
+    .values_list("match_id", "played_at", "goals_for", "goals_against")
+  }
+  points = {}
+  for match_id, org_id, at, status, home_score, away_score, forfeit in matches:
+    ratable = status == Match.Status.FINAL and home_score is not None and not forfeit
+    current = rated.get(match_id)
+    if ratable and current == (at, home_score, away_score) or not ratable and current is None:
+      continue
+    point = min((at, match_id), (current[0], match_id)) if current else (at, match_id)
+    points[org_id] = min(points.get(org_id, point), point)
+  for org_id, point in points.items():
+    request_replay(org_id, point)
+
+
+def fixture_probabilities(graph):
+  """
+  (home win, draw) per remaining fixture of a LeagueGraph from current ratings, with the
+  division's own draw rate, or None when none of its teams is rated yet.
+  """
+  ratings = dict(TeamRating.objects.filter(team_id__in=graph.team_ids).values_list("team_id", "rating"))
+  if not ratings:
+    return None
+  by_index = [ratings.get(team_id, BASE_RATING) for team_id in graph.team_ids]
+  _, draw_rate = graph.base_rates()
+  probabilities = []
+  for h, a in zip(graph.home, graph.away):
+    expected = home_expectation(by_index[h], by_index[a])
+    # an expected score of e with draws at `draw_rate`: P(home) = e - draw_rate / 2
+    draw = min(draw_rate, 2 * min(expected, 1 - expected))
+    probabilities.append((max(0.0, expected - draw / 2), draw))
+  return probabilities
+
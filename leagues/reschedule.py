@@ -0,0 +1,211 @@
+"""
+Bulk rescheduling for weather closures and other venue outages.
+
+`reschedule_venue` takes every scheduled or postponed match booked at a venue over a range
+of local dates and re-slots it into the earliest free field the capacity planner finds
+afterwards, skipping days either team already plays. All moves are written in one
+transaction with one UPDATE; matches that don't fit stay POSTPONED. Team contacts and
+attendance respondents are told through the notifications outbox, which digests and
+delivers them from the job worker once the transaction commits.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from notifications import outbox
+from notifications.backends import channels
+from notifications.models import Notification
+
+from . import audit
+from .capacity import BOOKED_STATUSES, plan_capacity
+from .fixtures import refresh_team_match_pointers
+from .models import Match, MatchAttendance, TeamMember, Venue
+from .players import normalize_name
+from .publisher import mark_stale
+
+MOVABLE_STATUSES = (Match.Status.SCHEDULED, Match.Status.POSTPONED)
+DEFAULT_HORIZON_DAYS = 28
+
+
+@dataclass(frozen=True)
+class Move:
+  match: Match
+  venue_id: object
+  starts_at: object
+
+
+@dataclass
+class ReschedulePlan:
+  moves: list = field(default_factory=list)
+  # matches with no free slot in the horizon; they are left POSTPONED
+  unplaced: list = field(default_factory=list)
+  venue_names: dict = field(default_factory=dict)
+  notifications: int = 0
+
+
+def affected_matches(venue, start, end, *, lock=False):
+  qs = Match.live.filter(venue=venue, local_date__range=(start, end), status__in=MOVABLE_STATUSES)
+  if lock:
+    qs = qs.select_for_update(of=("self",))
+  return list(
+    qs.select_related("season__organization", "division", "home_team", "away_team", "venue")
+    .order_by("starts_at", "pk")
+  )
+
+
+def _busy_days(matches, start, end):
+  """Local dates in [start, end] on which each team of `matches` already has a booked match."""
+  team_ids = {t for m in matches for t in (m.home_team_id, m.away_team_id)}
+  busy = defaultdict(set)
+  rows = (
+    Match.live
+    .filter(Q(home_team_id__in=team_ids) | Q(away_team_id__in=team_ids))
+    .filter(local_date__range=(start, end), status__in=BOOKED_STATUSES)
+    .exclude(pk__in=[m.pk for m in matches])
+    .values_list("home_team_id", "away_team_id", "local_date")
+  )
+  for home, away, day in rows:
+    busy[home].add(day)
+    busy[away].add(day)
+  return busy
+
+
+def plan_reschedule(organization, matches, after, *, horizon_days=DEFAULT_HORIZON_DAYS, venues=None) -> ReschedulePlan:
+  """
+  Earliest conflict-free placement for each of `matches` between the local dates `after`
+  and `after + horizon_days`. Each team plays at most once per day; fields are taken from
+  the planner's free slots, so venue opening hours and field counts are respected.
+  """
+  end = after + timedelta(days=horizon_days - 1)
+  capacity = plan_capacity(organization, after, end, venues=venues)
+  free = {(s.venue_id, s.starts_at): s.free_fields for s in capacity.free_slots}
+  busy = _busy_days(matches, after, end)
+  tz = organization.tzinfo
+  now = timezone.now()
+
+  plan = ReschedulePlan(venue_names={u.venue_id: u.name for u in capacity.usage.values()})
+  for match in matches:
+    for slot in capacity.free_slots:
+      if slot.starts_at <= now:
+        continue
+      key = (slot.venue_id, slot.starts_at)
+      day = slot.starts_at.astimezone(tz).date()
+      if free[key] and day not in busy[match.home_team_id] and day not in busy[match.away_team_id]:
+        free[key] -= 1
+        busy[match.home_team_id].add(day)
+        busy[match.away_team_id].add(day)
+        plan.moves.append(Move(match, slot.venue_id, slot.starts_at))
+        break
+    else:
+      plan.unplaced.append(match)
+  return plan
+
+
+def reschedule_venue(venue, start, end, *, after=None, horizon_days=DEFAULT_HORIZON_DAYS, venues=None, reason="", dry_run=False) -> ReschedulePlan:
+  """
+  Move the matches booked at `venue` between the local dates `start` and `end` (inclusive)
+  to free slots from `after` (default: the day after `end`, or today if later). `venues`
+  (instances or ids) limits the candidate venues; by default every active venue of the
+  organization is used, this one included. With `dry_run` nothing is written.
+  """
+  organization = venue.organization
+  today = timezone.localdate(timezone=organization.tzinfo)
+  after = after or max(end + timedelta(days=1), today)
+  if end < start:
+    raise ValidationError({"end": "Must not be before start."})
+  if after <= end:
+    raise ValidationError({"after": "Matches can only be moved to dates after the closed range."})
+
+  with audit.audit_batch(), transaction.atomic():
+    candidates = Venue.objects.filter(organization=organization, is_active=True)
+    if venues is not None:
+      candidates = candidates.filter(pk__in=[getattr(v, "pk", v) for v in venues])
+    if not dry_run:
+      # concurrent reschedules into the same venues wait for each other instead of double-booking
+      candidates = candidates.select_for_update()
+    venues = list(candidates)
+    matches = affected_matches(venue, start, end, lock=not dry_run)
+    plan = plan_reschedule(organization, matches, after, horizon_days=horizon_days, venues=venues)
+    if dry_run or not matches:
+      return plan
+
+    old = {m.pk: (m.starts_at, m.venue, m.status) for m in matches}
+    for move in plan.moves:
+      move.match.starts_at = move.starts_at
+      move.match.local_date = move.starts_at.astimezone(organization.tzinfo).date()
+      move.match.venue_id = move.venue_id
+      move.match.status = Match.Status.SCHEDULED
+    for match in plan.unplaced:
+      match.status = Match.Status.POSTPONED
+    Match.objects.bulk_update(matches, ["starts_at", "local_date", "venue", "status"], batch_size=500)
+    audit.record_bulk(matches)
+
+    refresh_team_match_pointers({t for m in matches for t in (m.home_team_id, m.away_team_id)})
+    mark_stale(*{m.division_id for m in matches})
+    plan.notifications = len(outbox.queue(_notifications(organization, plan, old, reason)))
+  return plan
+
+
+# ---------- notifications ----------
+
+def _recipients(matches):
+  """(channel, address) pairs per match: both team contacts plus roster emails of attendance respondents."""
+  team_ids = {t for m in matches for t in (m.home_team_id, m.away_team_id)}
+  emails = defaultdict(dict)
+  rows = (
+    TeamMember.objects
+    .filter(team_season__team_id__in=team_ids, is_active=True)
+    .exclude(email="")
+    .values_list("team_season__team_id", "full_name", "email")
+  )
+  for team_id, name, email in rows:
+    emails[team_id][normalize_name(name)] = email
+
+  recipients = {m.pk: {*outbox.team_contacts(m.home_team), *outbox.team_contacts(m.away_team)} for m in matches}
+  if Notification.Channel.EMAIL not in channels():
+    return recipients
+  respondents = MatchAttendance.objects.filter(match_id__in=recipients).values_list("match_id", "team_id", "participant_name")
+  for match_id, team_id, name in respondents:
+    email = emails[team_id].get(normalize_name(name))
+    if email:
+      recipients[match_id].add((Notification.Channel.EMAIL, email))
+  return recipients
+
+
+def _when(dt, tz):
+  return timezone.localtime(dt, tz).strftime("%a %d %b %Y, %H:%M")
+
+
+def _notifications(organization, plan, old, reason):
+  tz = organization.tzinfo
+  matches = [m.match for m in plan.moves] + plan.unplaced
+  recipients = _recipients(matches)
+  note = f"\nReason: {reason}\n" if reason else ""
+
+  for match in matches:
+    was_at, was_venue, was_status = old[match.pk]
+    if was_status == match.status == Match.Status.POSTPONED:
+      continue  # still waiting for a date; they were told when it was postponed
+    fixture = f"{match.home_team.name} vs {match.away_team.name} ({match.division.name})"
+    previously = f"Was: {_when(was_at, tz)} at {was_venue.name if was_venue else 'TBD'}"
+    if match.status == Match.Status.SCHEDULED:
+      subject = f"Rescheduled: {fixture}"
+      body = f"{fixture} has been moved.\n\n{previously}\nNow: {_when(match.starts_at, tz)} at {plan.venue_names[match.venue_id]}\n{note}"
+    else:
+      subject = f"Postponed: {fixture}"
+      body = f"{fixture} has been postponed; a new date will follow.\n\n{previously}\n{note}"
+    for channel, recipient in sorted(recipients[match.pk]):
+      yield Notification(
+        organization=organization,
+        kind="match.rescheduled" if match.status == Match.Status.SCHEDULED else "match.postponed",
+        channel=channel,
+        recipient=recipient,
+        subject=subject,
+        body=body,
+        match=match,
+      )
@@ -0,0 +1,136 @@
+"""
+Bulk result entry for one division's round (a match day or a round label).
+
+`round_fixtures` loads the fixtures with their results in one query. `enter_results`
+upserts every score in one statement, flips the matches to FINAL in one UPDATE, and then
+refreshes derived data (team fixture pointers, snapshot queue, audit log) once for the
+batch instead of once per match through the per-row signals. Other derived data can hook
+in through the `results_entered` signal, sent once per batch after commit.
+"""
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.dispatch import Signal
+
+from . import audit
+from .fixtures import refresh_team_match_pointers
+from .models import Match, MatchResult
+from .publisher import mark_stale
+
+# sender=Division, match_ids=[...] of the matches whose results were created or changed,
+# or that were finalized by the batch (their ratings count from now on)
+results_entered = Signal()
+
+ENTERABLE_STATUSES = (Match.Status.SCHEDULED, Match.Status.FINAL)
+RESULT_FIELDS = ("home_score", "away_score", "is_forfeit")
+
+
+@dataclass
+class ResultEntry:
+  match_id: object
+  home_score: int
+  away_score: int
+  is_forfeit: bool = False
+
+
+@dataclass
+class BatchOutcome:
+  created: list = field(default_factory=list)
+  updated: list = field(default_factory=list)
+  unchanged: list = field(default_factory=list)
+
+  @property
+  def changed_match_ids(self):
+    return [*self.created, *self.updated]
+
+
+def round_fixtures(division, *, on=None, round_label=None):
+  """The division's matches on a local date and/or with a round label, results joined in."""
+  if on is None and not round_label:
+    raise ValueError("Pass a date (on=) or a round_label.")
+  qs = Match.objects.filter(division=division)
+  if on is not None:
+    qs = qs.filter(local_date=on)
+  if round_label:
+    qs = qs.filter(round_label=round_label)
+  return list(
+    qs.select_related("division", "home_team", "away_team", "venue", "result")
+    .order_by("starts_at", "home_team__name")
+  )
+
+
+def enter_results(division, entries, *, recorded_by="") -> BatchOutcome:
+  """Validate and save a round of scores for `division` in one batch."""
+  entries = list(entries)
+  by_match = {}
+  errors = {}
+  for entry in entries:
+    key = str(entry.match_id)
+    if key in by_match:
+      errors[key] = "Entered more than once."
+    elif entry.home_score < 0 or entry.away_score < 0:
+      errors[key] = "Scores can't be negative."
+    by_match[key] = entry
+
+  outcome = BatchOutcome()
+  with audit.audit_batch(), transaction.atomic():
+    matches = {
+      str(m.pk): m
+      for m in Match.objects.select_for_update().filter(division=division, pk__in=list(by_match))
+    }
+    for key in by_match:
+      match = matches.get(key)
+      if match is None:
+        errors[key] = "Not a match in this division."
+      elif match.status not in ENTERABLE_STATUSES:
+        errors[key] = f"Match is {match.get_status_display().lower()}."
+    if errors:
+      raise ValidationError(errors)
+
+    existing = {str(r.match_id): r for r in MatchResult.objects.filter(match_id__in=list(matches))}
+    new_rows, changed_rows = [], []
+    for key, entry in by_match.items():
+      values = {"home_score": entry.home_score, "away_score": entry.away_score, "is_forfeit": entry.is_forfeit}
+      result = existing.get(key)
+      # re-entering a provisional forfeit's score confirms it
+      if result is not None and not result.is_provisional and all(getattr(result, f) == values[f] for f in RESULT_FIELDS):
+        outcome.unchanged.append(matches[key].pk)
+        continue
+      if result is None:
+        result = MatchResult(match=matches[key])
+        new_rows.append(result)
+        outcome.created.append(result.match_id)
+      else:
+        changed_rows.append(result)
+        outcome.updated.append(result.match_id)
+      for name, value in values.items():
+        setattr(result, name, value)
+      result.is_provisional = False
+      result.recorded_by = recorded_by or result.recorded_by
+
+    if new_rows or changed_rows:
+      # one upsert; existing rows keep their ids, so the conflict path only updates
+      MatchResult.objects.bulk_create(
+        [*new_rows, *changed_rows],
+        update_conflicts=True,
+        unique_fields=["match"],
+        update_fields=[*RESULT_FIELDS, "is_provisional", "recorded_by", "updated_at"],
+      )
+    audit.record_bulk(new_rows, created=True)
+    audit.record_bulk(changed_rows)
+
+    to_final = [m for m in matches.values() if m.status != Match.Status.FINAL]
+    if to_final:
+      Match.objects.filter(pk__in=[m.pk for m in to_final]).update(status=Match.Status.FINAL)
+      for m in to_final:
+        m.status = Match.Status.FINAL
+      audit.record_bulk(to_final)
+
+    # the status flip is an update(), so no per-match signal rates a newly final match
+    changed = list(dict.fromkeys([*outcome.changed_match_ids, *(m.pk for m in to_final)]))
+    if changed:
+      refresh_team_match_pointers({t for m in matches.values() for t in (m.home_team_id, m.away_team_id)})
+      mark_stale(division.pk)
+      transaction.on_commit(lambda: results_entered.send(sender=type(division), division=division, match_ids=changed))
+  return outcome
@@ -1,12 +1,14 @@
+import uuid
+
 from rest_framework import serializers
-from .models import Match
+from .models import AuditEntry, Match, Player, Team, TeamMember
 
 class MatchResultInlineSerializer(serializers.Serializer):
   home_score = serializers.IntegerField()
   away_score = serializers.IntegerField()
   is_forfeit = serializers.BooleanField()
 
-class MatchPublicSerializer(serializers.Serializer):
+class MatchPublicSerializer(serializers.ModelSerializer):
   home_team_name = serializers.CharField(source="home_team.name", read_only=True)
   away_team_name = serializers.CharField(source="away_team.name", read_only=True)
   venue_name = serializers.CharField(source="venue.name", read_only=True, allow_null=True)
@@ -17,20 +19,109 @@ class MatchPublicSerializer(serializers.Serializer):
 
   class Meta:
     model = Match
-    field = [
+    fields = [
       "id",
       "starts_at",
       "status",
       "round_label",
       "division_name",
       "home_team", "home_team_name",
-      "away_tem", "away_team_name",
+      "away_team", "away_team_name",
       "venue", "venue_name",
       "result"
     ]
 
   def get_result(self, obj):
     r = getattr(obj, "result", None)
-    if not r:
+    # provisional forfeits aren't public until an admin confirms them
+    if not r or r.is_provisional:
+      return None
+    return {"home_score": r.home_score, "away_score": r.away_score, "is_forfeit": r.is_forfeit}
+
+
+class TeamFixturesPublicSerializer(serializers.ModelSerializer):
+  """Team row for division pages, fed by the denormalized fixture pointers."""
+  next_match = MatchPublicSerializer(read_only=True)
+  last_final_match = MatchPublicSerializer(read_only=True)
+  next_opponent_name = serializers.SerializerMethodField()
+
+  class Meta:
+    model = Team
+    fields = ["id", "name", "short_name", "next_match", "next_opponent_name", "last_final_match"]
+
+  def get_next_opponent_name(self, obj):
+    m = obj.next_match
+    if not m:
+      return None
+    return m.away_team.name if m.home_team_id == obj.id else m.home_team.name
+
+class AuditEntrySerializer(serializers.ModelSerializer):
+  actor = serializers.CharField(source="actor.get_username", read_only=True, allow_null=True)
+
+  class Meta:
+    model = AuditEntry
+    fields = ["id", "created_at", "entity_type", "entity_id", "action", "changes", "actor"]
+
+
+class PlayerCareerPublicSerializer(serializers.ModelSerializer):
+  class Meta:
+    model = Player
+    fields = [
+      "id", "display_name", "seasons_count", "teams_count",
+      "appearances_count", "goals_count", "yellow_cards_count", "red_cards_count",
+    ]
+
+
+class PlayerSeasonPublicSerializer(serializers.ModelSerializer):
+  season_id = serializers.UUIDField(source="team_season.season_id", read_only=True)
+  season_name = serializers.CharField(source="team_season.season.name", read_only=True)
+  team_id = serializers.UUIDField(source="team_season.team_id", read_only=True)
+  team_name = serializers.CharField(source="team_season.team.name", read_only=True)
+  division_name = serializers.CharField(source="team_season.team.division.name", read_only=True)
+
+  class Meta:
+    model = TeamMember
+    fields = [
+      "season_id", "season_name", "team_id", "team_name", "division_name", "jersey_number",
+      "appearances_count", "goals_count", "yellow_cards_count", "red_cards_count",
+    ]
+
+
+class ResultEntrySerializer(serializers.Serializer):
+  match = serializers.UUIDField()
+  home_score = serializers.IntegerField(min_value=0)
+  away_score = serializers.IntegerField(min_value=0)
+  is_forfeit = serializers.BooleanField(default=False)
+
+
+class RoundResultsSerializer(serializers.Serializer):
+  results = ResultEntrySerializer(many=True, allow_empty=False)
+
+
+class VenueRescheduleSerializer(serializers.Serializer):
+  start = serializers.DateField()
+  end = serializers.DateField()
+  after = serializers.DateField(required=False, allow_null=True, default=None)
+  horizon_days = serializers.IntegerField(min_value=1, max_value=180, default=28)
+  venues = serializers.ListField(child=serializers.UUIDField(), required=False, allow_null=True, default=None)
+  reason = serializers.CharField(max_length=255, required=False, allow_blank=True, default="")
+  dry_run = serializers.BooleanField(default=False)
+
+
+class DivisionPlanSerializer(serializers.Serializer):
+  previous_season = serializers.UUIDField(required=False, allow_null=True, default=None)
+  promote = serializers.IntegerField(min_value=0, default=2)
+  relegate = serializers.IntegerField(min_value=0, default=2)
+  basis = serializers.ChoiceField(choices=["standings", "ratings"], default="standings")
+  sizes = serializers.DictField(child=serializers.IntegerField(min_value=0), required=False, allow_null=True, default=None)
+  exclude = serializers.ListField(child=serializers.UUIDField(), required=False, default=list)
+  separate_clubs = serializers.BooleanField(default=True)
+  dry_run = serializers.BooleanField(default=False)
+
+  def validate_sizes(self, value):
+    if not value:
       return None
-    return {"home_score": r.home_score, "away_score": r.away_score, "is_forfeit": r.is_forfeit}
\ No newline at end of file
+    try:
+      return {uuid.UUID(key): size for key, size in value.items()}
+    except ValueError:
+      raise serializers.ValidationError("Keys must be division ids.")
@@ -0,0 +1,204 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from core.models import Membership, Organization
+
+from . import audit, players, ratings, whatif
+from .calendars import refresh_local_dates
+from .fixtures import refresh_team_match_pointers
+from .models import Appearance, CardEvent, GoalEvent, Match, MatchResult, Team, TeamMember
+from .publisher import mark_stale
+from .results import results_entered
+from .permissions import invalidate_grants
+
+
+# ---------- Team fixture pointers ----------
+
+@receiver(post_init, sender=Match)
+def remember_match_teams(sender, instance, **kwargs):
+  # keep the teams as loaded so a team swap also refreshes the team that was removed
+  # read __dict__ so a deferred-field load (`.only()`) doesn't recurse into refresh_from_db
+  instance._loaded_team_ids = (instance.__dict__.get("home_team_id"), instance.__dict__.get("away_team_id"))
+
+
+@receiver(post_save, sender=Match)
+def refresh_pointers_on_match_save(sender, instance, **kwargs):
+  team_ids = {instance.home_team_id, instance.away_team_id, *getattr(instance, "_loaded_team_ids", ())}
+  refresh_team_match_pointers(team_ids)
+  instance._loaded_team_ids = (instance.home_team_id, instance.away_team_id)
+
+
+@receiver(post_delete, sender=Match)
+def refresh_pointers_on_match_delete(sender, instance, **kwargs):
+  refresh_team_match_pointers({instance.home_team_id, instance.away_team_id})
+
+
+# ---------- Organization-local match dates ----------
+
+@receiver(post_init, sender=Organization)
+def remember_org_timezone(sender, instance, **kwargs):
+  instance._loaded_timezone = instance.__dict__.get("timezone")
+
+
+@receiver(post_save, sender=Organization)
+def refresh_local_dates_on_timezone_change(sender, instance, created, **kwargs):
+  if not created and instance._loaded_timezone not in (None, instance.timezone):
+    refresh_local_dates(instance)
+  instance._loaded_timezone = instance.timezone
+
+
+# ---------- Permission grant cache ----------
+
+@receiver(post_init, sender=TeamMember)
+def remember_member_user(sender, instance, **kwargs):
+  instance._loaded_user_id = instance.__dict__.get("user_id")
+  instance._loaded_player_id = instance.__dict__.get("player_id")
+
+
+@receiver(post_save, sender=TeamMember)
+@receiver(post_delete, sender=TeamMember)
+def invalidate_grants_on_member_change(sender, instance, **kwargs):
+  invalidate_grants(instance.user_id, getattr(instance, "_loaded_user_id", None))
+  instance._loaded_user_id = instance.user_id
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def invalidate_grants_on_membership_change(sender, instance, **kwargs):
+  invalidate_grants(instance.user_id)
+
+
+# ---------- Public snapshots ----------
+
+@receiver(post_save, sender=Match)
+@receiver(post_delete, sender=Match)
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def mark_division_snapshot_stale(sender, instance, **kwargs):
+  mark_stale(instance.division_id)
+
+
+@receiver(post_save, sender=MatchResult)
+@receiver(post_delete, sender=MatchResult)
+def mark_result_snapshot_stale(sender, instance, **kwargs):
+  mark_stale(Match.objects.filter(pk=instance.match_id).values_list("division_id", flat=True).first())
+
+
+# ---------- What-if outlook cache ----------
+
+@receiver(post_save, sender=Match)
+@receiver(post_delete, sender=Match)
+def invalidate_outlook_on_match_change(sender, instance, **kwargs):
+  whatif.invalidate(instance.division_id)
+
+
+@receiver(post_save, sender=MatchResult)
+@receiver(post_delete, sender=MatchResult)
+def invalidate_outlook_on_result_change(sender, instance, **kwargs):
+  whatif.invalidate(Match.objects.filter(pk=instance.match_id).values_list("division_id", flat=True).first())
+
+
+@receiver(results_entered)
+def invalidate_outlook_on_round_results(sender, division, **kwargs):
+  whatif.invalidate(division.pk)
+
+
+# ---------- Team ratings ----------
+
+@receiver(post_init, sender=Match)
+def remember_match_rating_inputs(sender, instance, **kwargs):
+  instance._loaded_rating_inputs = (instance.__dict__.get("status"), instance.__dict__.get("starts_at"))
+
+
+@receiver(post_save, sender=Match)
+def rerate_on_match_change(sender, instance, created, **kwargs):
+  # only a status change or a moved kick-off can change what (or in which order) is rated
+  current = (instance.status, instance.starts_at)
+  if not created and instance._loaded_rating_inputs != current:
+    transaction.on_commit(lambda: ratings.results_changed([instance.pk]))
+  instance._loaded_rating_inputs = current
+
+
+@receiver(post_delete, sender=Match)
+def rerate_on_match_delete(sender, instance, **kwargs):
+  if instance.status == Match.Status.FINAL:
+    point = (instance.starts_at, instance.pk)
+    transaction.on_commit(lambda: ratings.request_replay(instance.organization_id, point))
+
+
+@receiver(post_save, sender=MatchResult)
+@receiver(post_delete, sender=MatchResult)
+def rerate_on_result_change(sender, instance, **kwargs):
+  # results_changed skips results whose rated score is unchanged
+  transaction.on_commit(lambda: ratings.results_changed([instance.match_id]))
+
+
+@receiver(results_entered)
+def rerate_on_round_results(sender, match_ids, **kwargs):
+  transaction.on_commit(lambda: ratings.results_changed(match_ids))
+
+
+# ---------- Audit log ----------
+
+def _audit_snapshot(sender, instance, **kwargs):
+  audit.snapshot(instance)
+
+
+def _audit_save(sender, instance, created, **kwargs):
+  audit.record_save(instance, created)
+
+
+def _audit_delete(sender, instance, **kwargs):
+  audit.record_delete(instance)
+
+
+for _model in audit.AUDITED_FIELDS:
+  post_init.connect(_audit_snapshot, sender=_model, dispatch_uid=f"audit_snapshot_{_model.__name__}")
+  post_save.connect(_audit_save, sender=_model, dispatch_uid=f"audit_save_{_model.__name__}")
+  post_delete.connect(_audit_delete, sender=_model, dispatch_uid=f"audit_delete_{_model.__name__}")
+
+
+# ---------- Player careers ----------
+
+@receiver(post_save, sender=TeamMember)
+def link_member_to_player(sender, instance, **kwargs):
+  loaded = getattr(instance, "_loaded_player_id", None)
+  if instance.player_id is None:
+    players.link_members([instance])
+  elif instance.player_id != loaded:
+    # relinked by hand (e.g. merging duplicates in the admin)
+    players.refresh_players({instance.player_id, loaded})
+  instance._loaded_player_id = instance.player_id
+
+
+@receiver(post_delete, sender=TeamMember)
+def refresh_player_on_member_delete(sender, instance, **kwargs):
+  players.refresh_players({instance.player_id})
+
+
+@receiver(post_init, sender=Appearance)
+@receiver(post_init, sender=GoalEvent)
+@receiver(post_init, sender=CardEvent)
+def remember_event_stat(sender, instance, **kwargs):
+  instance._loaded_stat = players.event_stat(instance)
+
+
+@receiver(post_save, sender=Appearance)
+@receiver(post_save, sender=GoalEvent)
+@receiver(post_save, sender=CardEvent)
+def count_event_stat(sender, instance, created, **kwargs):
+  current = players.event_stat(instance)
+  if created:
+    players.bump(*current, 1)
+  elif instance._loaded_stat[0] is not None and instance._loaded_stat != current:
+    players.bump(*instance._loaded_stat, -1)
+    players.bump(*current, 1)
+  instance._loaded_stat = current
+
+
+@receiver(post_delete, sender=Appearance)
+@receiver(post_delete, sender=GoalEvent)
+@receiver(post_delete, sender=CardEvent)
+def uncount_event_stat(sender, instance, **kwargs):
+  players.bump(*players.event_stat(instance), -1)
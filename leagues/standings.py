@@ -0,0 +1,65 @@
+from dataclasses import asdict, dataclass
+
+from .models import Match, MatchResult, Team
+
+POINTS_WIN = 3
+POINTS_DRAW = 1
+
+
+@dataclass
+class StandingRow:
+  team_id: object
+  team_name: str
+  played: int = 0
+  won: int = 0
+  drawn: int = 0
+  lost: int = 0
+  goals_for: int = 0
+  goals_against: int = 0
+  points: int = 0
+
+  @property
+  def goal_difference(self) -> int:
+    return self.goals_for - self.goals_against
+
+  def as_dict(self) -> dict:
+    return {**asdict(self), "goal_difference": self.goal_difference}
+
+
+def compute_standings(teams, results) -> list:
+  """
+  Table from `teams` [(id, name)] and `results` [(home_id, away_id, home_score, away_score)],
+  ordered by points, goal difference, goals for, then name.
+  """
+  rows = {team_id: StandingRow(team_id, name) for team_id, name in teams}
+  for home_id, away_id, home_score, away_score in results:
+    home, away = rows.get(home_id), rows.get(away_id)
+    if home is None or away is None:
+      continue
+    for row, scored, conceded in ((home, home_score, away_score), (away, away_score, home_score)):
+      row.played += 1
+      row.goals_for += scored
+      row.goals_against += conceded
+      if scored > conceded:
+        row.won += 1
+        row.points += POINTS_WIN
+      elif scored == conceded:
+        row.drawn += 1
+        row.points += POINTS_DRAW
+      else:
+        row.lost += 1
+  return sorted(rows.values(), key=lambda r: (-r.points, -r.goal_difference, -r.goals_for, r.team_name))
+
+
+def division_results(division_id):
+  return list(
+    MatchResult.objects
+    .filter(match__division_id=division_id, match__status=Match.Status.FINAL)
+    .values_list("match__home_team_id", "match__away_team_id", "home_score", "away_score")
+  )
+
+
+def division_standings(division_id) -> list:
+  """Standings for one division in two queries."""
+  teams = Team.objects.filter(division_id=division_id, is_active=True).values_list("id", "name")
+  return compute_standings(teams, division_results(division_id))
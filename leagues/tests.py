@@ -1,3 +1,86 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Membership, Organization
+from leaguehub.db_routers import REPLICA_ALIAS, replica_configured, replica_reads
+
+from . import results
+from .models import Division, Match, MatchResult, RatingHistory, Season, Team
+
+
+@skipUnless(replica_configured(), "needs the replica alias that leaguehub.test_runner.ReplicaTestRunner adds")
+class ReplicaRoutingTests(TransactionTestCase):
+  """
+  Only anonymous reads of public views go to the replica. Under TEST MIRROR the replica alias
+  is a second connection to the test database, so the data has to be committed for it to
+  see: hence TransactionTestCase.
+  """
+  databases = "__all__"
+
+  def setUp(self):
+    org = Organization.objects.create(name="Replica FC", slug="replica-fc")
+    self.season = Season.objects.create(organization=org, name="2026")
+    self.division = Division.objects.create(season=self.season, name="Premier")
+    Team.objects.create(division=self.division, name="Rovers")
+    self.staff = get_user_model().objects.create_user("staff", "staff@example.com", "pw")
+    Membership.objects.create(organization=org, user=self.staff, role=Membership.Role.LEAGUE_ADMIN)
+
+  def replica_queries(self, url):
+    with CaptureQueriesContext(connections[REPLICA_ALIAS]) as replica:
+      response = self.client.get(url)
+    self.assertEqual(response.status_code, 200)
+    return len(replica.captured_queries)
+
+  def test_anonymous_public_read_uses_replica(self):
+    self.assertGreater(self.replica_queries(reverse("public-division-teams", args=[self.division.pk])), 0)
+
+  def test_signed_in_public_read_stays_on_primary(self):
+    self.client.force_login(self.staff)
+    self.assertEqual(self.replica_queries(reverse("public-division-teams", args=[self.division.pk])), 0)
+
+  def test_staff_endpoint_stays_on_primary(self):
+    self.client.force_login(self.staff)
+    self.assertEqual(self.replica_queries(reverse("season-travel-report", args=[self.season.pk])), 0)
+
+  def test_reads_after_a_write_use_primary(self):
+    with CaptureQueriesContext(connections[REPLICA_ALIAS]) as replica, replica_reads():
+      list(Team.objects.filter(division=self.division))
+      before = len(replica.captured_queries)
+      Team.objects.create(division=self.division, name="Athletic")
+      names = set(Team.objects.filter(division=self.division).values_list("name", flat=True))
+    self.assertEqual(before, 1)
+    self.assertEqual(len(replica.captured_queries), before)
+    self.assertEqual(names, {"Rovers", "Athletic"})
+
+
+class RoundResultsTests(TestCase):
+  @classmethod
+  def setUpTestData(cls):
+    org = Organization.objects.create(name="Results FC", slug="results-fc")
+    season = Season.objects.create(organization=org, name="2026", is_active=True)
+    cls.division = Division.objects.create(season=season, name="Premier")
+    home = Team.objects.create(division=cls.division, name="Rovers")
+    away = Team.objects.create(division=cls.division, name="United")
+    cls.match = Match.objects.create(
+      season=season, division=cls.division, home_team=home, away_team=away,
+      starts_at=timezone.now() - timedelta(hours=2),
+    )
+
+  def test_finalizing_an_unchanged_result_rates_the_match(self):
+    # a score recorded before the match was finalized, then re-entered as-is
+    MatchResult.objects.create(match=self.match, home_score=2, away_score=1)
+    self.assertFalse(RatingHistory.objects.filter(match=self.match).exists())
+
+    with self.captureOnCommitCallbacks(execute=True):
+      outcome = results.enter_results(self.division, [results.ResultEntry(self.match.pk, 2, 1)])
+
+    self.assertEqual(outcome.unchanged, [self.match.pk])
+    self.assertEqual(Match.objects.get(pk=self.match.pk).status, Match.Status.FINAL)
+    self.assertEqual(RatingHistory.objects.filter(match=self.match).count(), 2)
@@ -0,0 +1,207 @@
+"""
+Turnout forecasts and no-show analytics from MatchAttendance replies.
+
+A team's history is every final match with Appearances recorded, for the team and for its
+previous_team last season. Replies are matched to appearances by normalized name, giving
+per team:
+
+- the share of GOING replies and of MAYBE replies that actually played (1 - no-show rate);
+- walk-ins: players per match who played without replying GOING or MAYBE.
+
+Rates are smoothed towards the season-wide rates, so a team with little history starts from
+the league's. `forecast_season` applies them to the current replies of every upcoming match
+and stores a MatchTurnoutForecast per team: expected players and the probability of fewer
+than the division's DivisionRules.min_players (GOING and MAYBE as binomials, walk-ins as
+Poisson). A whole season is one
+pass of five reads and one upsert, meant for a periodic job (`leagues.forecast_turnout`).
+"""
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.db.models import Count, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Appearance, DivisionRules, Match, MatchAttendance, MatchTurnoutForecast, Season, Team
+from .players import normalize_name
+
+# forecasts at least this likely to fall short are flagged at_risk
+RISK_THRESHOLD = 0.5
+# pseudo-counts pulling a team's rates towards the season-wide ones
+PRIOR_REPLIES = 10
+PRIOR_MATCHES = 3
+# season-wide rates to start from when nobody has any history yet
+FALLBACK_RATES = (0.9, 0.5, 0.5)
+
+
+@dataclass
+class TurnoutHistory:
+  matches: int = 0
+  going: int = 0
+  going_played: int = 0
+  maybe: int = 0
+  maybe_played: int = 0
+  walk_ins: int = 0
+
+  def add(self, other) -> None:
+    for name in ("matches", "going", "going_played", "maybe", "maybe_played", "walk_ins"):
+      setattr(self, name, getattr(self, name) + getattr(other, name))
+
+  def raw_rates(self):
+    if not self.matches:
+      return FALLBACK_RATES
+    going, maybe, walk_ins = FALLBACK_RATES
+    return (
+      self.going_played / self.going if self.going else going,
+      self.maybe_played / self.maybe if self.maybe else maybe,
+      self.walk_ins / self.matches,
+    )
+
+  def rates(self, prior):
+    """(GOING show rate, MAYBE show rate, walk-ins per match), smoothed towards `prior`."""
+    return (
+      (self.going_played + PRIOR_REPLIES * prior[0]) / (self.going + PRIOR_REPLIES),
+      (self.maybe_played + PRIOR_REPLIES * prior[1]) / (self.maybe + PRIOR_REPLIES),
+      (self.walk_ins + PRIOR_MATCHES * prior[2]) / (self.matches + PRIOR_MATCHES),
+    )
+
+
+def _binomial(n, p, cap):
+  return [math.comb(n, i) * p ** i * (1 - p) ** (n - i) for i in range(min(n, cap - 1) + 1)]
+
+
+def _poisson(rate, cap):
+  return [math.exp(-rate) * rate ** i / math.factorial(i) for i in range(cap)]
+
+
+def shortfall_probability(going, maybe, going_rate, maybe_rate, walk_ins, minimum) -> float:
+  """P(fewer than `minimum` play) with GOING, MAYBE ~ binomial and walk-ins ~ Poisson."""
+  if minimum <= 0:
+    return 0.0
+  # only totals below `minimum` matter, so every distribution is truncated there
+  below = [1.0] + [0.0] * (minimum - 1)
+  for pmf in (_binomial(going, going_rate, minimum), _binomial(maybe, maybe_rate, minimum), _poisson(walk_ins, minimum)):
+    below = [sum(below[t - i] * pmf[i] for i in range(min(t, len(pmf) - 1) + 1)) for t in range(minimum)]
+  return min(1.0, sum(below))
+
+
+# ---------- history ----------
+
+def team_histories(owners) -> dict:
+  """
+  TurnoutHistory per owning team, from the final matches of the teams in `owners`
+  ({team id: team id whose history it counts towards}).
+  """
+  played = defaultdict(list)
+  for match_id, team_id, name in (
+    Appearance.objects
+    .filter(team_id__in=list(owners), match__status=Match.Status.FINAL)
+    .values_list("match_id", "team_id", "player__full_name")
+  ):
+    played[(match_id, team_id)].append(normalize_name(name))
+  replies = defaultdict(dict)
+  for match_id, team_id, name, status in (
+    MatchAttendance.objects
+    .filter(team_id__in=list(owners), match__status=Match.Status.FINAL)
+    .values_list("match_id", "team_id", "participant_name", "status")
+  ):
+    replies[(match_id, team_id)][normalize_name(name)] = status
+
+  histories = defaultdict(TurnoutHistory)
+  # without Appearances we can't tell who turned up, so only those matches count
+  for key, names in played.items():
+    history = histories[owners[key[1]]]
+    answered = replies.get(key, {})
+    showed = set(names)
+    history.matches += 1
+    for name, status in answered.items():
+      if status == MatchAttendance.Status.GOING:
+        history.going += 1
+        history.going_played += name in showed
+      elif status == MatchAttendance.Status.MAYBE:
+        history.maybe += 1
+        history.maybe_played += name in showed
+    history.walk_ins += sum(
+      1 for name in names if not name or answered.get(name) not in (MatchAttendance.Status.GOING, MatchAttendance.Status.MAYBE)
+    )
+  return histories
+
+
+# ---------- forecasts ----------
+
+def forecast_season(season, *, now=None) -> list:
+  """Recompute the turnout forecasts of every upcoming match in `season`. Returns them."""
+  now = now or timezone.now()
+  teams = list(Team.objects.filter(division__season=season).values_list("pk", "previous_team_id"))
+  owners = {pk: pk for pk, _ in teams}
+  owners.update({previous: pk for pk, previous in teams if previous})
+  histories = team_histories(owners)
+  overall = TurnoutHistory()
+  for history in histories.values():
+    overall.add(history)
+  prior = overall.raw_rates()
+
+  upcoming = Match.objects.filter(season=season, status=Match.Status.SCHEDULED, starts_at__gt=now)
+  default_minimum = DivisionRules._meta.get_field("min_players").default
+  matches = list(
+    upcoming
+    .annotate(minimum=Coalesce("division__rules__min_players", Value(default_minimum)))
+    .values_list("pk", "minimum", "home_team_id", "away_team_id")
+  )
+  counts = defaultdict(lambda: defaultdict(int))
+  for match_id, team_id, status, n in (
+    MatchAttendance.objects
+    .filter(match__in=upcoming)
+    .values("match_id", "team_id", "status")
+    .annotate(n=Count("pk"))
+    .values_list("match_id", "team_id", "status", "n")
+  ):
+    counts[(match_id, team_id)][status] = n
+
+  forecasts = []
+  for match_id, minimum, *team_ids in matches:
+    for team_id in team_ids:
+      history = histories.get(team_id, TurnoutHistory())
+      going_rate, maybe_rate, walk_ins = history.rates(prior)
+      replies = counts[(match_id, team_id)]
+      going, maybe = replies[MatchAttendance.Status.GOING], replies[MatchAttendance.Status.MAYBE]
+      shortfall = shortfall_probability(going, maybe, going_rate, maybe_rate, walk_ins, minimum)
+      forecasts.append(MatchTurnoutForecast(
+        match_id=match_id,
+        team_id=team_id,
+        organization_id=season.organization_id,
+        going=going,
+        maybe=maybe,
+        out=replies[MatchAttendance.Status.OUT],
+        going_show_rate=going_rate,
+        maybe_show_rate=maybe_rate,
+        walk_ins=walk_ins,
+        history_matches=history.matches,
+        expected_players=going * going_rate + maybe * maybe_rate + walk_ins,
+        min_players=minimum,
+        shortfall_probability=shortfall,
+        at_risk=shortfall >= RISK_THRESHOLD,
+        computed_at=now,
+      ))
+
+  with transaction.atomic():
+    MatchTurnoutForecast.objects.filter(match__season=season).exclude(match__in=upcoming).delete()
+    MatchTurnoutForecast.objects.bulk_create(
+      forecasts,
+      batch_size=500,
+      update_conflicts=True,
+      unique_fields=["match", "team"],
+      update_fields=[
+        "going", "maybe", "out", "going_show_rate", "maybe_show_rate", "walk_ins", "history_matches",
+        "expected_players", "min_players", "shortfall_probability", "at_risk", "computed_at",
+      ],
+    )
+  return forecasts
+
+
+def forecast_active_seasons(*, now=None) -> int:
+  """Forecasts for every active, unarchived season. Returns the number written."""
+  seasons = Season.objects.filter(is_active=True, archived_at__isnull=True)
+  return sum(len(forecast_season(season, now=now)) for season in seasons)
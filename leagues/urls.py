@@ -0,0 +1,18 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+  path("public/divisions/<uuid:division_id>/teams/", views.DivisionTeamsPublicView.as_view(), name="public-division-teams"),
+  path("public/divisions/<uuid:division_id>/outlook/", views.DivisionOutlookPublicView.as_view(), name="public-division-outlook"),
+  path("public/orgs/<slug:org_slug>/calendar/", views.OrgCalendarPublicView.as_view(), name="public-org-calendar"),
+  path("orgs/<slug:org_slug>/capacity/", views.OrgCapacityView.as_view(), name="org-capacity"),
+  path("public/orgs/<slug:org_slug>/venues/near/", views.VenuesNearPublicView.as_view(), name="public-venues-near"),
+  path("seasons/<uuid:season_id>/division-plan/", views.SeasonDivisionPlanView.as_view(), name="season-division-plan"),
+  path("seasons/<uuid:season_id>/travel/", views.SeasonTravelReportView.as_view(), name="season-travel-report"),
+  path("team-seasons/<uuid:team_season_id>/turnout/", views.TeamTurnoutView.as_view(), name="team-turnout"),
+  path("matches/<uuid:match_id>/history/", views.MatchHistoryView.as_view(), name="match-history"),
+  path("public/players/<uuid:player_id>/career/", views.PlayerCareerPublicView.as_view(), name="public-player-career"),
+  path("divisions/<uuid:division_id>/results/", views.DivisionRoundResultsView.as_view(), name="division-round-results"),
+  path("venues/<uuid:venue_id>/reschedule/", views.VenueRescheduleView.as_view(), name="venue-reschedule"),
+]
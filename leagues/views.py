@@ -1,9 +1,422 @@
-from django.shortcuts import get_list_or_404
+import uuid
+from datetime import date
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.shortcuts import get_list_or_404, get_object_or_404
 from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from core.models import Organization
-from .models import Match, Season
-from .serializers import MatchPublicSerializer
\ No newline at end of file
+from . import balancing, calendars, capacity, fixtures, geo, reschedule, results, whatif
+from .models import AuditEntry, Division, Match, MatchTurnoutForecast, Season, Team, TeamMember, TeamSeason, Venue
+from .permissions import IsCaptainOrOrgStaff, IsOrgStaff
+from .serializers import (
+  AuditEntrySerializer, DivisionPlanSerializer, MatchPublicSerializer, PlayerCareerPublicSerializer, PlayerSeasonPublicSerializer,
+  RoundResultsSerializer, TeamFixturesPublicSerializer, VenueRescheduleSerializer,
+)
+
+
+def _pointer_related(prefix):
+  return [f"{prefix}__home_team", f"{prefix}__away_team", f"{prefix}__venue", f"{prefix}__division"]
+
+
+class DivisionTeamsPublicView(APIView):
+  """
+  Every team in a division with its next fixture and last result, in one query (plus one
+  more when a stored next fixture has already kicked off).
+  """
+  permission_classes = [AllowAny]
+  replica_reads = True
+
+  def get(self, request, division_id):
+    teams = get_list_or_404(
+      Team.objects
+      .filter(division_id=division_id, is_active=True)
+      .select_related(
+        *_pointer_related("next_match"),
+        *_pointer_related("last_final_match"),
+        "next_match__result",
+        "last_final_match__result",
+      )
+      .order_by("name")
+    )
+    fixtures.resolve_next_matches(teams, related=["home_team", "away_team", "venue", "division", "result"])
+    return Response(TeamFixturesPublicSerializer(teams, many=True).data)
+
+
+class DivisionOutlookPublicView(APIView):
+  """
+  Who can still win the division, who has clinched, magic numbers and simulated finishing
+  odds. `?playoff_spots=4` adds the playoff questions; `?simulations=` sets the Monte Carlo
+  runs (0 to skip). Cached until the division's next result.
+  """
+  permission_classes = [AllowAny]
+  replica_reads = True
+  max_simulations = 20000
+
+  def get(self, request, division_id):
+    get_object_or_404(Division, pk=division_id)
+    try:
+      spots = int(request.query_params.get("playoff_spots", 0)) or None
+      simulations = int(request.query_params.get("simulations", whatif.DEFAULT_SIMULATIONS))
+    except ValueError:
+      raise ValidationError({"detail": "playoff_spots and simulations must be integers."})
+    if spots is not None and spots < 1:
+      raise ValidationError({"playoff_spots": "Must be at least 1."})
+    if not 0 <= simulations <= self.max_simulations:
+      raise ValidationError({"simulations": f"Must be between 0 and {self.max_simulations}."})
+    return Response({"division": division_id, **whatif.outlook(division_id, playoff_spots=spots, simulations=simulations)})
+
+
+class OrgCalendarPublicView(APIView):
+  """
+  Day/week/month calendar for an organization, optionally narrowed to a season, venue or team.
+  Days are bucketed on the precomputed Match.local_date, so no per-row timezone math happens here.
+  """
+  permission_classes = [AllowAny]
+  replica_reads = True
+
+  def get(self, request, org_slug):
+    org = get_object_or_404(Organization, slug=org_slug, is_active=True)
+
+    view = request.query_params.get("view", "week")
+    if view not in calendars.VIEWS:
+      raise ValidationError({"view": f"Must be one of {', '.join(calendars.VIEWS)}."})
+    try:
+      anchor = date.fromisoformat(request.query_params["date"]) if "date" in request.query_params \
+        else timezone.localdate(timezone=org.tzinfo)
+    except ValueError:
+      raise ValidationError({"date": "Use YYYY-MM-DD."})
+
+    ids = {}
+    for param in ("season", "venue", "team"):
+      if request.query_params.get(param):
+        try:
+          ids[f"{param}_id"] = uuid.UUID(request.query_params[param])
+        except ValueError:
+          raise ValidationError({param: f"Must be a {param} id."})
+
+    start, end = calendars.date_window(view, anchor)
+    qs = calendars.calendar_queryset(org, start, end, **ids)
+
+    payload = {"organization": org.slug, "timezone": org.timezone, "view": view, "start": start, "end": end}
+
+    # month views over many teams can ask for counts only
+    if request.query_params.get("counts_only") in ("1", "true"):
+      counts = calendars.day_counts(qs)
+      payload["days"] = [{"date": d, "match_count": n} for d, n in sorted(counts.items())]
+      return Response(payload)
+
+    matches = (
+      qs.select_related("home_team", "away_team", "venue", "division", "result")
+      .order_by("local_date", "starts_at")
+    )
+    payload["days"] = [
+      {"date": d, "match_count": len(ms), "matches": MatchPublicSerializer(ms, many=True).data}
+      for d, ms in calendars.group_by_day(matches)
+    ]
+    return Response(payload)
+
+
+class OrgCapacityView(APIView):
+  """
+  Venue utilization, over-bookings and free slots for an organization between two local dates.
+  `?need=40` also returns the earliest placements for that many extra matches.
+  """
+  permission_classes = [IsOrgStaff]
+
+  def get(self, request, org_slug):
+    org = get_object_or_404(Organization, slug=org_slug)
+    try:
+      start = date.fromisoformat(request.query_params["start"])
+      end = date.fromisoformat(request.query_params["end"])
+      need = int(request.query_params.get("need", 0))
+    except (KeyError, ValueError):
+      raise ValidationError({"detail": "start and end (YYYY-MM-DD) are required; need must be an integer."})
+    if end < start:
+      raise ValidationError({"end": "Must not be before start."})
+
+    plan = capacity.plan_capacity(org, start, end)
+    payload = {
+      "start": start,
+      "end": end,
+      "utilization": round(plan.utilization, 4),
+      "free_capacity": plan.free_capacity,
+      "venues": [
+        {
+          "venue": u.venue_id,
+          "name": u.name,
+          "available_minutes": u.available_minutes,
+          "booked_minutes": u.booked_minutes,
+          "utilization": round(u.utilization, 4),
+        }
+        for u in plan.usage.values()
+      ],
+      "overbookings": [
+        {"venue": o.venue_id, "starts_at": o.starts_at, "ends_at": o.ends_at, "booked": o.booked, "capacity": o.capacity}
+        for o in plan.overbookings
+      ],
+    }
+    if need:
+      placements = plan.slots_for(need)
+      payload["can_fit"] = len(placements) == need
+      payload["placements"] = [{"venue": v, "starts_at": t} for v, t in placements]
+    return Response(payload)
+
+
+class VenuesNearPublicView(APIView):
+  """Active venues of an organization near a point, nearest first: ?lat=&lng=&radius_km=&limit="""
+  permission_classes = [AllowAny]
+  replica_reads = True
+
+  def get(self, request, org_slug):
+    org = get_object_or_404(Organization, slug=org_slug, is_active=True)
+    try:
+      lat = float(request.query_params["lat"])
+      lng = float(request.query_params["lng"])
+      radius_km = float(request.query_params.get("radius_km", 25))
+      limit = min(int(request.query_params.get("limit", 20)), 100)
+    except (KeyError, ValueError):
+      raise ValidationError({"detail": "lat and lng are required numbers; radius_km and limit must be numbers."})
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180) or radius_km <= 0:
+      raise ValidationError({"detail": "Coordinates out of range or non-positive radius."})
+    if limit < 1:
+      raise ValidationError({"limit": "Must be at least 1."})
+
+    venues = geo.venues_near(org, lat, lng, radius_km)[:limit]
+    return Response([
+      {"id": v.id, "name": v.name, "address": v.address, "lat": v.lat, "lng": v.lng, "distance_km": round(v.distance_km, 3)}
+      for v in venues
+    ])
+
+
+class SeasonTravelReportView(APIView):
+  """Average travel distance per team for a season, for checking scheduling fairness."""
+  permission_classes = [IsOrgStaff]
+
+  def get(self, request, season_id):
+    season = get_object_or_404(Season, pk=season_id)
+    self.check_object_permissions(request, season)
+    return Response(geo.team_travel_report(season))
+
+
+class MatchHistoryView(APIView):
+  """Change history of a match: status, result and event edits, oldest first."""
+  permission_classes = [IsOrgStaff]
+
+  def get(self, request, match_id):
+    match = get_object_or_404(Match, pk=match_id)
+    self.check_object_permissions(request, match)
+    entries = AuditEntry.objects.filter(match_id=match.pk).select_related("actor").order_by("created_at")
+    return Response(AuditEntrySerializer(entries, many=True).data)
+
+
+class PlayerCareerPublicView(APIView):
+  """Career totals and per-season lines for a player, in one query over their memberships."""
+  permission_classes = [AllowAny]
+  replica_reads = True
+
+  def get(self, request, player_id):
+    memberships = get_list_or_404(
+      TeamMember.objects
+      .filter(player_id=player_id)
+      .select_related("player", "team_season__season", "team_season__team__division")
+      .order_by("team_season__season__start_date", "joined_at")
+    )
+    return Response({
+      **PlayerCareerPublicSerializer(memberships[0].player).data,
+      "seasons": PlayerSeasonPublicSerializer(memberships, many=True).data,
+    })
+
+
+class DivisionRoundResultsView(APIView):
+  """
+  Result entry for a whole round: GET ?date=YYYY-MM-DD and/or ?round=<label> lists the
+  fixtures with any results; POST {"results": [...]} saves every score in one batch.
+  """
+  permission_classes = [IsOrgStaff]
+
+  def _division(self, request, division_id):
+    division = get_object_or_404(Division.objects.select_related("season"), pk=division_id)
+    self.check_object_permissions(request, division)
+    return division
+
+  def get(self, request, division_id):
+    division = self._division(request, division_id)
+    try:
+      on = date.fromisoformat(request.query_params["date"]) if "date" in request.query_params else None
+    except ValueError:
+      raise ValidationError({"date": "Use YYYY-MM-DD."})
+    round_label = request.query_params.get("round", "")
+    if on is None and not round_label:
+      raise ValidationError({"detail": "Pass date and/or round."})
+
+    matches = results.round_fixtures(division, on=on, round_label=round_label)
+    return Response({
+      "division": division.pk,
+      "date": on,
+      "round": round_label,
+      "fixtures": MatchPublicSerializer(matches, many=True).data,
+    })
+
+  def post(self, request, division_id):
+    division = self._division(request, division_id)
+    serializer = RoundResultsSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    entries = [
+      results.ResultEntry(r["match"], r["home_score"], r["away_score"], r["is_forfeit"])
+      for r in serializer.validated_data["results"]
+    ]
+    try:
+      outcome = results.enter_results(division, entries, recorded_by=request.user.get_username())
+    except DjangoValidationError as exc:
+      raise ValidationError(exc.message_dict)
+    return Response({
+      "created": len(outcome.created),
+      "updated": len(outcome.updated),
+      "unchanged": len(outcome.unchanged),
+    })
+
+
+class VenueRescheduleView(APIView):
+  """
+  Move every match booked at a closed venue between two local dates into the next free
+  slots, and notify the teams. POST {"start", "end", "after"?, "horizon_days"?, "venues"?,
+  "reason"?, "dry_run"?}; a dry run returns the proposed moves without saving them.
+  """
+  permission_classes = [IsOrgStaff]
+
+  def post(self, request, venue_id):
+    venue = get_object_or_404(Venue.objects.select_related("organization"), pk=venue_id)
+    self.check_object_permissions(request, venue)
+    serializer = VenueRescheduleSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    try:
+      plan = reschedule.reschedule_venue(
+        venue,
+        data["start"],
+        data["end"],
+        after=data["after"],
+        horizon_days=data["horizon_days"],
+        venues=data["venues"],
+        reason=data["reason"],
+        dry_run=data["dry_run"],
+      )
+    except DjangoValidationError as exc:
+      raise ValidationError(exc.message_dict)
+    return Response({
+      "dry_run": data["dry_run"],
+      "moves": [
+        {
+          "match": m.match.pk,
+          "venue": m.venue_id,
+          "venue_name": plan.venue_names.get(m.venue_id),
+          "starts_at": m.starts_at,
+        }
+        for m in plan.moves
+      ],
+      "postponed": [m.pk for m in plan.unplaced],
+      "notifications": plan.notifications,
+    })
+
+
+class SeasonDivisionPlanView(APIView):
+  """
+  Set up a new season's divisions from the previous season: promotion/relegation from the
+  final tables (or seeding by rating), parallel divisions balanced, clubs kept apart. POST
+  {"previous_season"?, "promote"?, "relegate"?, "basis"?, "sizes"?: {division id: teams},
+  "exclude"?, "separate_clubs"?, "dry_run"?}; a dry run returns the proposal without creating teams.
+  """
+  permission_classes = [IsOrgStaff]
+
+  def post(self, request, season_id):
+    season = get_object_or_404(Season, pk=season_id)
+    self.check_object_permissions(request, season)
+    serializer = DivisionPlanSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    previous = None
+    if data["previous_season"]:
+      previous = get_object_or_404(Season, pk=data["previous_season"], organization_id=season.organization_id)
+    try:
+      proposal = balancing.propose(
+        season,
+        previous,
+        promote=data["promote"],
+        relegate=data["relegate"],
+        basis=data["basis"],
+        sizes=data["sizes"],
+        exclude=data["exclude"],
+        separate_clubs=data["separate_clubs"],
+      )
+      created = [] if data["dry_run"] else balancing.apply_proposal(season, proposal)
+    except DjangoValidationError as exc:
+      raise ValidationError(exc.message_dict)
+    new_ids = {t.previous_team_id: t.pk for t in created}
+    return Response({
+      "dry_run": data["dry_run"],
+      "previous_season": proposal.previous_season.pk,
+      "divisions": [
+        {"id": division_id, "name": name, "level": level + 1, "size": size}
+        for division_id, name, level, size in proposal.divisions
+      ],
+      "placements": [
+        {
+          "previous_team": p.entry.team_id,
+          "team": new_ids.get(p.entry.team_id),
+          "name": p.entry.name,
+          "club": p.entry.club,
+          "from_division": p.entry.division_id,
+          "division": p.division_id,
+          "movement": p.movement,
+          "earned_movement": p.earned_movement,
+          "rating": round(p.entry.rating, 1),
+          "swapped": p.swapped,
+        }
+        for p in sorted(proposal.placements, key=lambda p: p.rank)
+      ],
+      # finished to move (or stay) but the division sizes had no room
+      "overridden": [p.entry.team_id for p in proposal.overridden],
+      "clashes": [p.entry.team_id for p in proposal.clashes],
+    })
+
+
+class TeamTurnoutView(APIView):
+  """
+  A team's turnout forecasts for its upcoming matches, for its captains and organization
+  staff, in one query. Forecasts are recomputed per season by the leagues.forecast_turnout job.
+  """
+  permission_classes = [IsCaptainOrOrgStaff]
+
+  def get(self, request, team_season_id):
+    team_season = get_object_or_404(TeamSeason.objects.select_related("season"), pk=team_season_id)
+    self.check_object_permissions(request, team_season)
+    forecasts = (
+      MatchTurnoutForecast.objects
+      .filter(team_id=team_season.team_id, match__status=Match.Status.SCHEDULED, match__starts_at__gt=timezone.now())
+      .select_related("match__home_team", "match__away_team", "match__venue")
+      .order_by("match__starts_at")
+    )
+    return Response([
+      {
+        "match": f.match_id,
+        "starts_at": f.match.starts_at,
+        "home_team": f.match.home_team.name,
+        "away_team": f.match.away_team.name,
+        "venue": f.match.venue.name if f.match.venue else None,
+        "going": f.going,
+        "maybe": f.maybe,
+        "out": f.out,
+        "expected_players": round(f.expected_players, 1),
+        "min_players": f.min_players,
+        "shortfall_probability": round(f.shortfall_probability, 3),
+        "at_risk": f.at_risk,
+        "no_show_rate": round(1 - f.going_show_rate, 3),
+        "computed_at": f.computed_at,
+      }
+      for f in forecasts
+    ])
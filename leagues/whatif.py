@@ -0,0 +1,139 @@
+"""
+What-if outlook for a division: who can still win, who has clinched a playoff place, magic
+numbers, and Monte Carlo finishing odds (fixture odds from team ratings when available).
+
+`load_graph` reads a division into a `LeagueGraph` with two queries. Answers are cached
+under a per-division version that is bumped whenever a MatchResult (or a fixture) of the
+division changes, so they're recomputed only after the next result comes in. A per-process
+cache can't see another worker's bump, so there versions (and answers) only live for
+LOCAL_CACHE_TIMEOUT.
+"""
+import uuid
+
+from django.core.cache import cache
+
+from core.cache import cache_timeout
+
+from . import ratings
+from .league_graph import NO, YES, LeagueGraph, project
+from .models import Match, Team
+from .standings import POINTS_DRAW, POINTS_WIN
+
+REMAINING_STATUSES = (Match.Status.SCHEDULED, Match.Status.POSTPONED)
+DEFAULT_SIMULATIONS = 2000
+CACHE_TIMEOUT = 60 * 60 * 24
+# how stale another worker's outlook may be under a locmem cache
+LOCAL_CACHE_TIMEOUT = 60
+
+
+def _version_key(division_id) -> str:
+  return f"leagues:whatif:version:{division_id}"
+
+
+def graph_version(division_id) -> str:
+  key = _version_key(division_id)
+  version = cache.get(key)
+  if version is None:
+    version = uuid.uuid4().hex
+    # add() so concurrent first readers agree on one version
+    if not cache.add(key, version, cache_timeout(None, LOCAL_CACHE_TIMEOUT)):
+      version = cache.get(key) or version
+  return version
+
+
+def invalidate(*division_ids) -> None:
+  cache.delete_many([_version_key(d) for d in division_ids if d])
+
+
+def load_graph(division_id, *, version=None) -> LeagueGraph:
+  """The division's active teams, final results and remaining fixtures, in two queries."""
+  teams = Team.objects.filter(division_id=division_id, is_active=True).order_by("name").values_list("id", "name")
+  results, fixtures = [], []
+  rows = (
+    Match.objects
+    .filter(division_id=division_id, status__in=(Match.Status.FINAL, *REMAINING_STATUSES))
+    .order_by("starts_at", "id")
+    .values_list("id", "home_team_id", "away_team_id", "status", "result__home_score", "result__away_score")
+  )
+  for match_id, home_id, away_id, status, home_score, away_score in rows:
+    if status == Match.Status.FINAL:
+      if home_score is not None:
+        results.append((home_id, away_id, home_score, away_score))
+    else:
+      fixtures.append((match_id, home_id, away_id))
+  return LeagueGraph.build(
+    teams, results, fixtures, win_points=POINTS_WIN, draw_points=POINTS_DRAW, version=version or ""
+  )
+
+
+def cached_graph(division_id) -> LeagueGraph:
+  version = graph_version(division_id)
+  key = f"leagues:whatif:graph:{division_id}:{version}"
+  graph = cache.get(key)
+  if graph is None:
+    graph = load_graph(division_id, version=version)
+    cache.set(key, graph, cache_timeout(CACHE_TIMEOUT, LOCAL_CACHE_TIMEOUT))
+  return graph
+
+
+def outlook(division_id, *, playoff_spots=None, simulations=DEFAULT_SIMULATIONS, processes=0, seed=None) -> dict:
+  """
+  Per-team outlook, cached until the division's results change. `playoff_spots` adds the
+  playoff questions; `simulations=0` skips the Monte Carlo projection.
+  """
+  graph = cached_graph(division_id)
+  key = f"leagues:whatif:outlook:{division_id}:{graph.version}:{playoff_spots}:{simulations}"
+  data = cache.get(key)
+  if data is None:
+    data = _outlook(graph, playoff_spots, simulations, processes, seed)
+    cache.set(key, data, cache_timeout(CACHE_TIMEOUT, LOCAL_CACHE_TIMEOUT))
+  return data
+
+
+def _answer(verdict):
+  return {YES: True, NO: False}.get(verdict.answer)
+
+
+def _outlook(graph, playoff_spots, simulations, processes, seed):
+  projection = None
+  if simulations and graph.fixture_ids:
+    # fixture odds from the teams' Elo ratings when there are any, else the division's base rates
+    probabilities = ratings.fixture_probabilities(graph)
+    projection = project(graph, simulations, probabilities=probabilities, processes=processes, seed=seed)
+  max_points = graph.max_points()
+  remaining = graph.remaining()
+  teams = []
+  for position, t in enumerate(graph.table(), start=1):
+    row = {
+      "team": graph.team_ids[t],
+      "name": graph.names[t],
+      "position": position,
+      "points": graph.points[t],
+      "remaining": remaining[t],
+      "max_points": max_points[t],
+      # None when the search budget ran out before it could tell
+      "can_win": _answer(graph.can_finish_top(t)),
+      "clinched_title": _answer(graph.clinched_top(t)),
+      "title_magic_number": graph.magic_number(t),
+    }
+    if playoff_spots:
+      row.update({
+        "can_make_playoffs": _answer(graph.can_finish_top(t, playoff_spots)),
+        "clinched_playoffs": _answer(graph.clinched_top(t, playoff_spots)),
+        "playoff_magic_number": graph.magic_number(t, playoff_spots),
+        "clinched_playoffs_with": [
+          {"match": match_id, "result": result} for match_id, result in graph.clinching_results(t, playoff_spots)
+        ],
+      })
+    if projection is not None:
+      row["title_probability"] = round(projection.top(t, 1), 4)
+      row["expected_points"] = round(projection.expected_points[t], 2)
+      if playoff_spots:
+        row["playoff_probability"] = round(projection.top(t, playoff_spots), 4)
+    teams.append(row)
+  return {
+    "remaining_matches": len(graph.fixture_ids),
+    "playoff_spots": playoff_spots,
+    "simulations": projection.iterations if projection else 0,
+    "teams": teams,
+  }
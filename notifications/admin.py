@@ -0,0 +1,27 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "kind", "channel", "recipient", "subject", "status", "attempts", "send_after", "sent_at")
+    list_filter = ("status", "channel", "kind", "organization")
+    search_fields = ("recipient", "subject", "=delivery_id")
+    raw_id_fields = ("match",)
+    readonly_fields = ("created_at", "claimed_at", "sent_at", "attempts", "last_error", "delivery_id")
+    date_hierarchy = "created_at"
+    actions = ("retry",)
+
+    @admin.action(description="Send again")
+    def retry(self, request, queryset):
+        from .outbox import schedule_delivery
+
+        now = timezone.now()
+        # SENDING rows are in a delivery run's hands
+        updated = queryset.filter(status__in=[Notification.Status.SENT, Notification.Status.FAILED]).update(
+            status=Notification.Status.PENDING, attempts=0, last_error="", send_after=now
+        )
+        schedule_delivery(now)
+        self.message_user(request, f"{updated} notifications queued again.")
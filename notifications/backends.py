@@ -0,0 +1,98 @@
+"""
+Delivery backends, one per channel, configured in `NOTIFICATIONS_BACKENDS`:
+
+  NOTIFICATIONS_BACKENDS = {
+    "email": "notifications.backends.EmailBackend",
+    "sms": "myproject.sms.TwilioBackend",
+  }
+
+A backend is opened once per delivery batch and `send()`s one digest message at a time,
+raising on failure. EmailBackend goes through Django's EMAIL_BACKEND (SMTP, console,
+locmem...); ConsoleBackend prints any channel; LocmemBackend keeps messages in
+`backends.outbox` for tests and local development.
+"""
+import sys
+import threading
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils.module_loading import import_string
+
+DEFAULT_BACKENDS = {"email": "notifications.backends.EmailBackend"}
+
+# messages "sent" through LocmemBackend
+outbox = []
+
+
+@dataclass
+class OutgoingMessage:
+  channel: str
+  recipient: str
+  subject: str
+  body: str
+  notification_ids: list = field(default_factory=list)
+
+
+class BaseBackend:
+  def __init__(self, channel, **options):
+    self.channel = channel
+    self.options = options
+
+  def open(self):
+    pass
+
+  def close(self):
+    pass
+
+  def send(self, message: OutgoingMessage) -> None:
+    raise NotImplementedError
+
+  def __enter__(self):
+    self.open()
+    return self
+
+  def __exit__(self, *exc):
+    self.close()
+
+
+class EmailBackend(BaseBackend):
+  """Sends through one Django mail connection for the whole batch."""
+
+  def open(self):
+    self.connection = get_connection(self.options.get("email_backend"))
+    self.connection.open()
+
+  def close(self):
+    self.connection.close()
+
+  def send(self, message):
+    EmailMessage(
+      message.subject, message.body, settings.DEFAULT_FROM_EMAIL, [message.recipient], connection=self.connection
+    ).send()
+
+
+class ConsoleBackend(BaseBackend):
+  _lock = threading.Lock()
+
+  def send(self, message):
+    stream = self.options.get("stream") or sys.stdout
+    with self._lock:
+      stream.write(f"[{message.channel}] to {message.recipient}: {message.subject}\n{message.body}\n{'-' * 79}\n")
+      stream.flush()
+
+
+class LocmemBackend(BaseBackend):
+  def send(self, message):
+    outbox.append(message)
+
+
+def channels() -> dict:
+  return getattr(settings, "NOTIFICATIONS_BACKENDS", DEFAULT_BACKENDS)
+
+
+def get_backend(channel, **options) -> BaseBackend:
+  path = channels().get(channel)
+  if path is None:
+    raise LookupError(f"No notification backend configured for {channel!r}.")
+  return import_string(path)(channel, **options)
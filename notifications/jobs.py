@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from core.jobs import job
+
+from . import outbox
+from .reminders import queue_reminders
+
+
+@job("notifications.send_pending")
+def send_pending_job(ctx, limit=outbox.SEND_BATCH_SIZE):
+  """Drain due notifications, then queue the next run for whatever is still pending."""
+  totals = {"messages": 0, "notifications": 0, "failed": 0}
+  while True:
+    counts = outbox.send_pending(limit=limit)
+    for key in totals:
+      totals[key] += counts[key]
+    ctx.progress(totals["notifications"] + totals["failed"], message=f"{totals['messages']} messages sent")
+    if counts["rate_limited"] or not counts["notifications"] + counts["failed"]:
+      break
+
+  due = outbox.next_due()
+  if due is not None:
+    soonest = timezone.now() + (outbox.RATE_WINDOW if counts["rate_limited"] else timedelta(seconds=1))
+    outbox.schedule_delivery(max(due, soonest))
+  return totals
+
+
+@job("notifications.queue_reminders")
+def queue_reminders_job(ctx, hours=None):
+  return {"matches": queue_reminders(lead=timedelta(hours=hours) if hours else None)}
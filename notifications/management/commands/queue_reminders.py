@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from notifications.reminders import queue_reminders, reminder_lead
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue reminders to team contacts for every fixture starting within the reminder window. "
+        "Safe to run as often as you like; each fixture's reminder is only queued once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours", type=int, help=f"Reminder window (default: {int(reminder_lead().total_seconds() // 3600)})."
+        )
+
+    def handle(self, *args, **opts):
+        lead = timedelta(hours=opts["hours"]) if opts["hours"] else None
+        matches = queue_reminders(lead=lead)
+        self.stdout.write(self.style.SUCCESS(f"Checked reminders for {matches} upcoming fixtures."))
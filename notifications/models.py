@@ -0,0 +1,67 @@
+import uuid
+
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import Organization
+
+
+class Notification(models.Model):
+  """
+  One outgoing message in the transactional outbox. Rows are written in the same transaction
+  as the change they announce and delivered afterwards by `notifications.outbox.send_pending`,
+  which folds everything due for the same recipient into one digest message.
+  """
+
+  class Channel(models.TextChoices):
+    EMAIL = "email", "Email"
+    SMS = "sms", "SMS"
+
+  class Status(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    # claimed by a delivery run and being sent
+    SENDING = "SENDING", "Sending"
+    SENT = "SENT", "Sent"
+    FAILED = "FAILED", "Failed"
+
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="notifications")
+  kind = models.CharField(max_length=40)
+  channel = models.CharField(max_length=10, choices=Channel.choices, default=Channel.EMAIL)
+  # email address or phone number, depending on the channel
+  recipient = models.CharField(max_length=254)
+  subject = models.CharField(max_length=200)
+  body = models.TextField()
+  # the match this is about, for the admin and for de-duplicating follow-ups
+  match = models.ForeignKey("leagues.Match", on_delete=models.SET_NULL, null=True, blank=True, related_name="notifications")
+  # optional idempotency key; a second row with the same key is never queued
+  dedupe_key = models.CharField(max_length=200, blank=True, default="")
+
+  status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+  # not delivered before this; holds rows for the digest window and for retry backoff
+  send_after = models.DateTimeField(default=timezone.now)
+  attempts = models.PositiveSmallIntegerField(default=0)
+  last_error = models.TextField(blank=True, default="")
+  # rows delivered together in one digest message share this id
+  delivery_id = models.UUIDField(null=True, blank=True, editable=False)
+  # when a delivery run claimed the row; SENDING rows claimed long ago belong to a dead worker
+  claimed_at = models.DateTimeField(null=True, blank=True, editable=False)
+  created_at = models.DateTimeField(auto_now_add=True)
+  sent_at = models.DateTimeField(null=True, blank=True)
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=["dedupe_key"], condition=~Q(dedupe_key=""), name="uniq_notification_dedupe_key"),
+    ]
+    indexes = [
+      models.Index(fields=["channel", "send_after"], condition=Q(status="PENDING"), name="notification_due_idx"),
+      # rate limiting counts what a channel sent in the last minute
+      models.Index(fields=["channel", "sent_at"], condition=Q(status="SENT"), name="notification_sent_idx"),
+      # claims in flight, for the rate limit and for releasing a dead worker's rows
+      models.Index(fields=["channel", "claimed_at"], condition=Q(status="SENDING"), name="notification_sending_idx"),
+      models.Index(fields=["organization", "created_at"]),
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.kind} -> {self.recipient} [{self.status}]"
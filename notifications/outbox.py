@@ -0,0 +1,247 @@
+"""
+Transactional outbox for email and SMS notifications.
+
+Callers `queue()` Notification rows inside the transaction that makes the change, so a
+rolled-back change never sends anything. Rows are held for a short digest window
+(`NOTIFICATIONS_DIGEST_SECONDS`) and then delivered by the `notifications.send_pending` job,
+on the "notifications" queue (served by `manage.py run_worker` unless --queue says otherwise):
+
+- everything due for the same recipient goes out as one digest message, so a captain whose
+  team had ten fixtures moved gets one email rather than ten;
+- each channel's backend is opened once per batch and limited to
+  `NOTIFICATIONS_RATE_LIMITS[channel]` messages per minute, counted across all workers;
+- a failed message is retried with exponential backoff until MAX_ATTEMPTS.
+
+A delivery run claims its rows (status SENDING) in a short transaction of its own, sends
+with no locks held, and records each message's outcome as soon as it's sent, so a failure
+after sending never puts a whole batch back in line. Rows left SENDING by a worker that died
+go back to PENDING after CLAIM_TIMEOUT, so only those few can ever be sent twice.
+"""
+import logging
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Min, Q
+from django.utils import timezone
+
+from core import jobs
+from core.models import Job
+
+from .backends import OutgoingMessage, channels, get_backend
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 6 * 3600
+SEND_BATCH_SIZE = 500
+RATE_WINDOW = timedelta(minutes=1)
+CLAIM_TIMEOUT = timedelta(minutes=15)
+QUEUE = "notifications"
+
+DEFAULT_DIGEST_SECONDS = 300
+DEFAULT_RATE_LIMITS = {"email": 120, "sms": 30}
+
+
+def digest_window() -> timedelta:
+  return timedelta(seconds=getattr(settings, "NOTIFICATIONS_DIGEST_SECONDS", DEFAULT_DIGEST_SECONDS))
+
+
+def rate_limit(channel):
+  """Messages per minute for `channel`, or None for no limit."""
+  return getattr(settings, "NOTIFICATIONS_RATE_LIMITS", DEFAULT_RATE_LIMITS).get(channel)
+
+
+def retry_delay(attempts: int) -> timedelta:
+  return timedelta(seconds=min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1)))
+
+
+# ---------- queueing ----------
+
+def team_contacts(team) -> list:
+  """(channel, address) pairs for a team's primary contact, on the configured channels."""
+  configured = channels()
+  found = []
+  if team.primary_contact_email and Notification.Channel.EMAIL in configured:
+    found.append((Notification.Channel.EMAIL, team.primary_contact_email))
+  if team.primary_contact_phone and Notification.Channel.SMS in configured:
+    found.append((Notification.Channel.SMS, team.primary_contact_phone))
+  return found
+
+
+def queue(notifications, *, delay=None) -> list:
+  """
+  Insert the notifications, due after the digest window (or `delay`), and schedule a
+  delivery run for after the commit. Subjects are cut to fit the column, so one long team
+  name can't fail the whole insert. Rows whose `dedupe_key` was already queued are dropped;
+  returns the rows actually inserted.
+  """
+  notifications = list(notifications)
+  if not notifications:
+    return []
+  send_after = timezone.now() + (digest_window() if delay is None else delay)
+  subject_length = Notification._meta.get_field("subject").max_length
+  for notification in notifications:
+    notification.send_after = send_after
+    notification.subject = notification.subject[:subject_length]
+  dedupe = any(n.dedupe_key for n in notifications)
+  Notification.objects.bulk_create(notifications, batch_size=500, ignore_conflicts=dedupe)
+  if dedupe:
+    # ignore_conflicts hands back every row; only those whose pk landed were inserted
+    inserted = set(Notification.objects.filter(pk__in=[n.pk for n in notifications]).values_list("pk", flat=True))
+    notifications = [n for n in notifications if n.pk in inserted]
+  if notifications:
+    transaction.on_commit(lambda: schedule_delivery(send_after))
+  return notifications
+
+
+def schedule_delivery(run_after=None):
+  """Make sure a delivery run is queued for `run_after` (default: now) or earlier."""
+  run_after = run_after or timezone.now()
+  queued = Job.objects.filter(name="notifications.send_pending", status=Job.Status.QUEUED, run_after__lte=run_after)
+  if not queued.exists():
+    jobs.enqueue("notifications.send_pending", queue=QUEUE, run_after=run_after)
+
+
+def next_due():
+  """When the earliest pending notification becomes due, or None."""
+  return Notification.objects.filter(status=Notification.Status.PENDING).aggregate(due=Min("send_after"))["due"]
+
+
+# ---------- delivery ----------
+
+def rate_budget(channel, now):
+  """Messages `channel` may still send in the current minute (None: unlimited)."""
+  limit = rate_limit(channel)
+  if not limit:
+    return None
+  since = now - RATE_WINDOW
+  # messages other runs have claimed but not yet sent count too
+  sent = (
+    Notification.objects
+    .filter(channel=channel)
+    .filter(
+      Q(status=Notification.Status.SENT, sent_at__gt=since)
+      | Q(status=Notification.Status.SENDING, claimed_at__gt=since)
+    )
+    .values("delivery_id").distinct().count()
+  )
+  return max(0, limit - sent)
+
+
+def digest(channel, rows) -> OutgoingMessage:
+  """One message for all of a recipient's due notifications."""
+  first = rows[0]
+  if len(rows) == 1:
+    subject, body = first.subject, first.body
+  else:
+    subject = f"{first.organization.name}: {len(rows)} updates"
+    if channel == Notification.Channel.SMS:
+      body = "\n".join(r.subject for r in rows)
+    else:
+      body = "\n\n".join(f"{r.subject}\n{'-' * len(r.subject)}\n{r.body.strip()}" for r in rows)
+  return OutgoingMessage(channel, first.recipient, subject, body, [r.pk for r in rows])
+
+
+def _fail(rows, error, now):
+  for row in rows:
+    row.attempts += 1
+    row.last_error = error[:2000]
+    row.delivery_id = None
+    if row.attempts >= MAX_ATTEMPTS:
+      row.status = Notification.Status.FAILED
+    else:
+      row.status = Notification.Status.PENDING
+      row.send_after = now + retry_delay(row.attempts)
+  Notification.objects.bulk_update(rows, ["status", "attempts", "last_error", "send_after", "delivery_id"])
+
+
+def release_stale_claims(channel, now) -> int:
+  """Put rows a dead worker left SENDING back in line. Returns how many."""
+  return (
+    Notification.objects
+    .filter(channel=channel, status=Notification.Status.SENDING, claimed_at__lt=now - CLAIM_TIMEOUT)
+    .update(status=Notification.Status.PENDING, delivery_id=None)
+  )
+
+
+def _claim(channel, now, limit, budget):
+  """
+  Due rows of `channel`, grouped per recipient and cut to `budget` messages, marked SENDING
+  and committed. Returns (groups, whether the budget cut any).
+  """
+  with transaction.atomic():
+    rows = list(
+      Notification.objects
+      .select_for_update(skip_locked=True, of=("self",))
+      .select_related("organization")
+      .filter(status=Notification.Status.PENDING, channel=channel, send_after__lte=now)
+      .order_by("send_after", "created_at")[:limit]
+    )
+    groups = defaultdict(list)
+    for row in rows:
+      groups[(row.organization_id, row.recipient)].append(row)
+    batch = list(groups.values())
+    limited = budget is not None and len(batch) > budget
+    if limited:
+      batch = batch[:budget]
+    claimed = []
+    for group in batch:
+      # one delivery id per message, so the rate limit counts it while it's in flight
+      delivery_id = uuid.uuid4()
+      for row in group:
+        row.status = Notification.Status.SENDING
+        row.claimed_at = now
+        row.delivery_id = delivery_id
+      claimed.extend(group)
+    Notification.objects.bulk_update(claimed, ["status", "claimed_at", "delivery_id"], batch_size=500)
+  return batch, limited
+
+
+def send_channel(channel, *, limit=SEND_BATCH_SIZE, backend=None) -> dict:
+  """
+  Deliver due notifications of one channel as per-recipient digests, within its rate limit.
+  Rows are claimed first, sent without holding locks, and settled one message at a time.
+  """
+  counts = {"messages": 0, "notifications": 0, "failed": 0, "rate_limited": False}
+  now = timezone.now()
+  release_stale_claims(channel, now)
+  budget = rate_budget(channel, now)
+  if budget == 0:
+    counts["rate_limited"] = True
+    return counts
+
+  batch, counts["rate_limited"] = _claim(channel, now, limit, budget)
+  if not batch:
+    return counts
+
+  with backend or get_backend(channel) as backend:
+    for group in batch:
+      try:
+        backend.send(digest(channel, group))
+      except Exception as exc:
+        logger.warning("Sending %s notification to %s failed: %s", channel, group[0].recipient, exc)
+        _fail(group, str(exc) or exc.__class__.__name__, now)
+        counts["failed"] += len(group)
+        continue
+      Notification.objects.filter(pk__in=[row.pk for row in group]).update(
+        status=Notification.Status.SENT, sent_at=timezone.now(), attempts=F("attempts") + 1, last_error=""
+      )
+      counts["messages"] += 1
+      counts["notifications"] += len(group)
+  return counts
+
+
+def send_pending(*, limit=SEND_BATCH_SIZE) -> dict:
+  """One delivery batch for every configured channel. Returns combined counts."""
+  totals = {"messages": 0, "notifications": 0, "failed": 0, "rate_limited": False}
+  for channel in channels():
+    counts = send_channel(channel, limit=limit)
+    totals["rate_limited"] |= counts.pop("rate_limited")
+    for key, value in counts.items():
+      totals[key] += value
+  return totals
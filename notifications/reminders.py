@@ -0,0 +1,68 @@
+"""
+Match reminders for team contacts.
+
+`queue_reminders` is meant to run every few minutes (`manage.py queue_reminders` from cron,
+or the `notifications.queue_reminders` job). Each run reads every upcoming fixture in the
+reminder window with one query and queues a reminder per team contact and channel. The
+dedupe key includes the kick-off time, so reruns queue nothing new while a fixture that is
+moved gets a fresh reminder for its new time.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from leagues.models import Match
+
+from . import outbox
+from .models import Notification
+
+DEFAULT_REMINDER_HOURS = 48
+
+
+def reminder_lead() -> timedelta:
+  return timedelta(hours=getattr(settings, "NOTIFICATIONS_REMINDER_HOURS", DEFAULT_REMINDER_HOURS))
+
+
+def _dedupe_key(match, channel, recipient) -> str:
+  who = hashlib.sha1(recipient.strip().lower().encode()).hexdigest()
+  return f"reminder:{match.pk}:{int(match.starts_at.timestamp())}:{channel}:{who}"
+
+
+def _reminder(match, team, channel, recipient) -> Notification:
+  org = match.season.organization
+  when = timezone.localtime(match.starts_at, org.tzinfo)
+  opponent = match.away_team if team.pk == match.home_team_id else match.home_team
+  venue = match.venue
+  where = f"{venue.name}, {venue.address}" if venue and venue.address else (venue.name if venue else "venue TBD")
+  return Notification(
+    organization=org,
+    kind="match.reminder",
+    channel=channel,
+    recipient=recipient,
+    subject=f"Reminder: {match.home_team.name} vs {match.away_team.name}, {when:%a %d %b %H:%M}",
+    body=(
+      f"{team.name} plays {opponent.name} ({match.division.name}).\n\n"
+      f"When: {when:%A %d %B %Y, %H:%M}\nWhere: {where}\n"
+    ),
+    match=match,
+    dedupe_key=_dedupe_key(match, channel, recipient),
+  )
+
+
+def queue_reminders(*, now=None, lead=None) -> int:
+  """Queue reminders for fixtures starting within `lead`. Returns the fixtures covered."""
+  now = now or timezone.now()
+  matches = list(
+    Match.live
+    .filter(status=Match.Status.SCHEDULED, starts_at__gt=now, starts_at__lte=now + (lead or reminder_lead()))
+    .select_related("season__organization", "division", "venue", "home_team", "away_team")
+  )
+  outbox.queue(
+    _reminder(match, team, channel, recipient)
+    for match in matches
+    for team in (match.home_team, match.away_team)
+    for channel, recipient in outbox.team_contacts(team)
+  )
+  return len(matches)
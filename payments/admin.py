@@ -0,0 +1,43 @@
+from django.contrib import admin
+from .models import LedgerEntry, TeamSeasonBalance
+
+
+@admin.register(LedgerEntry)
+class LedgerEntryAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "team_season", "kind", "amount", "memo", "reference", "created_by")
+    list_filter = ("team_season__season__organization", "team_season__season", "kind")
+    search_fields = ("team_season__team__name", "memo", "reference")
+    raw_id_fields = ("team_season",)
+    readonly_fields = ("created_by", "created_at")
+    date_hierarchy = "created_at"
+
+    def get_readonly_fields(self, request, obj=None):
+        # entries are append-only: existing ones can be viewed, not edited
+        if obj is not None:
+            return [f.name for f in self.model._meta.fields]
+        return self.readonly_fields
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.created_by = request.user
+            obj.save()
+
+
+@admin.register(TeamSeasonBalance)
+class TeamSeasonBalanceAdmin(admin.ModelAdmin):
+    list_display = ("team_season", "season", "charges_total", "payments_total", "credits_total", "balance", "last_entry_at")
+    list_filter = ("organization", "season")
+    search_fields = ("team_season__team__name",)
+    list_select_related = ("team_season__team", "team_season__season", "season")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,10 @@
+from core.jobs import job
+from core.models import Organization
+
+from .ledger import rebuild_balances
+
+
+@job("payments.rebuild_balances")
+def rebuild_balances_job(ctx, organization_id=None):
+  org = Organization.objects.get(pk=organization_id) if organization_id else None
+  return {"balances": rebuild_balances(org)}
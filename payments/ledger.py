@@ -0,0 +1,73 @@
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, Max, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import TOTAL_FIELDS, LedgerEntry, TeamSeasonBalance
+
+
+def post_entry(team_season, kind, amount, *, memo="", reference="", created_by=None) -> LedgerEntry:
+  """Append an entry; the team season's balance row is updated in the same transaction."""
+  entry = LedgerEntry(
+    team_season=team_season, kind=kind, amount=Decimal(amount), memo=memo, reference=reference, created_by=created_by
+  )
+  entry.save()
+  return entry
+
+
+def owing_report(organization, *, season=None, include_settled=False):
+  """Who owes what, straight from the materialized balances (one query)."""
+  qs = TeamSeasonBalance.objects.filter(organization=organization)
+  if season is not None:
+    qs = qs.filter(season=season)
+  if not include_settled:
+    qs = qs.filter(balance__gt=0)
+  return qs.select_related("team_season__team", "season").order_by("-balance")
+
+
+def rebuild_balances(organization=None) -> int:
+  """
+  Recompute balances from the full ledger (repair / backfill only; reads use the
+  incrementally maintained rows). One aggregate query and one bulk upsert.
+  """
+  zero = Value(Decimal("0"), output_field=DecimalField(max_digits=12, decimal_places=2))
+  entries = LedgerEntry.objects.all()
+  if organization is not None:
+    entries = entries.filter(team_season__season__organization=organization)
+
+  totals = (
+    entries
+    .values("team_season_id", "team_season__season_id", "team_season__season__organization_id")
+    .annotate(
+      entry_count=Count("id"),
+      last_entry_at=Max("created_at"),
+      **{
+        field: Coalesce(Sum("amount", filter=Q(kind=kind)), zero)
+        for kind, field in TOTAL_FIELDS.items()
+      },
+    )
+    .order_by()
+  )
+
+  balances = [
+    TeamSeasonBalance(
+      team_season_id=row["team_season_id"],
+      season_id=row["team_season__season_id"],
+      organization_id=row["team_season__season__organization_id"],
+      charges_total=row["charges_total"],
+      payments_total=row["payments_total"],
+      credits_total=row["credits_total"],
+      balance=row["charges_total"] - row["payments_total"] - row["credits_total"],
+      entry_count=row["entry_count"],
+      last_entry_at=row["last_entry_at"],
+    )
+    for row in totals
+  ]
+  TeamSeasonBalance.objects.bulk_create(
+    balances,
+    batch_size=500,
+    update_conflicts=True,
+    unique_fields=["team_season"],
+    update_fields=["charges_total", "payments_total", "credits_total", "balance", "entry_count", "last_entry_at"],
+  )
+  return len(balances)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Organization
+from payments.ledger import rebuild_balances
+
+
+class Command(BaseCommand):
+    help = "Recompute TeamSeasonBalance rows from the full ledger (repair/backfill)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org-slug", help="Only rebuild balances for this organization.")
+
+    def handle(self, *args, **opts):
+        org = None
+        if opts["org_slug"]:
+            try:
+                org = Organization.objects.get(slug=opts["org_slug"])
+            except Organization.DoesNotExist:
+                raise CommandError(f"Unknown organization: {opts['org_slug']}")
+
+        rebuilt = rebuild_balances(org)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} team season balances."))
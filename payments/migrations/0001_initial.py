@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:57
+
+import django.db.models.deletion
+import uuid
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('leagues', '0008_venue_geo_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('CHARGE', 'Charge'), ('PAYMENT', 'Payment'), ('CREDIT', 'Credit')], max_length=10)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('memo', models.CharField(blank=True, default='', max_length=255)),
+                ('reference', models.CharField(blank=True, default='', max_length=120)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('team_season', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='ledger_entries', to='leagues.teamseason')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['team_season', 'created_at'], name='payments_le_team_se_5ef555_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(('amount__gt', 0)), name='chk_ledger_amount_positive')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TeamSeasonBalance',
+            fields=[
+                ('team_season', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='balance', serialize=False, to='leagues.teamseason')),
+                ('charges_total', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=12)),
+                ('payments_total', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=12)),
+                ('credits_total', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=12)),
+                ('balance', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=12)),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('last_entry_at', models.DateTimeField(blank=True, null=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_season_balances', to='core.organization')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_season_balances', to='leagues.season')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['organization', 'balance'], name='payments_te_organiz_cdb8d7_idx'), models.Index(fields=['season', 'balance'], name='payments_te_season__15bafb_idx')],
+            },
+        ),
+    ]
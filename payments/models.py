@@ -0,0 +1,100 @@
+import uuid
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import F, Q
+
+from core.models import Organization
+from leagues.models import Season, TeamSeason
+
+
+class LedgerEntry(models.Model):
+  """Append-only record of money owed to / paid to the league by a team for a season."""
+
+  class Kind(models.TextChoices):
+    CHARGE = "CHARGE", "Charge"
+    PAYMENT = "PAYMENT", "Payment"
+    CREDIT = "CREDIT", "Credit"
+
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  team_season = models.ForeignKey(TeamSeason, on_delete=models.PROTECT, related_name="ledger_entries")
+  kind = models.CharField(max_length=10, choices=Kind.choices)
+  amount = models.DecimalField(max_digits=10, decimal_places=2)
+  memo = models.CharField(max_length=255, blank=True, default="")
+  reference = models.CharField(max_length=120, blank=True, default="")
+
+  created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+  created_at = models.DateTimeField(auto_now_add=True)
+
+  class Meta:
+    constraints = [
+      models.CheckConstraint(condition=Q(amount__gt=0), name="chk_ledger_amount_positive")
+    ]
+    indexes = [
+      models.Index(fields=["team_season", "created_at"]),
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.kind} {self.amount} -- {self.team_season}"
+
+  @property
+  def signed_amount(self) -> Decimal:
+    """Effect on the balance owed: charges increase it, payments and credits reduce it."""
+    return self.amount if self.kind == self.Kind.CHARGE else -self.amount
+
+  def save(self, *args, **kwargs):
+    if not self._state.adding:
+      raise ValidationError("Ledger entries are append-only; post a correcting entry instead.")
+    with transaction.atomic():
+      super().save(*args, **kwargs)
+      TeamSeasonBalance.apply(self)
+
+  def delete(self, *args, **kwargs):
+    raise ValidationError("Ledger entries are append-only; post a correcting entry instead.")
+
+
+TOTAL_FIELDS = {
+  LedgerEntry.Kind.CHARGE: "charges_total",
+  LedgerEntry.Kind.PAYMENT: "payments_total",
+  LedgerEntry.Kind.CREDIT: "credits_total",
+}
+
+
+class TeamSeasonBalance(models.Model):
+  """Running totals per TeamSeason, updated incrementally as entries are posted."""
+  team_season = models.OneToOneField(TeamSeason, on_delete=models.CASCADE, primary_key=True, related_name="balance")
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="team_season_balances")
+  season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="team_season_balances")
+
+  charges_total = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0"))
+  payments_total = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0"))
+  credits_total = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0"))
+  balance = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0"))
+
+  entry_count = models.PositiveIntegerField(default=0)
+  last_entry_at = models.DateTimeField(null=True, blank=True)
+
+  class Meta:
+    indexes = [
+      models.Index(fields=["organization", "balance"]),
+      models.Index(fields=["season", "balance"]),
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.team_season}: {self.balance}"
+
+  @classmethod
+  def apply(cls, entry: LedgerEntry) -> None:
+    ts = entry.team_season
+    cls.objects.get_or_create(
+      team_season_id=ts.pk,
+      defaults={"organization_id": ts.season.organization_id, "season_id": ts.season_id},
+    )
+    cls.objects.filter(pk=ts.pk).update(**{
+      TOTAL_FIELDS[entry.kind]: F(TOTAL_FIELDS[entry.kind]) + entry.amount,
+      "balance": F("balance") + entry.signed_amount,
+      "entry_count": F("entry_count") + 1,
+      "last_entry_at": entry.created_at,
+    })
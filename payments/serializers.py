@@ -0,0 +1,16 @@
+from rest_framework import serializers
+
+from .models import TeamSeasonBalance
+
+
+class TeamSeasonBalanceSerializer(serializers.ModelSerializer):
+  team = serializers.CharField(source="team_season.team.name", read_only=True)
+  season_name = serializers.CharField(source="season.name", read_only=True)
+
+  class Meta:
+    model = TeamSeasonBalance
+    fields = [
+      "team_season", "team", "season", "season_name",
+      "charges_total", "payments_total", "credits_total", "balance",
+      "last_entry_at",
+    ]
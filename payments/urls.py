@@ -0,0 +1,7 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+  path("orgs/<slug:org_slug>/balances/", views.OrgBalancesView.as_view(), name="payments-org-balances"),
+]
@@ -0,0 +1,32 @@
+import uuid
+
+from django.shortcuts import get_object_or_404
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.models import Organization
+from leagues.permissions import IsOrgStaff
+
+from .ledger import owing_report
+from .serializers import TeamSeasonBalanceSerializer
+
+
+class OrgBalancesView(APIView):
+  """Outstanding balances per team season for an organization (?season=<id>, ?all=1 to include settled)."""
+  permission_classes = [IsOrgStaff]
+
+  def get(self, request, org_slug):
+    org = get_object_or_404(Organization, slug=org_slug)
+    season_id = None
+    if request.query_params.get("season"):
+      try:
+        season_id = uuid.UUID(request.query_params["season"])
+      except ValueError:
+        raise ValidationError({"season": "Must be a season id."})
+
+    balances = owing_report(org, include_settled=request.query_params.get("all") in ("1", "true"))
+    if season_id is not None:
+      balances = balances.filter(season_id=season_id)
+
+    return Response(TeamSeasonBalanceSerializer(balances, many=True).data)
@@ -0,0 +1,25 @@
+from django.contrib import admin
+from .models import Referee, RefereeAvailability, RefereeAssignment
+
+
+class RefereeAvailabilityInline(admin.TabularInline):
+    model = RefereeAvailability
+    extra = 0
+    fields = ("starts_at", "ends_at")
+
+
+@admin.register(Referee)
+class RefereeAdmin(admin.ModelAdmin):
+    list_display = ("user", "organization", "max_matches_per_day", "is_active", "created_at")
+    list_filter = ("organization", "is_active")
+    search_fields = ("user__username", "user__email", "user__first_name", "user__last_name")
+    raw_id_fields = ("user",)
+    inlines = [RefereeAvailabilityInline]
+
+
+@admin.register(RefereeAssignment)
+class RefereeAssignmentAdmin(admin.ModelAdmin):
+    list_display = ("match", "referee", "role", "assigned_at")
+    list_filter = ("match__organization", "role")
+    search_fields = ("referee__user__username", "match__home_team__name", "match__away_team__name")
+    raw_id_fields = ("match", "referee")
@@ -0,0 +1,185 @@
+"""
+Referee assignment engine.
+
+Everything is loaded up front (matches, referees, availability, existing assignments) into
+sorted in-memory indexes, fixtures are filled greedily (most constrained first, least
+loaded referee), a one-step augmenting swap rescues fixtures the greedy pass left open,
+and the result is written with a single bulk_create.
+"""
+from bisect import bisect_right, insort
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from leagues.capacity import match_duration
+from leagues.models import Match
+
+from .models import Referee, RefereeAssignment, RefereeAvailability
+
+
+@dataclass(frozen=True)
+class _Slot:
+  match_id: object
+  role: str
+  starts_at: object
+  local_date: date
+
+
+@dataclass
+class AssignmentResult:
+  assignments: list = field(default_factory=list)
+  unfilled: list = field(default_factory=list)
+
+
+class _RefereeState:
+  __slots__ = ("id", "max_per_day", "window_starts", "window_ends", "busy", "per_day", "load")
+
+  def __init__(self, referee_id, max_per_day, windows):
+    self.id = referee_id
+    self.max_per_day = max_per_day
+    merged = []
+    for s, e in sorted(windows):
+      if merged and s <= merged[-1][1]:
+        merged[-1][1] = max(merged[-1][1], e)
+      else:
+        merged.append([s, e])
+    self.window_starts = [s for s, _ in merged]
+    self.window_ends = [e for _, e in merged]
+    self.busy = []  # sorted start times; every booking lasts one match duration
+    self.per_day = Counter()
+    self.load = 0
+
+  def is_available(self, starts_at, ends_at) -> bool:
+    i = bisect_right(self.window_starts, starts_at) - 1
+    return i >= 0 and self.window_ends[i] >= ends_at
+
+  def conflicts(self, starts_at, duration) -> list:
+    i = bisect_right(self.busy, starts_at - duration)
+    out = []
+    while i < len(self.busy) and self.busy[i] < starts_at + duration:
+      out.append(self.busy[i])
+      i += 1
+    return out
+
+  def can_take(self, slot, duration) -> bool:
+    return self.per_day[slot.local_date] < self.max_per_day and not self.conflicts(slot.starts_at, duration)
+
+  def take(self, slot):
+    insort(self.busy, slot.starts_at)
+    self.per_day[slot.local_date] += 1
+    self.load += 1
+
+  def release(self, slot):
+    self.busy.remove(slot.starts_at)
+    self.per_day[slot.local_date] -= 1
+    self.load -= 1
+
+
+def assign_referees(organization, start: date, end: date, *, roles=(RefereeAssignment.Role.REFEREE,), dry_run=False):
+  """
+  Fill open referee roles for `organization`'s scheduled matches between the local dates
+  `start` and `end` (inclusive), respecting availability, overlaps and max_matches_per_day.
+  """
+  duration = match_duration()
+
+  matches = list(
+    Match.live
+    .filter(organization=organization, status=Match.Status.SCHEDULED, local_date__range=(start, end))
+    .values_list("id", "starts_at", "local_date")
+  )
+  if not matches:
+    return AssignmentResult()
+  range_start = min(m[1] for m in matches)
+  range_end = max(m[1] for m in matches) + duration
+
+  max_per_day = dict(
+    Referee.objects
+    .filter(organization=organization, is_active=True)
+    .values_list("id", "max_matches_per_day")
+  )
+  windows = defaultdict(list)
+  for r_id, s, e in (
+    RefereeAvailability.objects
+    .filter(referee_id__in=max_per_day, starts_at__lt=range_end, ends_at__gt=range_start)
+    .values_list("referee_id", "starts_at", "ends_at")
+  ):
+    windows[r_id].append((s, e))
+  referees = {r_id: _RefereeState(r_id, max_per_day[r_id], w) for r_id, w in windows.items()}
+
+  # existing assignments: roles already filled, and busy time for the referees
+  filled = set()
+  for match_id, role, r_id, s, local_date in (
+    RefereeAssignment.objects
+    .filter(match__organization=organization, match__local_date__range=(start - timedelta(days=1), end + timedelta(days=1)))
+    .values_list("match_id", "role", "referee_id", "match__starts_at", "match__local_date")
+  ):
+    filled.add((match_id, role))
+    if r_id in referees:
+      referees[r_id].take(_Slot(match_id, role, s, local_date))
+
+  slots = [
+    _Slot(m_id, role, s, local_date)
+    for m_id, s, local_date in matches
+    for role in roles
+    if (m_id, role) not in filled
+  ]
+
+  candidates = {
+    slot: [r for r in referees.values() if r.is_available(slot.starts_at, slot.starts_at + duration)]
+    for slot in slots
+  }
+  assigned = {}  # slot -> referee state
+  by_referee = defaultdict(dict)  # referee id -> {starts_at: slot}
+
+  def give(slot, ref):
+    ref.take(slot)
+    assigned[slot] = ref
+    by_referee[ref.id][slot.starts_at] = slot
+
+  def take_back(slot):
+    ref = assigned.pop(slot)
+    ref.release(slot)
+    del by_referee[ref.id][slot.starts_at]
+
+  def augment(slot) -> bool:
+    # free a candidate by moving the single assignment that blocks them to someone else
+    for ref in candidates[slot]:
+      if ref.per_day[slot.local_date] >= ref.max_per_day:
+        continue
+      blocking = [by_referee[ref.id].get(s) for s in ref.conflicts(slot.starts_at, duration)]
+      if len(blocking) != 1 or blocking[0] is None:
+        continue
+      other = blocking[0]
+      take_back(other)
+      for alt in candidates[other]:
+        if alt is not ref and alt.can_take(other, duration):
+          give(other, alt)
+          give(slot, ref)
+          return True
+      give(other, ref)
+    return False
+
+  unfilled = []
+  for slot in sorted(slots, key=lambda s: (len(candidates[s]), s.starts_at)):
+    best = None
+    for ref in candidates[slot]:
+      if ref.can_take(slot, duration) and (best is None or (ref.load, str(ref.id)) < (best.load, str(best.id))):
+        best = ref
+    if best is not None:
+      give(slot, best)
+    elif not augment(slot):
+      unfilled.append((slot.match_id, slot.role))
+
+  result = AssignmentResult(
+    assignments=[
+      RefereeAssignment(match_id=slot.match_id, referee_id=ref.id, role=slot.role)
+      for slot, ref in sorted(assigned.items(), key=lambda item: item[0].starts_at)
+    ],
+    unfilled=unfilled,
+  )
+  if not dry_run and result.assignments:
+    with transaction.atomic():
+      RefereeAssignment.objects.bulk_create(result.assignments, batch_size=500)
+  return result
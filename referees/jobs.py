@@ -0,0 +1,14 @@
+from datetime import date
+
+from core.jobs import job
+from core.models import Organization
+
+from .engine import assign_referees
+from .models import RefereeAssignment
+
+
+@job("referees.assign_referees")
+def assign_referees_job(ctx, organization_id, start, end, roles=(RefereeAssignment.Role.REFEREE,)):
+  org = Organization.objects.get(pk=organization_id)
+  result = assign_referees(org, date.fromisoformat(start), date.fromisoformat(end), roles=tuple(roles))
+  return {"assigned": len(result.assignments), "unfilled": len(result.unfilled)}
@@ -0,0 +1,43 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Organization
+from referees.engine import assign_referees
+from referees.models import RefereeAssignment
+
+
+class Command(BaseCommand):
+    help = "Assign referees to an organization's scheduled matches between two local dates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org-slug", required=True)
+        parser.add_argument("--start", required=True, help="First local date (YYYY-MM-DD).")
+        parser.add_argument("--end", required=True, help="Last local date (YYYY-MM-DD).")
+        parser.add_argument("--roles", nargs="+", default=[RefereeAssignment.Role.REFEREE],
+                            choices=RefereeAssignment.Role.values)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        try:
+            org = Organization.objects.get(slug=opts["org_slug"])
+        except Organization.DoesNotExist:
+            raise CommandError(f"Unknown organization: {opts['org_slug']}")
+
+        started = time.perf_counter()
+        result = assign_referees(
+            org,
+            date.fromisoformat(opts["start"]),
+            date.fromisoformat(opts["end"]),
+            roles=opts["roles"],
+            dry_run=opts["dry_run"],
+        )
+        elapsed = time.perf_counter() - started
+
+        verb = "Would assign" if opts["dry_run"] else "Assigned"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {len(result.assignments)} roles in {elapsed:.2f}s | Unfilled: {len(result.unfilled)}"
+        ))
+        for match_id, role in result.unfilled:
+            self.stdout.write(self.style.WARNING(f"  unfilled {role} for match {match_id}"))
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:54
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('leagues', '0008_venue_geo_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Referee',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('max_matches_per_day', models.PositiveSmallIntegerField(default=3, validators=[django.core.validators.MinValueValidator(1)])),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='referees', to='core.organization')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='referee_profiles', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RefereeAssignment',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('role', models.CharField(choices=[('REFEREE', 'Referee'), ('AR1', 'Assistant Referee 1'), ('AR2', 'Assistant Referee 2')], default='REFEREE', max_length=10)),
+                ('assigned_at', models.DateTimeField(auto_now_add=True)),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='referee_assignments', to='leagues.match')),
+                ('referee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='referees.referee')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RefereeAvailability',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('starts_at', models.DateTimeField()),
+                ('ends_at', models.DateTimeField()),
+                ('referee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability', to='referees.referee')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='referee',
+            index=models.Index(fields=['organization', 'is_active'], name='referees_re_organiz_127164_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='referee',
+            constraint=models.UniqueConstraint(fields=('organization', 'user'), name='uniq_referee_org_user'),
+        ),
+        migrations.AddIndex(
+            model_name='refereeassignment',
+            index=models.Index(fields=['referee', 'match'], name='referees_re_referee_b926ce_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='refereeassignment',
+            constraint=models.UniqueConstraint(fields=('match', 'role'), name='uniq_assignment_match_role'),
+        ),
+        migrations.AddConstraint(
+            model_name='refereeassignment',
+            constraint=models.UniqueConstraint(fields=('match', 'referee'), name='uniq_assignment_match_referee'),
+        ),
+        migrations.AddIndex(
+            model_name='refereeavailability',
+            index=models.Index(fields=['referee', 'starts_at'], name='referees_re_referee_033e4b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='refereeavailability',
+            index=models.Index(fields=['starts_at'], name='referees_re_starts__97a158_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='refereeavailability',
+            constraint=models.CheckConstraint(condition=models.Q(('ends_at__gt', models.F('starts_at'))), name='chk_referee_availability_order'),
+        ),
+    ]
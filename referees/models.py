@@ -0,0 +1,75 @@
+import uuid
+from django.conf import settings
+from django.db import models
+from django.db.models import Q, F
+from django.core.validators import MinValueValidator
+
+from core.models import Organization
+
+
+class Referee(models.Model):
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="referees")
+  user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="referee_profiles")
+
+  max_matches_per_day = models.PositiveSmallIntegerField(default=3, validators=[MinValueValidator(1)])
+  is_active = models.BooleanField(default=True)
+  created_at = models.DateTimeField(auto_now_add=True)
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=["organization", "user"], name="uniq_referee_org_user")
+    ]
+    indexes = [
+      models.Index(fields=["organization", "is_active"]),
+    ]
+
+  def __str__(self) -> str:
+    return self.user.get_full_name() or self.user.username
+
+
+class RefereeAvailability(models.Model):
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  referee = models.ForeignKey(Referee, on_delete=models.CASCADE, related_name="availability")
+  starts_at = models.DateTimeField()
+  ends_at = models.DateTimeField()
+
+  class Meta:
+    constraints = [
+      models.CheckConstraint(
+        condition=Q(ends_at__gt=F("starts_at")),
+        name="chk_referee_availability_order"
+      )
+    ]
+    indexes = [
+      models.Index(fields=["referee", "starts_at"]),
+      models.Index(fields=["starts_at"]),
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.referee} {self.starts_at} - {self.ends_at}"
+
+
+class RefereeAssignment(models.Model):
+  class Role(models.TextChoices):
+    REFEREE = "REFEREE", "Referee"
+    ASSISTANT_1 = "AR1", "Assistant Referee 1"
+    ASSISTANT_2 = "AR2", "Assistant Referee 2"
+
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  match = models.ForeignKey("leagues.Match", on_delete=models.CASCADE, related_name="referee_assignments")
+  referee = models.ForeignKey(Referee, on_delete=models.CASCADE, related_name="assignments")
+  role = models.CharField(max_length=10, choices=Role.choices, default=Role.REFEREE)
+  assigned_at = models.DateTimeField(auto_now_add=True)
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=["match", "role"], name="uniq_assignment_match_role"),
+      models.UniqueConstraint(fields=["match", "referee"], name="uniq_assignment_match_referee"),
+    ]
+    indexes = [
+      models.Index(fields=["referee", "match"]),
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.referee} -> {self.match} ({self.role})"
@@ -1,3 +1,43 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from .models import PlayerSignup, RegistrationWindow, TeamApplication
+from . import services
 
-# Register your models here.
+
+class PlayerSignupInline(admin.TabularInline):
+    model = PlayerSignup
+    extra = 0
+    fields = ("full_name", "role", "jersey_number", "email", "phone", "member")
+    readonly_fields = ("member",)
+
+
+@admin.register(RegistrationWindow)
+class RegistrationWindowAdmin(admin.ModelAdmin):
+    list_display = ("season", "name", "opens_at", "closes_at", "is_active")
+    list_filter = ("season__organization", "is_active")
+    search_fields = ("name", "season__name")
+
+
+@admin.register(TeamApplication)
+class TeamApplicationAdmin(admin.ModelAdmin):
+    list_display = ("team_name", "division", "primary_contact_email", "status", "submitted_at", "decided_at")
+    list_filter = ("window__season__organization", "window", "status", "division")
+    search_fields = ("team_name", "primary_contact_name", "primary_contact_email")
+    readonly_fields = ("idempotency_key", "team", "decided_by", "decided_at")
+    list_select_related = ("division",)
+    inlines = [PlayerSignupInline]
+    actions = ["approve_selected", "reject_selected"]
+
+    @admin.action(description="Approve selected applications")
+    def approve_selected(self, request, queryset):
+        approved, skipped = services.approve_applications(
+            list(queryset.values_list("pk", flat=True)), decided_by=request.user
+        )
+        self.message_user(request, f"Approved {len(approved)} applications.", messages.SUCCESS)
+        if skipped:
+            names = ", ".join(a.team_name for a in skipped)
+            self.message_user(request, f"Team name already taken, left pending: {names}", messages.WARNING)
+
+    @admin.action(description="Reject selected applications")
+    def reject_selected(self, request, queryset):
+        rejected = services.reject_applications(list(queryset.values_list("pk", flat=True)), decided_by=request.user)
+        self.message_user(request, f"Rejected {rejected} applications.", messages.SUCCESS)
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:55
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('leagues', '0008_venue_geo_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistrationWindow',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(blank=True, default='', max_length=120)),
+                ('opens_at', models.DateTimeField()),
+                ('closes_at', models.DateTimeField()),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registration_windows', to='leagues.season')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TeamApplication',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('idempotency_key', models.CharField(max_length=64)),
+                ('team_name', models.CharField(max_length=120)),
+                ('short_name', models.CharField(blank=True, default='', max_length=40)),
+                ('primary_contact_name', models.CharField(blank=True, default='', max_length=120)),
+                ('primary_contact_email', models.EmailField(blank=True, default='', max_length=254)),
+                ('primary_contact_phone', models.CharField(blank=True, default='', max_length=40)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected')], default='PENDING', max_length=10)),
+                ('decided_at', models.DateTimeField(blank=True, null=True)),
+                ('submitted_at', models.DateTimeField(auto_now_add=True)),
+                ('decided_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('division', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_applications', to='leagues.division')),
+                ('team', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='application', to='leagues.team')),
+                ('window', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_applications', to='registration.registrationwindow')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PlayerSignup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('idempotency_key', models.CharField(max_length=64)),
+                ('role', models.CharField(choices=[('CAPTAIN', 'Captain'), ('PLAYER', 'Player')], default='PLAYER', max_length=10)),
+                ('full_name', models.CharField(max_length=120)),
+                ('jersey_number', models.PositiveSmallIntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(99)])),
+                ('email', models.EmailField(blank=True, default='', max_length=254)),
+                ('phone', models.CharField(blank=True, default='', max_length=40)),
+                ('submitted_at', models.DateTimeField(auto_now_add=True)),
+                ('member', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='signup', to='leagues.teammember')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='player_signups', to=settings.AUTH_USER_MODEL)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='players', to='registration.teamapplication')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='registrationwindow',
+            constraint=models.CheckConstraint(condition=models.Q(('closes_at__gt', models.F('opens_at'))), name='chk_registration_window_order'),
+        ),
+        migrations.AddIndex(
+            model_name='teamapplication',
+            index=models.Index(fields=['window', 'status', 'submitted_at'], name='registratio_window__782f39_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='teamapplication',
+            constraint=models.UniqueConstraint(fields=('window', 'idempotency_key'), name='uniq_application_window_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='playersignup',
+            constraint=models.UniqueConstraint(fields=('application', 'idempotency_key'), name='uniq_signup_application_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='playersignup',
+            constraint=models.UniqueConstraint(fields=('application', 'full_name'), name='uniq_signup_application_name'),
+        ),
+    ]
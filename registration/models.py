@@ -0,0 +1,100 @@
+import uuid
+from django.conf import settings
+from django.db import models
+from django.db.models import Q, F
+from django.utils import timezone
+from django.core.validators import MinValueValidator, MaxValueValidator
+
+from leagues.models import Division, Season, Team, TeamMember
+
+
+class RegistrationWindow(models.Model):
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="registration_windows")
+  name = models.CharField(max_length=120, blank=True, default="")
+  opens_at = models.DateTimeField()
+  closes_at = models.DateTimeField()
+  is_active = models.BooleanField(default=True)
+  created_at = models.DateTimeField(auto_now_add=True)
+
+  class Meta:
+    constraints = [
+      models.CheckConstraint(
+        condition=Q(closes_at__gt=F("opens_at")),
+        name="chk_registration_window_order"
+      )
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.season} registration ({self.opens_at:%Y-%m-%d} - {self.closes_at:%Y-%m-%d})"
+
+  def is_open(self, at=None) -> bool:
+    at = at or timezone.now()
+    return self.is_active and self.opens_at <= at < self.closes_at
+
+
+class TeamApplication(models.Model):
+  class Status(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    APPROVED = "APPROVED", "Approved"
+    REJECTED = "REJECTED", "Rejected"
+
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  window = models.ForeignKey(RegistrationWindow, on_delete=models.CASCADE, related_name="team_applications")
+  division = models.ForeignKey(Division, on_delete=models.CASCADE, related_name="team_applications")
+
+  # client-supplied key (Idempotency-Key header): a retried submission returns the original row
+  idempotency_key = models.CharField(max_length=64)
+
+  team_name = models.CharField(max_length=120)
+  short_name = models.CharField(max_length=40, blank=True, default="")
+  primary_contact_name = models.CharField(max_length=120, blank=True, default="")
+  primary_contact_email = models.EmailField(blank=True, default="")
+  primary_contact_phone = models.CharField(max_length=40, blank=True, default="")
+
+  status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+  team = models.OneToOneField(Team, on_delete=models.SET_NULL, null=True, blank=True, related_name="application")
+  decided_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+  decided_at = models.DateTimeField(null=True, blank=True)
+  submitted_at = models.DateTimeField(auto_now_add=True)
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=["window", "idempotency_key"], name="uniq_application_window_key")
+    ]
+    indexes = [
+      models.Index(fields=["window", "status", "submitted_at"]),
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.team_name} ({self.status})"
+
+
+class PlayerSignup(models.Model):
+  id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+  application = models.ForeignKey(TeamApplication, on_delete=models.CASCADE, related_name="players")
+  user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="player_signups")
+
+  idempotency_key = models.CharField(max_length=64)
+
+  role = models.CharField(max_length=10, choices=TeamMember.Role.choices, default=TeamMember.Role.PLAYER)
+  full_name = models.CharField(max_length=120)
+  jersey_number = models.PositiveSmallIntegerField(
+    null=True,
+    blank=True,
+    validators=[MinValueValidator(0), MaxValueValidator(99)]
+  )
+  email = models.EmailField(blank=True, default="")
+  phone = models.CharField(max_length=40, blank=True, default="")
+
+  member = models.OneToOneField(TeamMember, on_delete=models.SET_NULL, null=True, blank=True, related_name="signup")
+  submitted_at = models.DateTimeField(auto_now_add=True)
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=["application", "idempotency_key"], name="uniq_signup_application_key"),
+      models.UniqueConstraint(fields=["application", "full_name"], name="uniq_signup_application_name"),
+    ]
+
+  def __str__(self) -> str:
+    return f"{self.full_name} -- {self.application.team_name}"
@@ -0,0 +1,50 @@
+from rest_framework import serializers
+
+from .models import PlayerSignup, TeamApplication
+
+
+class PlayerSignupSerializer(serializers.ModelSerializer):
+  class Meta:
+    model = PlayerSignup
+    fields = ["id", "role", "full_name", "jersey_number", "email", "phone", "submitted_at"]
+    read_only_fields = ["id", "submitted_at"]
+
+
+def _unique_names(players):
+  names = [p["full_name"] for p in players]
+  if len(names) != len(set(names)):
+    raise serializers.ValidationError("Player names must be unique within a team.")
+  return players
+
+
+class PlayerSignupBatchSerializer(serializers.Serializer):
+  players = PlayerSignupSerializer(many=True, allow_empty=False)
+
+  def validate_players(self, players):
+    return _unique_names(players)
+
+
+class TeamApplicationSerializer(serializers.ModelSerializer):
+  players = PlayerSignupSerializer(many=True, required=False)
+
+  class Meta:
+    model = TeamApplication
+    fields = [
+      "id",
+      "division",
+      "team_name", "short_name",
+      "primary_contact_name", "primary_contact_email", "primary_contact_phone",
+      "status",
+      "submitted_at",
+      "players",
+    ]
+    read_only_fields = ["id", "status", "submitted_at"]
+
+  def validate_players(self, players):
+    return _unique_names(players)
+
+  def validate_division(self, division):
+    window = self.context["window"]
+    if division.season_id != window.season_id:
+      raise serializers.ValidationError("Division must belong to the registration window's season.")
+    return division
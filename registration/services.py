@@ -0,0 +1,149 @@
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from leagues.models import Team, TeamMember, TeamSeason
+from leagues.permissions import invalidate_grants
+from leagues.players import link_members
+
+from .models import PlayerSignup, TeamApplication
+
+
+def _signup(application, key, player) -> PlayerSignup:
+  return PlayerSignup(application=application, idempotency_key=key, **player)
+
+
+def submit_application(window, idempotency_key, data, players=()):
+  """
+  Create a team application with its player sign-ups, or return the application an
+  earlier request with the same idempotency key created. Returns (application, created).
+  """
+  existing = TeamApplication.objects.filter(window=window, idempotency_key=idempotency_key).first()
+  if existing:
+    return existing, False
+
+  try:
+    with transaction.atomic():
+      application = TeamApplication.objects.create(window=window, idempotency_key=idempotency_key, **data)
+      PlayerSignup.objects.bulk_create([
+        _signup(application, f"{idempotency_key}:{i}", player) for i, player in enumerate(players)
+      ])
+  except IntegrityError:
+    # a retry of the same submission won the race
+    existing = TeamApplication.objects.filter(window=window, idempotency_key=idempotency_key).first()
+    if existing is None:
+      raise
+    return existing, False
+  return application, True
+
+
+def add_players(application, idempotency_key, players):
+  """
+  Append sign-ups to an application; replaying the same key and list inserts nothing new.
+
+  A player whose name is already signed up under a different key is a conflict, not a
+  replay: the whole batch is rolled back and ValidationError lists the conflicting names.
+  """
+  keys = [f"{idempotency_key}:{i}" for i in range(len(players))]
+  with transaction.atomic():
+    PlayerSignup.objects.bulk_create(
+      [_signup(application, key, player) for key, player in zip(keys, players)],
+      ignore_conflicts=True,
+    )
+    by_key = {s.idempotency_key: s for s in application.players.filter(idempotency_key__in=keys)}
+    conflicts = [player["full_name"] for key, player in zip(keys, players) if key not in by_key]
+    if conflicts:
+      raise ValidationError({"players": [f"{name} is already signed up for this team." for name in conflicts]})
+  return [by_key[key] for key in keys]
+
+
+def approve_applications(application_ids, *, decided_by=None):
+  """
+  Approve pending applications in one transaction: Team, TeamSeason and TeamMember rows
+  are bulk-inserted, then the applications and sign-ups are linked to them in bulk.
+
+  Applications whose team name is already taken in the division stay pending.
+  Returns (approved applications, skipped applications).
+  """
+  now = timezone.now()
+  with transaction.atomic():
+    applications = list(
+      TeamApplication.objects
+      .select_for_update(of=("self",))
+      .filter(pk__in=application_ids, status=TeamApplication.Status.PENDING)
+      .select_related("window__season")
+      .order_by("submitted_at")
+    )
+    taken = set(
+      Team.objects
+      .filter(division_id__in={a.division_id for a in applications}, name__in={a.team_name for a in applications})
+      .values_list("division_id", "name")
+    )
+
+    approved, skipped = [], []
+    teams, team_seasons = [], {}
+    for application in applications:
+      key = (application.division_id, application.team_name)
+      if key in taken:
+        skipped.append(application)
+        continue
+      taken.add(key)
+
+      team = Team(
+        organization_id=application.window.season.organization_id,
+        division_id=application.division_id,
+        name=application.team_name,
+        short_name=application.short_name,
+        primary_contact_name=application.primary_contact_name,
+        primary_contact_email=application.primary_contact_email,
+        primary_contact_phone=application.primary_contact_phone,
+      )
+      teams.append(team)
+      team_seasons[application.id] = TeamSeason(season_id=application.window.season_id, team=team)
+
+      application.team = team
+      application.status = TeamApplication.Status.APPROVED
+      application.decided_by = decided_by
+      application.decided_at = now
+      approved.append(application)
+
+    signups = PlayerSignup.objects.filter(application_id__in=team_seasons, member__isnull=True)
+    members = [
+      TeamMember(
+        organization_id=team_seasons[signup.application_id].team.organization_id,
+        team_season=team_seasons[signup.application_id],
+        user_id=signup.user_id,
+        role=signup.role,
+        full_name=signup.full_name,
+        jersey_number=signup.jersey_number,
+        email=signup.email,
+        phone=signup.phone,
+      )
+      for signup in signups
+    ]
+
+    Team.objects.bulk_create(teams)
+    TeamSeason.objects.bulk_create(team_seasons.values())
+    TeamMember.objects.bulk_create(members, batch_size=500)
+    TeamApplication.objects.bulk_update(approved, ["team", "status", "decided_by", "decided_at"], batch_size=500)
+
+    # link sign-ups to their new members in one UPDATE (full_name is unique per team season)
+    signups.update(member=Subquery(
+      TeamMember.objects
+      .filter(team_season__team__application=OuterRef("application_id"), full_name=OuterRef("full_name"))
+      .values("pk")[:1]
+    ))
+    # bulk_create skips the signals that link members to returning players and drop cached grants
+    link_members(members)
+    invalidate_grants(*{m.user_id for m in members})
+
+  return approved, skipped
+
+
+def reject_applications(application_ids, *, decided_by=None) -> int:
+  return (
+    TeamApplication.objects
+    .filter(pk__in=application_ids, status=TeamApplication.Status.PENDING)
+    .update(status=TeamApplication.Status.REJECTED, decided_by=decided_by, decided_at=timezone.now())
+  )
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+  path("windows/<uuid:window_id>/applications/", views.TeamApplicationSubmitView.as_view(), name="registration-submit"),
+  path("applications/<uuid:application_id>/players/", views.PlayerSignupSubmitView.as_view(), name="registration-players"),
+]
@@ -1,3 +1,61 @@
-from django.shortcuts import render
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from . import services
+from .models import RegistrationWindow, TeamApplication
+from .serializers import PlayerSignupBatchSerializer, PlayerSignupSerializer, TeamApplicationSerializer
+
+
+def _idempotency_key(request) -> str:
+  key = request.headers.get("Idempotency-Key", "").strip()
+  if not key or len(key) > 48:
+    raise ValidationError({"Idempotency-Key": "Header is required (max 48 characters)."})
+  return key
+
+
+class TeamApplicationSubmitView(APIView):
+  """Submit a team application (with players). Retrying with the same Idempotency-Key is safe."""
+  permission_classes = [AllowAny]
+
+  def post(self, request, window_id):
+    window = get_object_or_404(RegistrationWindow, pk=window_id)
+    key = _idempotency_key(request)
+    if not window.is_open():
+      raise ValidationError({"detail": "Registration is closed."})
+
+    serializer = TeamApplicationSerializer(data=request.data, context={"window": window})
+    serializer.is_valid(raise_exception=True)
+    data = dict(serializer.validated_data)
+    players = data.pop("players", [])
+
+    application, created = services.submit_application(window, key, data, players)
+    application = TeamApplication.objects.prefetch_related("players").get(pk=application.pk)
+    return Response(
+      TeamApplicationSerializer(application, context={"window": window}).data,
+      status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+    )
+
+
+class PlayerSignupSubmitView(APIView):
+  """Add players to a pending application. Retrying with the same Idempotency-Key is safe."""
+  permission_classes = [AllowAny]
+
+  def post(self, request, application_id):
+    application = get_object_or_404(TeamApplication.objects.select_related("window"), pk=application_id)
+    key = _idempotency_key(request)
+    if application.status != TeamApplication.Status.PENDING or not application.window.is_open():
+      raise ValidationError({"detail": "This application no longer accepts sign-ups."})
+
+    serializer = PlayerSignupBatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    try:
+      signups = services.add_players(application, key, serializer.validated_data["players"])
+    except DjangoValidationError as exc:
+      raise ValidationError(exc.message_dict)
+    return Response(PlayerSignupSerializer(signups, many=True).data, status=status.HTTP_201_CREATED)